@@ -60,6 +60,16 @@
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def shared_cache_fixture(settings: Any, tmp_path_factory: Any) -> None:
+    """Give every test an empty cache shared between worker processes."""
+    location = str(tmp_path_factory.mktemp("shared_cache"))
+    settings.CACHES = {
+        **settings.CACHES,
+        "shared": {**settings.CACHES["shared"], "LOCATION": location},
+    }
+
+
 @pytest.fixture(name="admin_user")
 def admin_user_fixture() -> Any:
     """Create and return a superuser."""
@@ -4,3 +4,7 @@
 class ChatbotConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "chatbot"
+
+    def ready(self):
+        """Connect the signal handlers that refresh the retrieval indexes."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,133 @@
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Precompiled trigger phrase matcher for chatbot predefined responses.
+
+All ``PredefinedResponse`` trigger phrases are compiled into a single
+Aho-Corasick automaton, so a message is checked against every trigger in one
+pass over its characters without a database query. The automaton is rebuilt
+lazily after ``PredefinedResponse`` changes (see ``chatbot.signals``).
+"""
+
+import logging
+import threading
+from collections import deque
+
+from .models import PredefinedResponse
+from .retrieval import bump_version, get_version, tokenize
+
+logger = logging.getLogger(__name__)
+
+MATCHER_VERSION_CACHE_KEY = "chatbot:trigger_matcher:version"
+
+
+def normalize_phrase(text):
+    """
+    Normalize text for trigger matching.
+
+    Punctuation and repeated whitespace are dropped and the result is padded
+    with spaces so triggers only match on whole words.
+    """
+    tokens = tokenize(text)
+    return f" {' '.join(tokens)} " if tokens else ""
+
+
+class TriggerMatcher:
+    """Aho-Corasick automaton over normalized trigger phrases."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._version = None
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [None]
+
+    def invalidate(self):
+        """Mark the automaton stale and notify other workers."""
+        with self._lock:
+            self._loaded = False
+            bump_version(MATCHER_VERSION_CACHE_KEY)
+
+    def match(self, message_text):
+        """
+        Find the best predefined response contained in a message.
+
+        Args:
+            message_text: The user's message
+
+        Returns:
+            The highest priority matching PredefinedResponse or None
+        """
+        text = normalize_phrase(message_text)
+        if not text:
+            return None
+
+        with self._lock:
+            version = get_version(MATCHER_VERSION_CACHE_KEY)
+            if not self._loaded or version != self._version:
+                self._build(version)
+            goto, fail, output = self._goto, self._fail, self._output
+
+        best = None
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            candidate = output[state]
+            if candidate is not None and (best is None or candidate[0] > best[0]):
+                best = candidate
+        return best[1] if best else None
+
+    def _build(self, version):
+        """Compile all trigger phrases into the automaton."""
+        goto = [{}]
+        output = [None]
+
+        responses = PredefinedResponse.objects.only(
+            "id", "trigger_phrase", "response_text", "priority"
+        )
+        for response in responses:
+            phrase = normalize_phrase(response.trigger_phrase)
+            if not phrase:
+                continue
+            state = 0
+            for char in phrase:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    output.append(None)
+                state = next_state
+            # Prefer higher priority, then longer triggers, then older rows.
+            rank = (response.priority, len(phrase), -response.id)
+            if output[state] is None or rank > output[state][0]:
+                output[state] = (rank, response)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                # Inherit the best match ending at the fallback state.
+                inherited = output[fail[next_state]]
+                if inherited is not None and (
+                    output[next_state] is None or inherited[0] > output[next_state][0]
+                ):
+                    output[next_state] = inherited
+
+        self._goto, self._fail, self._output = goto, fail, output
+        self._loaded = True
+        self._version = version
+        logger.info("Compiled chatbot trigger matcher with %s states", len(goto))
+
+
+trigger_matcher = TriggerMatcher()
@@ -0,0 +1,271 @@
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+In-memory retrieval index for chatbot training data.
+
+The index tokenizes every ``TrainingData`` question once per process and keeps
+BM25-weighted postings as NumPy arrays, so answering a message only touches
+the postings of the terms it contains instead of re-reading the whole table.
+Changes to ``TrainingData`` are applied incrementally through the signal
+handlers in ``chatbot.signals``.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+from django.core.cache import caches
+
+from .models import TrainingData
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Cache seen by every worker process, holding the index versions
+VERSION_CACHE = "shared"
+
+# Shared cache key bumped on every TrainingData change so that other worker
+# processes know their copy of the index is out of date.
+INDEX_VERSION_CACHE_KEY = "chatbot:training_index:version"
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+def get_version(key):
+    """Return the value of a shared cache version counter."""
+    return caches[VERSION_CACHE].get(key)
+
+
+def bump_version(key):
+    """
+    Increment a shared cache version counter and return the new value.
+
+    A counter culled from the cache restarts from the clock rather than 1, so
+    it cannot return to a version some worker has already loaded.
+    """
+    cache = caches[VERSION_CACHE]
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+        return cache.get(key)
+
+
+class TrainingDataIndex:
+    """BM25 index over training questions with incremental updates."""
+
+    # Rebuild the postings once this share of rows are tombstones.
+    COMPACT_RATIO = 0.5
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._version = None
+        self._pending = set()
+        self._clear()
+
+    def _clear(self):
+        """Reset all index structures to an empty state."""
+        self._row_by_id = {}
+        self._ids = []
+        self._answers = []
+        self._term_counts = []
+        self._doc_len = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._postings = {}
+        self._df = Counter()
+        self._total_len = 0.0
+        self._dead = 0
+
+    def __len__(self):
+        return len(self._row_by_id)
+
+    def mark_stale(self, training_id):
+        """Queue a TrainingData row to be re-read on the next search."""
+        with self._lock:
+            self._pending.add(training_id)
+            self._version = bump_version(INDEX_VERSION_CACHE_KEY)
+
+    def invalidate(self):
+        """Drop the index so it is rebuilt from the database on next use."""
+        with self._lock:
+            self._loaded = False
+            self._pending.clear()
+
+    def search(self, text, k=5):
+        """
+        Return up to ``k`` best matching answers for a message.
+
+        Args:
+            text: The user's message
+            k: Maximum number of results
+
+        Returns:
+            List of (score, answer) tuples, best match first
+        """
+        terms = set(tokenize(text))
+        if not terms:
+            return []
+
+        with self._lock:
+            self._sync()
+            scores = self._score(terms)
+            if scores is None:
+                return []
+
+            candidates = np.flatnonzero(scores > 0)
+            if candidates.size > k:
+                top = np.argpartition(scores[candidates], -k)[-k:]
+                candidates = candidates[top]
+            order = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(float(scores[row]), self._answers[row]) for row in order]
+
+    def _score(self, terms):
+        """Accumulate BM25 scores for every row containing a query term."""
+        live_docs = len(self._row_by_id)
+        if not live_docs:
+            return None
+
+        avg_len = self._total_len / live_docs or 1.0
+        norm = self.k1 * (1 - self.b + self.b * self._doc_len / avg_len)
+        scores = np.zeros(len(self._ids), dtype=np.float32)
+        matched = False
+
+        for term in terms:
+            postings = self._postings.get(term)
+            df = self._df.get(term, 0)
+            if postings is None or df <= 0:
+                continue
+            rows, tfs = postings
+            idf = math.log(1 + (live_docs - df + 0.5) / (df + 0.5))
+            scores[rows] += idf * tfs * (self.k1 + 1) / (tfs + norm[rows])
+            matched = True
+
+        if not matched:
+            return None
+        scores[~self._alive] = 0
+        return scores
+
+    def _sync(self):
+        """Load the index or apply pending changes before a search."""
+        version = get_version(INDEX_VERSION_CACHE_KEY)
+        if not self._loaded or version != self._version:
+            self._rebuild(version)
+            return
+
+        if self._pending:
+            pending, self._pending = self._pending, set()
+            rows = TrainingData.objects.filter(pk__in=pending).values_list(
+                "id", "question", "answer"
+            )
+            found = set()
+            for training_id, question, answer in rows:
+                found.add(training_id)
+                self._remove(training_id)
+                self._append(training_id, question, answer)
+            for training_id in pending - found:
+                self._remove(training_id)
+
+            if self._dead > len(self._ids) * self.COMPACT_RATIO:
+                self._compact()
+
+    def _rebuild(self, version):
+        """Build the whole index from the database in a single pass."""
+        self._clear()
+        self._pending.clear()
+        postings = {}
+
+        rows = TrainingData.objects.values_list("id", "question", "answer")
+        for training_id, question, answer in rows.iterator(chunk_size=2000):
+            counts = Counter(tokenize(question))
+            row = self._register(training_id, answer, counts)
+            for term, tf in counts.items():
+                term_rows, term_tfs = postings.setdefault(term, ([], []))
+                term_rows.append(row)
+                term_tfs.append(tf)
+
+        self._freeze(postings)
+        self._loaded = True
+        self._version = version
+        logger.info("Built chatbot training index with %s entries", len(self))
+
+    def _compact(self):
+        """Rewrite the postings without tombstoned rows."""
+        live = [
+            (self._ids[row], self._answers[row], self._term_counts[row])
+            for row in np.flatnonzero(self._alive)
+        ]
+        self._clear()
+        postings = {}
+        for training_id, answer, counts in live:
+            row = self._register(training_id, answer, counts)
+            for term, tf in counts.items():
+                term_rows, term_tfs = postings.setdefault(term, ([], []))
+                term_rows.append(row)
+                term_tfs.append(tf)
+        self._freeze(postings)
+
+    def _register(self, training_id, answer, counts):
+        """Record per-row bookkeeping and return the new row number."""
+        row = len(self._ids)
+        self._row_by_id[training_id] = row
+        self._ids.append(training_id)
+        self._answers.append(answer)
+        self._term_counts.append(counts)
+        self._df.update(counts.keys())
+        self._total_len += sum(counts.values())
+        return row
+
+    def _freeze(self, postings):
+        """Convert list-based postings into NumPy arrays."""
+        self._postings = {
+            term: (np.asarray(rows, dtype=np.int32), np.asarray(tfs, dtype=np.float32))
+            for term, (rows, tfs) in postings.items()
+        }
+        self._doc_len = np.fromiter(
+            (sum(counts.values()) for counts in self._term_counts),
+            dtype=np.float32,
+            count=len(self._term_counts),
+        )
+        self._alive = np.ones(len(self._ids), dtype=bool)
+
+    def _append(self, training_id, question, answer):
+        """Add a single row, extending only the postings of its terms."""
+        counts = Counter(tokenize(question))
+        row = self._register(training_id, answer, counts)
+        for term, tf in counts.items():
+            rows, tfs = self._postings.get(
+                term,
+                (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)),
+            )
+            self._postings[term] = (
+                np.append(rows, np.int32(row)),
+                np.append(tfs, np.float32(tf)),
+            )
+        self._doc_len = np.append(self._doc_len, np.float32(sum(counts.values())))
+        self._alive = np.append(self._alive, True)
+
+    def _remove(self, training_id):
+        """Tombstone the row for a training id if it is indexed."""
+        row = self._row_by_id.pop(training_id, None)
+        if row is None:
+            return
+        counts = self._term_counts[row]
+        self._df.subtract(counts.keys())
+        self._total_len -= sum(counts.values())
+        self._alive[row] = False
+        self._dead += 1
+
+
+training_index = TrainingDataIndex()
@@ -1,9 +1,9 @@
 import logging
 
-from django.db.models import Q
-
-from .models import ChatMessage, Conversation, PredefinedResponse, TrainingData
+from .matching import trigger_matcher
+from .models import ChatMessage, Conversation
 from .proto_utils import create_chat_response, parse_chat_response
+from .retrieval import training_index
 
 logger = logging.getLogger(__name__)
 
@@ -73,34 +73,13 @@ def process_user_message(conversation_id, message_text):
 
     @staticmethod
     def _check_predefined_responses(message_text):
-        """Check if message matches any predefined responses."""
-        # Search for exact or partial matches in trigger phrases
-        predefined_responses = PredefinedResponse.objects.filter(
-            Q(trigger_phrase__iexact=message_text) |
-            Q(trigger_phrase__icontains=message_text)
-        ).order_by('-priority')
-
-        return predefined_responses.first()
+        """Return the highest priority predefined response triggered by a message."""
+        return trigger_matcher.match(message_text)
 
     @staticmethod
     def _generate_response(message_text):
         """Generate a response based on training data."""
-        # Simple keyword matching from training data
-        matches = []
-
-        for training_item in TrainingData.objects.all():
-            # Check if any words in the question match the user's message
-            question_words = set(training_item.question.lower().split())
-            message_words = set(message_text.lower().split())
-
-            # Calculate a simple match score
-            intersection = question_words.intersection(message_words)
-            if intersection:
-                score = len(intersection) / len(question_words)
-                matches.append((score, training_item.answer))
-
-        # Sort by match score
-        matches.sort(reverse=True)
+        matches = training_index.search(message_text, k=1)
 
         if matches:
             return matches[0][1]
@@ -0,0 +1,27 @@
+"""Signal handlers keeping the chatbot's in-memory indexes up to date."""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .matching import trigger_matcher
+from .models import PredefinedResponse, TrainingData
+from .retrieval import training_index
+
+
+@receiver(post_save, sender=TrainingData)
+@receiver(post_delete, sender=TrainingData)
+def refresh_training_index(sender, instance, **kwargs):
+    """Queue a changed training entry for re-indexing."""
+    # Workers re-read the row from the database, so only once it is committed
+    transaction.on_commit(partial(training_index.mark_stale, instance.pk))
+
+
+@receiver(post_save, sender=PredefinedResponse)
+@receiver(post_delete, sender=PredefinedResponse)
+def refresh_trigger_matcher(sender, instance, **kwargs):
+    """Recompile the trigger matcher after a predefined response changes."""
+    # Workers recompile from the database, so only once the row is committed
+    transaction.on_commit(trigger_matcher.invalidate)
@@ -1,3 +1,6 @@
+from collections import defaultdict
+
+from core.loaders import get_loader, register_loader
 from django import template
 from django.utils.html import format_html
 
@@ -5,18 +8,49 @@
 
 register = template.Library()
 
+COMPANY_ROLES_LOADER = 'company_roles'
+
+
+def _load_company_roles(keys):
+    """Fetch roles for many (user_id, company_id) pairs with one query per user."""
+    company_ids_by_user = defaultdict(list)
+    for user_id, company_id in keys:
+        company_ids_by_user[user_id].append(company_id)
+
+    roles = {}
+    for user_id, company_ids in company_ids_by_user.items():
+        memberships = CompanyMembership.objects.filter(
+            user_id=user_id, company_id__in=company_ids
+        ).values_list('company_id', 'role')
+        for company_id, role in memberships:
+            roles[user_id, company_id] = role
+    return roles
+
+
+register_loader(COMPANY_ROLES_LOADER, _load_company_roles)
+
 
 @register.filter
 def company_role(user, company):
-    """Return user's role in a company."""
-    try:
-        if isinstance(company, int):
-            membership = CompanyMembership.objects.get(user=user, company_id=company)
-        else:
-            membership = CompanyMembership.objects.get(user=user, company=company)
-        return membership.role
-    except CompanyMembership.DoesNotExist:
-        return None
+    """
+    Return user's role in a company.
+
+    Accepts the arguments in either order, so both ``user|company_role:company``
+    and ``company.id|company_role:user`` work.
+    """
+    if isinstance(user, (Company, int)):
+        user, company = company, user
+    company_id = getattr(company, 'pk', company)
+    return get_loader(COMPANY_ROLES_LOADER).load((user.pk, company_id))
+
+
+@register.simple_tag
+def prime_company_roles(user, companies):
+    """Queue a user's roles in several companies for a single batched lookup."""
+    get_loader(COMPANY_ROLES_LOADER).prime(
+        (user.pk, getattr(company, 'pk', company)) for company in companies
+    )
+    return ''
 
 
 @register.filter
@@ -55,31 +89,28 @@ def industry_label(industry_code):
 @register.simple_tag
 def company_selector(user):
     """Render a company selector dropdown."""
-    companies = Company.objects.filter(members=user).order_by('name')
-
-    if not companies:
+    # One query for the companies together with the user's membership in each
+    memberships = (
+        CompanyMembership.objects.filter(user=user)
+        .select_related('company')
+        .order_by('company__name')
+    )
+
+    if not memberships:
         return format_html(
             '<div class="no-companies">You are not associated with any companies</div>'
         )
 
     output = ['<select name="company" id="company-selector" class="company-selector">']
 
-    for company in companies:
-        try:
-            membership = CompanyMembership.objects.get(user=user, company=company)
-            is_primary = membership.is_primary
-            role = membership.role
-        except CompanyMembership.DoesNotExist:
-            is_primary = False
-            role = 'Unknown'
-
+    for membership in memberships:
         output.append(
             format_html(
                 '<option value="{}" {}>{name} ({role})</option>',
-                company.id,
-                'selected="selected"' if is_primary else '',
-                name=company.name,
-                role=role
+                membership.company_id,
+                'selected="selected"' if membership.is_primary else '',
+                name=membership.company.name,
+                role=membership.role
             )
         )
 
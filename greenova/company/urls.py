@@ -38,6 +38,11 @@
         views.upload_document,
         name="upload_document",
     ),
+    path(
+        "<int:company_id>/documents/<int:document_id>/download/",
+        views.download_document,
+        name="download_document",
+    ),
     path(
         "<int:company_id>/documents/<int:document_id>/delete/",
         views.delete_document,
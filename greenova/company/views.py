@@ -1,6 +1,7 @@
 import logging
 from typing import Any
 
+from core.downloads import serve_file
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
@@ -595,3 +596,16 @@ def delete_document(
     if hasattr(request, "htmx") and request.htmx:
         return render(request, "company/partials/document_delete_confirm.html", context)
     return render(request, "company/document_delete.html", context)
+
+
+@login_required
+def download_document(
+    request: HttpRequest, company_id: int, document_id: int
+) -> HttpResponse:
+    """View for downloading a company document as a company member."""
+    documents = CompanyDocument.objects.filter(company_id=company_id)
+    if not request.user.is_superuser:
+        documents = documents.filter(company__memberships__user=request.user)
+    document = get_object_or_404(documents, id=document_id)
+
+    return serve_file(request, document.file, document.file.name.rsplit("/", 1)[-1])
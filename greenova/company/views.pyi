@@ -62,3 +62,6 @@ def upload_document(request: HttpRequest, company_id: int) -> HttpResponse: ...
 def delete_document(
     request: HttpRequest, company_id: int, document_id: int
 ) -> HttpResponse: ...
+def download_document(
+    request: HttpRequest, company_id: int, document_id: int
+) -> HttpResponse: ...
@@ -1,6 +1,7 @@
 """Core app configuration."""
 from django.apps import AppConfig
 from django.contrib import admin
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
@@ -12,6 +13,10 @@ def ready(self):
         """
         Initialize core components when Django is ready.
         """
+        from .sqlite import configure_sqlite
+
+        # Apply the SQLite production profile to every new connection
+        connection_created.connect(configure_sqlite, dispatch_uid="core.sqlite")
 
         # Customize admin site
         admin.site.site_header = "Environmental Obligations Management"
@@ -1,7 +1,8 @@
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from django.conf import settings
+from django.db.models import QuerySet
 from django.http import HttpRequest
 
 logger = logging.getLogger(__name__)
@@ -35,3 +36,8 @@ def get_app_settings() -> Dict[str, Any]:
         'SITE_DESCRIPTION': getattr(settings, 'SITE_DESCRIPTION',
                                     'Environmental Compliance Management System'),
     }
+
+
+async def alist(queryset: QuerySet) -> List[Any]:
+    """Evaluate a queryset with the async ORM, for use in ``asyncio.gather``."""
+    return [item async for item in queryset.aiterator()]
@@ -1,8 +1,10 @@
 # Stub file for core.commons
-from typing import Any, Dict
+from typing import Any, Dict, List
 
+from django.db.models import QuerySet
 from django.http import HttpRequest
 
 def get_active_namespace(request: HttpRequest) -> str: ...
 def get_user_display_name(user: Any) -> str: ...
 def get_app_settings() -> Dict[str, Any]: ...
+async def alist(queryset: QuerySet) -> List[Any]: ...
@@ -0,0 +1,216 @@
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Permission-checked file downloads.
+
+Views check access in Django and then call ``serve_file``, which either hands
+the transfer to the front-end server or streams the file itself:
+
+* ``DOWNLOAD_BACKEND = "x-accel-redirect"`` returns an empty response with an
+  ``X-Accel-Redirect`` header pointing into ``DOWNLOAD_ACCEL_PREFIX``, an nginx
+  ``internal`` location aliased to ``MEDIA_ROOT``.
+* ``DOWNLOAD_BACKEND = "x-sendfile"`` returns an ``X-Sendfile`` header with the
+  file's path for Apache ``mod_xsendfile`` and similar servers.
+* ``DOWNLOAD_BACKEND = "django"`` (the default) streams the file with support
+  for single ``Range`` requests, so interrupted downloads can resume. Chunks
+  are read through an async iterator, so under ASGI a download holds one
+  chunk in memory instead of the whole file. The transfer still runs in the
+  worker for as long as it lasts.
+
+Production deployments should use ``x-accel-redirect`` or ``x-sendfile`` so
+large downloads are sent by the front-end server and never occupy a worker.
+
+Every response carries an ``ETag`` and honours ``If-None-Match``,
+``If-Modified-Since`` and ``If-Range``.
+"""
+
+import logging
+import mimetypes
+import re
+from collections.abc import Iterator
+from datetime import datetime
+from typing import IO
+from urllib.parse import quote
+
+from core.streaming import aiterate
+from django.conf import settings
+from django.db.models.fields.files import FieldFile
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, quote_etag
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DJANGO = "django"
+BACKEND_X_ACCEL = "x-accel-redirect"
+BACKEND_X_SENDFILE = "x-sendfile"
+
+# Bytes read per chunk when streaming a range
+CHUNK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def get_backend() -> str:
+    """Return the configured download backend."""
+    return getattr(settings, "DOWNLOAD_BACKEND", BACKEND_DJANGO)
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single byte range header into inclusive (start, end) offsets.
+
+    Args:
+        header: Value of the ``Range`` header
+        size: Size of the file in bytes
+
+    Returns:
+        tuple | None: The range, or None if it is malformed or covers
+        several ranges, in which case the whole file is sent
+
+    Raises:
+        ValueError: If the range cannot be satisfied
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the final N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start > end or start >= size:
+        raise ValueError(f"Unsatisfiable range {header!r}")
+    return start, end
+
+
+def _read_range(handle: IO[bytes], start: int, length: int) -> Iterator[bytes]:
+    """Yield ``length`` bytes from ``start``, closing the file afterwards."""
+    try:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        handle.close()
+
+
+def _file_etag(size: int, modified: datetime | None) -> str:
+    """Derive a validator from the file's size and modification time."""
+    stamp = int(modified.timestamp()) if modified else 0
+    return quote_etag(f"{size:x}-{stamp:x}")
+
+
+def serve_file(
+    request: HttpRequest,
+    field_file: FieldFile,
+    filename: str,
+    content_type: str | None = None,
+    etag: str | None = None,
+    size: int | None = None,
+    as_attachment: bool = True,
+) -> HttpResponse:
+    """
+    Serve a stored file after the caller has checked permissions.
+
+    Args:
+        request: The download request
+        field_file: File to send
+        filename: Name offered to the browser
+        content_type: MIME type, guessed from the file name if omitted
+        etag: Strong validator such as a content hash; derived from the
+            file's size and modification time if omitted
+        size: Size in bytes if already known, saving a storage lookup
+        as_attachment: Send ``Content-Disposition: attachment``
+
+    Returns:
+        HttpResponse: 200, 206, 304, 412 or 416 response
+    """
+    storage = field_file.storage
+    name = field_file.name
+    content_type = (
+        content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    )
+    if size is None:
+        size = storage.size(name)
+    try:
+        modified = storage.get_modified_time(name)
+    except (NotImplementedError, OSError):
+        modified = None
+    etag = quote_etag(etag) if etag else _file_etag(size, modified)
+    last_modified = int(modified.timestamp()) if modified else None
+
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if not_modified is not None:
+        return not_modified
+
+    backend = get_backend()
+    if backend == BACKEND_X_ACCEL:
+        # The front-end server handles ranges and conditional requests itself
+        response = HttpResponse(content_type=content_type)
+        prefix = getattr(settings, "DOWNLOAD_ACCEL_PREFIX", "/protected-media/")
+        response["X-Accel-Redirect"] = prefix + quote(name)
+    elif backend == BACKEND_X_SENDFILE:
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = storage.path(name)
+    else:
+        response = _stream_response(request, field_file, size, etag, content_type)
+
+    if response.status_code != 416:
+        response["Content-Disposition"] = content_disposition_header(
+            as_attachment, filename
+        )
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    if modified:
+        response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _stream_response(
+    request: HttpRequest,
+    field_file: FieldFile,
+    size: int,
+    etag: str,
+    content_type: str,
+) -> HttpResponse:
+    """Stream the whole file, or the requested byte range, from storage."""
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    # A stale If-Range means the client's partial copy is outdated
+    if range_header and (not if_range or if_range == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1
+    handle = field_file.storage.open(field_file.name, "rb")
+    # Async content is sent chunk by chunk under ASGI; a file or sync generator
+    # would be read into a list before the first byte is sent
+    response = StreamingHttpResponse(
+        aiterate(_read_range(handle, start, length)),
+        status=200 if byte_range is None else 206,
+        content_type=content_type,
+    )
+    response["Content-Length"] = str(length)
+    if byte_range is None:
+        return response
+
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    logger.debug("Serving bytes %s-%s of %s", start, end, field_file.name)
+    return response
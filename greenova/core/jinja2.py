@@ -1,11 +1,43 @@
 # Import your custom filters and globals
+import os
+import stat
+
+from django.conf import settings
 from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import ImproperlyConfigured
 from django.middleware.csrf import get_token
 from django.urls import reverse
 from django.utils import translation
 from django_htmx.jinja import django_htmx_script
 from django_hyperscript.templatetags.hyperscript import hs_dump
-from jinja2 import Environment
+from jinja2 import Environment, FileSystemBytecodeCache
+
+
+def get_bytecode_cache():
+    """
+    Return the on-disk cache of compiled templates shared by every worker.
+
+    Jinja2 loads the cached bytecode with ``marshal``, so the directory must
+    not be writable by anyone else. ``JINJA2_BYTECODE_CACHE_DIR`` is created
+    with mode 0700 and refused unless it is owned by the current user and
+    closed to group and others. When the setting is empty, Jinja2 picks its
+    own per-user directory, which it checks the same way.
+    """
+    directory = getattr(settings, 'JINJA2_BYTECODE_CACHE_DIR', None)
+    if not directory:
+        return FileSystemBytecodeCache()
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or stat.S_IMODE(info.st_mode) & 0o077
+    ):
+        raise ImproperlyConfigured(
+            f'JINJA2_BYTECODE_CACHE_DIR {directory!r} must be a directory '
+            'owned by the current user with mode 0700.'
+        )
+    return FileSystemBytecodeCache(directory)
 
 
 def environment(**options):
@@ -20,6 +52,10 @@ def environment(**options):
     if 'autoescape' not in jinja2_options:
         jinja2_options['autoescape'] = True
 
+    # Workers load compiled templates instead of parsing the sources again
+    if 'bytecode_cache' not in jinja2_options:
+        jinja2_options['bytecode_cache'] = get_bytecode_cache()
+
     # Create environment with filtered options - adding a nosec to satisfy Bandit
     # autoescape is set in jinja2_options above
     env = Environment(**jinja2_options)  # nosec B701
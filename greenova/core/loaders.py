@@ -0,0 +1,108 @@
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Request-scoped batch loaders for template tags.
+
+Template filters that look up related rows (responsibilities, company
+memberships, mechanism names, ...) used to run one query per rendered row. A
+``BatchLoader`` instead queues the keys it is asked for, resolves every queued
+key with a single ``IN`` query on the first miss and memoizes the results for
+the rest of the request.
+
+Loaders are registered once per module with ``register_loader`` and fetched
+with ``get_loader``. ``core.middleware.RequestLoaderMiddleware`` gives every
+request its own set of loader instances, so nothing is cached across requests.
+Keys can be queued ahead of a loop from a view (``get_loader(name).prime(keys)``)
+or from a template with ``{% prime_loader "name" objects %}``.
+"""
+
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+BatchFunction = Callable[[list[Any]], dict[Any, Any]]
+
+_LOADER_REGISTRY: dict[str, tuple[BatchFunction, Any]] = {}
+_request_loaders: ContextVar[dict[str, "BatchLoader"] | None] = ContextVar(
+    "request_loaders", default=None
+)
+
+
+class BatchLoader:
+    """Collect keys, resolve them in one batch call and memoize the results."""
+
+    def __init__(self, batch_fn: BatchFunction, default: Any = None) -> None:
+        self.batch_fn = batch_fn
+        self.default = default
+        self._cache: dict[Hashable, Any] = {}
+        self._queue: dict[Hashable, None] = {}
+
+    def prime(self, keys: Iterable[Hashable]) -> None:
+        """Queue keys so they are resolved with the next batch."""
+        for key in keys:
+            if key is not None and key not in self._cache:
+                self._queue[key] = None
+
+    def load(self, key: Hashable) -> Any:
+        """Return the value for a key, resolving queued keys on a miss."""
+        if key not in self._cache:
+            self.prime([key])
+            self.dispatch()
+        return self._cache.get(key, self.default)
+
+    def load_many(self, keys: Iterable[Hashable]) -> list[Any]:
+        """Return values for several keys using at most one batch call."""
+        keys = list(keys)
+        self.prime(keys)
+        self.dispatch()
+        return [self._cache.get(key, self.default) for key in keys]
+
+    def dispatch(self) -> None:
+        """Resolve every queued key with a single call to the batch function."""
+        if not self._queue:
+            return
+        keys = list(self._queue)
+        self._queue.clear()
+        results = self.batch_fn(keys)
+        for key in keys:
+            self._cache[key] = results.get(key, self.default)
+
+
+def register_loader(name: str, batch_fn: BatchFunction, default: Any = None) -> None:
+    """
+    Register a batch function under a loader name.
+
+    Args:
+        name: Unique loader name
+        batch_fn: Callable taking a list of keys and returning a dict of results
+        default: Value returned for keys missing from the batch result
+    """
+    _LOADER_REGISTRY[name] = (batch_fn, default)
+
+
+def get_loader(name: str) -> BatchLoader:
+    """
+    Return the loader for the current request.
+
+    Outside a request (management commands, tests without the middleware) a
+    fresh loader is returned, so lookups still work but are not memoized.
+    """
+    batch_fn, default = _LOADER_REGISTRY[name]
+    loaders = _request_loaders.get()
+    if loaders is None:
+        return BatchLoader(batch_fn, default)
+    if name not in loaders:
+        loaders[name] = BatchLoader(batch_fn, default)
+    return loaders[name]
+
+
+@contextmanager
+def loader_scope() -> Iterator[None]:
+    """Give the enclosed block its own set of loader instances."""
+    token = _request_loaders.set({})
+    try:
+        yield
+    finally:
+        _request_loaders.reset(token)
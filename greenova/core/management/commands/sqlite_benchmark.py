@@ -0,0 +1,68 @@
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Management command to benchmark reader latency under a busy SQLite writer.
+
+Runs on a scratch database in a temporary directory, never the project's own.
+"""
+
+import os
+import tempfile
+
+from core.sqlite import benchmark_concurrency, get_pragmas
+from django.core.management.base import BaseCommand
+
+# The SQLite defaults the production profile replaces
+ROLLBACK_JOURNAL_PRAGMAS = {'journal_mode': 'DELETE', 'busy_timeout': 20000}
+
+
+class Command(BaseCommand):
+    help = 'Measure how long SQLite readers wait while a writer commits'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=5.0,
+            help='Seconds to run each profile (default: 5)'
+        )
+        parser.add_argument(
+            '--readers',
+            type=int,
+            default=4,
+            help='Number of reader threads (default: 4)'
+        )
+        parser.add_argument(
+            '--hold',
+            type=float,
+            default=0.1,
+            help='Seconds the writer holds each transaction open (default: 0.1)'
+        )
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help='Also run with the default rollback journal for comparison'
+        )
+
+    def handle(self, *args, **options):
+        profiles = [('production profile', get_pragmas())]
+        if options['compare']:
+            profiles.append(('rollback journal', ROLLBACK_JOURNAL_PRAGMAS))
+
+        for label, pragmas in profiles:
+            with tempfile.TemporaryDirectory() as directory:
+                result = benchmark_concurrency(
+                    os.path.join(directory, 'benchmark.sqlite3'),
+                    pragmas,
+                    duration=options['duration'],
+                    readers=options['readers'],
+                    hold=options['hold'],
+                )
+            self.stdout.write(
+                f"{label}: {result['writes']} write transactions, "
+                f"{result['reads']} reads, {result['read_errors']} locked reads, "
+                f"read latency p50 {result['read_ms_p50']:.2f} ms, "
+                f"p99 {result['read_ms_p99']:.2f} ms, "
+                f"max {result['read_ms_max']:.2f} ms"
+            )
@@ -0,0 +1,109 @@
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Management command for periodic SQLite maintenance.
+
+Run it from cron, for example hourly::
+
+    python manage.py sqlite_maintenance
+
+and occasionally with ``--analyze`` to rebuild all planner statistics.
+"""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Value of PRAGMA auto_vacuum for incremental mode
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+class Command(BaseCommand):
+    help = 'Refresh query planner statistics, checkpoint the WAL and reclaim free pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias to maintain (default: default)'
+        )
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Run a full ANALYZE instead of the incremental PRAGMA optimize'
+        )
+        parser.add_argument(
+            '--vacuum-pages',
+            type=int,
+            default=1000,
+            help='Free pages returned to the file system per run (default: 1000)'
+        )
+        parser.add_argument(
+            '--enable-incremental-vacuum',
+            action='store_true',
+            help=(
+                'Switch the database to incremental auto-vacuum; '
+                'runs a full VACUUM once'
+            )
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"Database '{options['database']}' is not SQLite")
+
+        with connection.cursor() as cursor:
+            if options['enable_incremental_vacuum']:
+                # auto_vacuum only changes when the file is rebuilt
+                cursor.execute('PRAGMA auto_vacuum=INCREMENTAL')
+                cursor.execute('VACUUM')
+                self.stdout.write('Enabled incremental vacuum')
+
+            if options['analyze']:
+                cursor.execute('ANALYZE')
+                self.stdout.write('Analyzed all tables')
+            else:
+                # Analyzes only the tables whose statistics are out of date
+                cursor.execute('PRAGMA optimize')
+
+            cursor.execute('PRAGMA auto_vacuum')
+            auto_vacuum = cursor.fetchone()[0]
+            cursor.execute('PRAGMA freelist_count')
+            free_before = cursor.fetchone()[0]
+            if auto_vacuum == AUTO_VACUUM_INCREMENTAL and options['vacuum_pages'] > 0:
+                pages = int(options['vacuum_pages'])
+                cursor.execute(f'PRAGMA incremental_vacuum({pages})')
+                cursor.fetchall()
+            cursor.execute('PRAGMA freelist_count')
+            free_after = cursor.fetchone()[0]
+
+            cursor.execute('PRAGMA journal_mode')
+            wal = cursor.fetchone()[0] == 'wal'
+            if wal:
+                # Fold the WAL back into the database and shrink the WAL file
+                cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+                busy, wal_pages, checkpointed = cursor.fetchone()
+
+        if auto_vacuum != AUTO_VACUUM_INCREMENTAL and free_before:
+            self.stdout.write(
+                self.style.WARNING(
+                    f'{free_before} free pages; run with --enable-incremental-vacuum '
+                    'to reclaim them'
+                )
+            )
+        elif free_before != free_after:
+            self.stdout.write(f'Reclaimed {free_before - free_after} free pages')
+        if not wal:
+            self.stdout.write(self.style.WARNING('Database is not in WAL mode'))
+        elif busy:
+            self.stdout.write(
+                self.style.WARNING('WAL checkpoint was blocked by an open reader')
+            )
+        else:
+            self.stdout.write(f'Checkpointed {checkpointed} of {wal_pages} WAL pages')
+        self.stdout.write(self.style.SUCCESS('SQLite maintenance complete'))
+        logger.info('SQLite maintenance complete for %s', options['database'])
@@ -0,0 +1,54 @@
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Management command to compile every template at deploy time.
+
+Run it after ``collectstatic``::
+
+    python manage.py warm_templates --strict
+"""
+
+import logging
+import time
+
+from core.template_cache import warm_templates
+from django.core.management.base import BaseCommand, CommandError
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Compile all Django and Jinja2 templates and fill the template caches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--engine',
+            action='append',
+            dest='engines',
+            help='Template engine to warm, by its TEMPLATES name (default: all)'
+        )
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Exit with an error if any template fails to compile'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        results = warm_templates(options['engines'])
+        elapsed = time.perf_counter() - started
+
+        failed = 0
+        for name, result in results.items():
+            self.stdout.write(f'{name}: compiled {result.compiled} templates')
+            for template, error in result.errors.items():
+                failed += 1
+                self.stdout.write(self.style.WARNING(f'  {template}: {error}'))
+
+        if failed and options['strict']:
+            raise CommandError(f'{failed} templates failed to compile')
+        self.stdout.write(
+            self.style.SUCCESS(f'Templates warmed in {elapsed:.2f}s')
+        )
+        logger.info('Templates warmed in %.2fs', elapsed)
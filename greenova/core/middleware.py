@@ -3,6 +3,7 @@
 
 import logging
 
+from core.loaders import loader_scope
 from django.http import HttpRequest
 from django.utils.deprecation import MiddlewareMixin
 
@@ -26,3 +27,19 @@ def process_request(self, request: HttpRequest):
             request.selected_project_id = request.session["selected_project_id"]
         else:
             request.selected_project_id = None
+
+
+class RequestLoaderMiddleware:
+    """
+    Scope template tag batch loaders to a single request.
+
+    Lookups made through ``core.loaders.get_loader`` are memoized for the
+    lifetime of the request and discarded afterwards.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest):
+        with loader_scope():
+            return self.get_response(request)
@@ -1,6 +1,14 @@
-from typing import Any, Dict, List, Optional, Tuple, TypeVar
-
-from django.contrib.auth.mixins import LoginRequiredMixin
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.mixins import AccessMixin, LoginRequiredMixin
+from django.db.models import Count, Max, QuerySet
+from django.http import HttpRequest, HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from django.views.generic.base import ContextMixin
 
 # Define a type variable for views with context data
@@ -91,3 +99,149 @@ class MyView(AuthViewMixin, TemplateView):
             active_section = "dashboard"
             breadcrumbs = [('Home', 'home'), ('Dashboard', None)]
     """
+
+
+def queryset_validator(queryset: QuerySet, *fields: str) -> Tuple[Any, ...]:
+    """
+    Summarize the rows a response is built from with one aggregate query.
+
+    Returns the row count and the latest value of each field (``updated_at``
+    by default), which together change whenever a row is added, edited or
+    deleted.
+    """
+    fields = fields or ('updated_at',)
+    aggregates = {f'latest_{index}': Max(field) for index, field in enumerate(fields)}
+    values = queryset.order_by().aggregate(count=Count('pk'), **aggregates)
+    return tuple(values.values())
+
+
+async def aqueryset_validator(queryset: QuerySet, *fields: str) -> Tuple[Any, ...]:
+    """Async counterpart of ``queryset_validator()`` using ``aaggregate()``."""
+    fields = fields or ('updated_at',)
+    aggregates = {f'latest_{index}': Max(field) for index, field in enumerate(fields)}
+    values = await queryset.order_by().aaggregate(count=Count('pk'), **aggregates)
+    return tuple(values.values())
+
+
+class AsyncLoginRequiredMixin(AccessMixin):
+    """
+    Verify that the current user is authenticated, for views with async handlers.
+
+    The user is loaded with ``request.auser()`` rather than the sync-only lazy
+    ``request.user``, and ``dispatch`` is a coroutine so ``method_decorator``
+    wrappers such as ``cache_control`` await the response.
+
+    Usage:
+        class MyView(AsyncLoginRequiredMixin, TemplateView):
+            async def get(self, request, *args, **kwargs):
+                ...
+    """
+
+    async def dispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponse:
+        # Templates and other sync code read request.user later on
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class ConditionalResponseMixin:
+    """
+    Answer unchanged GET requests with ``304 Not Modified`` before rendering.
+
+    Views return what their output depends on from ``get_validator_parts()``,
+    usually ``queryset_validator()`` of the rows they show. The parts are
+    hashed with the user, the full URL, the HTMX headers, today's date and the
+    app version into an ETag, so a repeated HTMX refresh costs only the
+    validator queries when nothing changed. Place it after
+    ``LoginRequiredMixin`` so anonymous requests are redirected first.
+
+    Views with async handlers override ``aget_validator_parts()`` instead,
+    typically with ``aqueryset_validator()``, and use
+    ``AsyncLoginRequiredMixin``.
+
+    Usage:
+        class MyView(LoginRequiredMixin, ConditionalResponseMixin, ListView):
+            def get_validator_parts(self):
+                return [queryset_validator(self.get_queryset())]
+    """
+
+    def get_validator_parts(self) -> Optional[Iterable[Any]]:
+        """Return the values the response depends on, or None to always render."""
+        return None
+
+    async def aget_validator_parts(self) -> Optional[Iterable[Any]]:
+        """Return the validator parts for an async view."""
+        return await sync_to_async(self.get_validator_parts)()
+
+    def get_etag(self) -> Optional[str]:
+        """Build the response's ETag from the validator parts."""
+        return self.build_etag(self.request.user, self.get_validator_parts())
+
+    async def aget_etag(self) -> Optional[str]:
+        """Build the ETag of an async view's response."""
+        parts = await self.aget_validator_parts()
+        return self.build_etag(await self.request.auser(), parts)
+
+    def build_etag(self, user: Any, parts: Optional[Iterable[Any]]) -> Optional[str]:
+        """Hash the validator parts with the request details into an ETag."""
+        if parts is None:
+            return None
+        request = self.request
+        key = [
+            getattr(user, 'pk', None),
+            request.get_full_path(),
+            request.headers.get('HX-Request', ''),
+            request.headers.get('HX-Target', ''),
+            # Rendered forms embed a token derived from the CSRF secret
+            request.META.get('CSRF_COOKIE', ''),
+            timezone.localdate().isoformat(),
+            getattr(settings, 'APP_VERSION', ''),
+            *parts,
+        ]
+        digest = hashlib.md5(repr(key).encode(), usedforsecurity=False)
+        return quote_etag(digest.hexdigest())
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        if self.view_is_async:
+            return self.adispatch(request, *args, **kwargs)
+        etag = None
+        if request.method in ('GET', 'HEAD'):
+            etag = self.get_etag()
+        not_modified = self.not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+        response = super().dispatch(request, *args, **kwargs)
+        return self.tag_response(response, etag)
+
+    async def adispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponse:
+        etag = None
+        if request.method in ('GET', 'HEAD'):
+            etag = await self.aget_etag()
+        not_modified = self.not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+        response = await super().dispatch(request, *args, **kwargs)
+        return self.tag_response(response, etag)
+
+    def not_modified(
+        self, request: HttpRequest, etag: Optional[str]
+    ) -> Optional[HttpResponse]:
+        """Return a 304 response when the client's copy is still current."""
+        if not etag:
+            return None
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            patch_cache_control(response, private=True)
+        return response
+
+    def tag_response(self, response: HttpResponse, etag: Optional[str]) -> HttpResponse:
+        """Attach the ETag to a successful response."""
+        if etag and response.status_code == 200 and not response.has_header('ETag'):
+            response['ETag'] = etag
+            patch_cache_control(response, private=True)
+        return response
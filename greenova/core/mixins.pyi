@@ -1,7 +1,10 @@
 # Stub file for core.mixins
-from typing import TypeVar
+from collections.abc import Iterable
+from typing import Any, TypeVar
 
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import AccessMixin, LoginRequiredMixin
+from django.db.models import QuerySet
+from django.http import HttpRequest, HttpResponse
 from django.views.generic.base import ContextMixin
 
 ContextView = TypeVar("ContextView", bound=ContextMixin)
@@ -11,3 +14,29 @@ class PageTitleMixin(ContextMixin): ...
 class SectionMixin(ContextMixin): ...
 class ViewMixin(BreadcrumbMixin, PageTitleMixin, SectionMixin): ...
 class AuthViewMixin(LoginRequiredMixin, ViewMixin): ...
+
+def queryset_validator(queryset: QuerySet, *fields: str) -> tuple[Any, ...]: ...
+async def aqueryset_validator(queryset: QuerySet, *fields: str) -> tuple[Any, ...]: ...
+
+class AsyncLoginRequiredMixin(AccessMixin):
+    async def dispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponse: ...
+
+class ConditionalResponseMixin:
+    request: HttpRequest
+    def get_validator_parts(self) -> Iterable[Any] | None: ...
+    async def aget_validator_parts(self) -> Iterable[Any] | None: ...
+    def get_etag(self) -> str | None: ...
+    async def aget_etag(self) -> str | None: ...
+    def build_etag(self, user: Any, parts: Iterable[Any] | None) -> str | None: ...
+    def dispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponse: ...
+    async def adispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponse: ...
+    def not_modified(
+        self, request: HttpRequest, etag: str | None
+    ) -> HttpResponse | None: ...
+    def tag_response(self, response: HttpResponse, etag: str | None) -> HttpResponse: ...
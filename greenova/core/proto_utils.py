@@ -11,7 +11,7 @@
 import importlib
 import logging
 import os
-from typing import Dict, List, Optional, Type
+from typing import IO, Dict, List, Optional, Type
 
 from django.apps import apps
 from django.conf import settings
@@ -106,3 +106,51 @@ def _get_module_name(file_path: str) -> str:
     # Replace directory separators with dots
     module_name = module_path.replace(os.path.sep, '.')
     return module_name
+
+
+def encode_varint(value: int) -> bytes:
+    """
+    Encode a non-negative integer as a Protocol Buffer varint.
+
+    Length-delimited streams prefix each message with its size in this form.
+
+    Args:
+        value: The integer to encode
+
+    Returns:
+        The encoded bytes
+    """
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def read_varint(stream: IO[bytes]) -> Optional[int]:
+    """
+    Read a Protocol Buffer varint from a binary stream.
+
+    Args:
+        stream: Binary file object positioned at the varint
+
+    Returns:
+        The decoded integer, or None if the stream is at its end
+
+    Raises:
+        ValueError: If the stream ends inside the varint or it is too long
+    """
+    result = shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            if shift:
+                raise ValueError('Stream ends inside a length prefix')
+            return None
+        result |= (byte[0] & 0x7F) << shift
+        if not byte[0] & 0x80:
+            return result
+        shift += 7
+        if shift > 35:
+            raise ValueError('Length prefix is too long')
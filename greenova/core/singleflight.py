@@ -0,0 +1,301 @@
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Single-flight computation of shared results.
+
+When many users open the same project at once, each request would otherwise
+run the same aggregate queries and draw the same charts. ``single_flight``
+makes the requests for one ``(name, scope, version)`` share a single
+computation:
+
+* Threads of one worker queue on a per-key lock, so only the first one
+  computes and the rest read its result from the cache.
+* Workers take a lease in the ``"shared"`` cache with ``add``. A worker that
+  finds the lease taken polls the shared cache for the holder's result instead
+  of computing it again. The results, the leases and the data version they are
+  keyed on live in the same cache, so every worker on the host sees them. The
+  file-based cache checks and writes a lease in two steps, so two workers may
+  rarely both take it; they then compute the same result twice, which is
+  harmless.
+
+Results are kept for ``stale_for`` seconds. A result is fresh while its
+version matches and it is younger than ``fresh_for``. With ``stale_ok`` an
+older result is returned at once and refreshed in a background thread, so
+users never wait on a recompute when a slightly stale value is acceptable.
+
+``asingle_flight`` is the counterpart for async views. It coalesces the
+coroutines of one event loop with a shared future and never serves stale
+results.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Hashable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.cache import caches
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Cache alias shared by every worker for results and leases
+RESULT_CACHE = "shared"
+
+# Seconds a worker may hold a lease before others compute without it
+LEASE_TIMEOUT = 30
+
+# Seconds between cache reads while another worker holds the lease
+POLL_INTERVAL = 0.05
+
+DEFAULT_FRESH_FOR = 300
+DEFAULT_STALE_FOR = 3600
+
+
+@dataclass
+class Entry:
+    """A cached result and the data version it was computed from."""
+
+    value: Any
+    version: Hashable
+    computed_at: float
+
+    def is_fresh(self, version: Hashable, fresh_for: float) -> bool:
+        """Return whether the result can be served without recomputing."""
+        return self.version == version and time.time() - self.computed_at < fresh_for
+
+
+class _KeyLocks:
+    """Per-key locks that are dropped once no thread holds or waits for them."""
+
+    def __init__(self) -> None:
+        self._guard = threading.Lock()
+        self._locks: dict[str, tuple[threading.Lock, int]] = {}
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        with self._guard:
+            lock, users = self._locks.get(key, (threading.Lock(), 0))
+            self._locks[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._guard:
+                lock, users = self._locks[key]
+                if users == 1:
+                    del self._locks[key]
+                else:
+                    self._locks[key] = (lock, users - 1)
+
+
+_key_locks = _KeyLocks()
+
+# In-flight async computations by event loop, key and version
+_inflight: dict[tuple[int, str, Hashable], asyncio.Future] = {}
+
+
+def cache_key(name: str, scope: Hashable) -> str:
+    """Return the cache key holding the result of ``name`` for ``scope``."""
+    digest = hashlib.md5(repr(scope).encode(), usedforsecurity=False).hexdigest()
+    return f"singleflight:{name}:{digest}"
+
+
+def lease_key(name: str, scope: Hashable, version: Hashable) -> str:
+    """Return the cache key of the lease for computing one version."""
+    return f"{cache_key(name, scope)}:lease:{version}"
+
+
+def _store(key: str, version: Hashable, value: Any, stale_for: float) -> None:
+    caches[RESULT_CACHE].set(key, Entry(value, version, time.time()), timeout=stale_for)
+
+
+def _compute_with_lease(
+    key: str,
+    lease: str,
+    version: Hashable,
+    compute: Callable[[], Any],
+    stale_for: float,
+) -> Any:
+    """Compute under the cross-worker lease, or wait for the worker holding it."""
+    deadline = time.monotonic() + LEASE_TIMEOUT
+    while True:
+        if caches[RESULT_CACHE].add(lease, uuid.uuid4().hex, timeout=LEASE_TIMEOUT):
+            try:
+                value = compute()
+                _store(key, version, value, stale_for)
+                return value
+            finally:
+                caches[RESULT_CACHE].delete(lease)
+
+        time.sleep(POLL_INTERVAL)
+        entry = caches[RESULT_CACHE].get(key)
+        if entry is not None and entry.version == version:
+            return entry.value
+        if time.monotonic() > deadline:
+            logger.warning("Lease %s held too long, computing without it", lease)
+            return compute()
+
+
+def _refresh(
+    key: str,
+    lease: str,
+    version: Hashable,
+    compute: Callable[[], Any],
+    stale_for: float,
+) -> None:
+    """Recompute a stale result unless another thread or worker already is."""
+    try:
+        if not caches[RESULT_CACHE].add(lease, uuid.uuid4().hex, timeout=LEASE_TIMEOUT):
+            return
+        try:
+            _store(key, version, compute(), stale_for)
+        finally:
+            caches[RESULT_CACHE].delete(lease)
+    except Exception:
+        logger.exception("Background refresh of %s failed", key)
+    finally:
+        # The thread opened its own database connections
+        connections.close_all()
+
+
+def single_flight(
+    name: str,
+    scope: Hashable,
+    version: Hashable,
+    compute: Callable[[], Any],
+    *,
+    fresh_for: float = DEFAULT_FRESH_FOR,
+    stale_for: float = DEFAULT_STALE_FOR,
+    stale_ok: bool = False,
+) -> Any:
+    """
+    Return the result of ``compute``, sharing one computation per version.
+
+    Args:
+        name: Name of the computation, such as "mechanisms.charts"
+        scope: What the result depends on besides the data, such as a
+            project ID and the filters applied; must have a stable repr
+        version: Data version the result is computed from
+        compute: Builds the result; it must be picklable
+        fresh_for: Seconds a result is served without recomputing
+        stale_for: Seconds a result is kept in the cache
+        stale_ok: Return an outdated result at once and refresh it in
+            the background
+
+    Returns:
+        The computed or cached result
+    """
+    key = cache_key(name, scope)
+    lease = lease_key(name, scope, version)
+
+    entry = caches[RESULT_CACHE].get(key)
+    if entry is not None:
+        if entry.is_fresh(version, fresh_for):
+            return entry.value
+        if stale_ok:
+            if not caches[RESULT_CACHE].has_key(lease):
+                threading.Thread(
+                    target=_refresh,
+                    args=(key, lease, version, compute, stale_for),
+                    name=f"refresh-{name}",
+                    daemon=True,
+                ).start()
+            return entry.value
+
+    with _key_locks.hold(f"{key}:{version}"):
+        # Another thread may have computed it while this one waited
+        entry = caches[RESULT_CACHE].get(key)
+        if entry is not None and entry.is_fresh(version, fresh_for):
+            return entry.value
+        return _compute_with_lease(key, lease, version, compute, stale_for)
+
+
+async def _acompute_with_lease(
+    key: str,
+    lease: str,
+    version: Hashable,
+    compute: Callable[[], Awaitable[Any]],
+    stale_for: float,
+) -> Any:
+    """Async counterpart of _compute_with_lease()."""
+    deadline = time.monotonic() + LEASE_TIMEOUT
+    while True:
+        if await caches[RESULT_CACHE].aadd(
+            lease, uuid.uuid4().hex, timeout=LEASE_TIMEOUT
+        ):
+            try:
+                value = await compute()
+                await caches[RESULT_CACHE].aset(
+                    key, Entry(value, version, time.time()), timeout=stale_for
+                )
+                return value
+            finally:
+                await caches[RESULT_CACHE].adelete(lease)
+
+        await asyncio.sleep(POLL_INTERVAL)
+        entry = await caches[RESULT_CACHE].aget(key)
+        if entry is not None and entry.version == version:
+            return entry.value
+        if time.monotonic() > deadline:
+            logger.warning("Lease %s held too long, computing without it", lease)
+            return await compute()
+
+
+async def asingle_flight(
+    name: str,
+    scope: Hashable,
+    version: Hashable,
+    compute: Callable[[], Awaitable[Any]],
+    *,
+    fresh_for: float = DEFAULT_FRESH_FOR,
+    stale_for: float = DEFAULT_STALE_FOR,
+) -> Any:
+    """
+    Async counterpart of single_flight() for coroutine computations.
+
+    Args:
+        name: Name of the computation
+        scope: What the result depends on besides the data
+        version: Data version the result is computed from
+        compute: Coroutine function building the result
+        fresh_for: Seconds a result is served without recomputing
+        stale_for: Seconds a result is kept in the cache
+
+    Returns:
+        The computed or cached result
+    """
+    key = cache_key(name, scope)
+    entry = await caches[RESULT_CACHE].aget(key)
+    if entry is not None and entry.is_fresh(version, fresh_for):
+        return entry.value
+
+    flight = (id(asyncio.get_running_loop()), key, version)
+    if flight in _inflight:
+        # A cancelled waiter must not cancel the shared computation
+        return await asyncio.shield(_inflight[flight])
+
+    future = _inflight[flight] = asyncio.get_running_loop().create_future()
+    try:
+        value = await _acompute_with_lease(
+            key, lease_key(name, scope, version), version, compute, stale_for
+        )
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as exc:
+        future.set_exception(exc)
+        # Waiters re-raise it; mark it retrieved for when there are none
+        future.exception()
+        raise
+    else:
+        future.set_result(value)
+        return value
+    finally:
+        del _inflight[flight]
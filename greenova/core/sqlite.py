@@ -0,0 +1,171 @@
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+SQLite production profile.
+
+Every new SQLite connection is configured from ``settings.SQLITE_PRAGMAS``
+by the ``connection_created`` hook connected in ``CoreConfig.ready()``:
+
+* ``journal_mode=WAL`` lets readers keep reading a consistent snapshot while a
+  writer commits, instead of blocking behind its lock.
+* ``busy_timeout`` makes a second writer wait for the lock rather than fail
+  at once with "database is locked".
+* ``synchronous=NORMAL`` is durable in WAL mode except for the last commits
+  before a power loss, and avoids an fsync per transaction.
+* ``mmap_size``, ``cache_size`` and ``temp_store`` keep hot pages and
+  temporary sort tables in memory.
+
+``sqlite_maintenance`` runs the periodic ``PRAGMA optimize``/``ANALYZE``,
+WAL checkpoint and incremental vacuum.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from django.conf import settings
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+logger = logging.getLogger(__name__)
+
+# Rows in the scratch table used by benchmark_concurrency
+BENCHMARK_ROWS = 50_000
+
+DEFAULT_PRAGMAS: dict[str, Any] = {
+    "journal_mode": "WAL",
+    "busy_timeout": 5000,
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    # Negative values are KiB rather than pages
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+}
+
+
+def get_pragmas() -> dict[str, Any]:
+    """Return the configured pragmas, falling back to the production profile."""
+    return getattr(settings, "SQLITE_PRAGMAS", DEFAULT_PRAGMAS)
+
+
+def apply_pragmas(cursor: Any, pragmas: dict[str, Any] | None = None) -> None:
+    """
+    Apply pragmas through a DB-API cursor.
+
+    Args:
+        cursor: Cursor of an SQLite connection
+        pragmas: Pragma names and values (defaults to ``get_pragmas()``)
+    """
+    for name, value in (get_pragmas() if pragmas is None else pragmas).items():
+        # Pragma names and values cannot be bound as query parameters
+        cursor.execute(f"PRAGMA {name}={value}")
+
+
+def configure_sqlite(
+    sender: Any, connection: BaseDatabaseWrapper, **kwargs: Any
+) -> None:
+    """Apply the SQLite profile to each new connection."""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor)
+    logger.debug("Configured SQLite connection %s", connection.alias)
+
+
+def benchmark_concurrency(
+    path: str,
+    pragmas: dict[str, Any] | None = None,
+    duration: float = 2.0,
+    readers: int = 4,
+    hold: float = 0.05,
+) -> dict[str, Any]:
+    """
+    Measure how long readers wait while a writer keeps committing.
+
+    A writer thread repeatedly rewrites every row of a scratch table in one
+    transaction, holds it open for ``hold`` seconds and commits; without WAL
+    a transaction this size takes the exclusive lock before it commits.
+    Reader threads meanwhile look up single rows in a loop and time each one.
+
+    Args:
+        path: Scratch database file, created if missing
+        pragmas: Pragmas for every connection (defaults to ``get_pragmas()``)
+        duration: Seconds to run
+        readers: Number of reader threads
+        hold: Seconds the writer holds each transaction open
+
+    Returns:
+        dict: Write and read counts, reader latencies in milliseconds and
+        the number of reads that failed with "database is locked"
+    """
+    pragmas = get_pragmas() if pragmas is None else pragmas
+
+    def connect() -> sqlite3.Connection:
+        conn = sqlite3.connect(path, timeout=20, isolation_level=None)
+        apply_pragmas(conn.cursor(), pragmas)
+        return conn
+
+    setup = connect()
+    setup.execute("CREATE TABLE IF NOT EXISTS bench (id INTEGER PRIMARY KEY, v TEXT)")
+    if not setup.execute("SELECT COUNT(*) FROM bench").fetchone()[0]:
+        setup.executemany(
+            "INSERT INTO bench (v) VALUES (?)", [("x" * 100,)] * BENCHMARK_ROWS
+        )
+    setup.close()
+
+    stop = threading.Event()
+    latencies: list[float] = []
+    errors = 0
+    writes = 0
+    lock = threading.Lock()
+
+    def write() -> None:
+        nonlocal writes
+        conn = connect()
+        while not stop.is_set():
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("UPDATE bench SET v = ?", (str(writes % 10) * 100,))
+            time.sleep(hold)
+            conn.execute("COMMIT")
+            writes += 1
+        conn.close()
+
+    def read() -> None:
+        nonlocal errors
+        conn = connect()
+        reads = 0
+        while not stop.is_set():
+            reads += 1
+            started = time.perf_counter()
+            try:
+                conn.execute(
+                    "SELECT v FROM bench WHERE id = ?", (reads % BENCHMARK_ROWS + 1,)
+                ).fetchone()
+            except sqlite3.OperationalError:
+                with lock:
+                    errors += 1
+                continue
+            with lock:
+                latencies.append((time.perf_counter() - started) * 1000)
+        conn.close()
+
+    threads = [threading.Thread(target=write)]
+    threads += [threading.Thread(target=read) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    return {
+        "writes": writes,
+        "reads": len(latencies),
+        "read_errors": errors,
+        "read_ms_p50": latencies[len(latencies) // 2] if latencies else None,
+        "read_ms_p99": latencies[int(len(latencies) * 0.99)] if latencies else None,
+        "read_ms_max": latencies[-1] if latencies else None,
+    }
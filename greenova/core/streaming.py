@@ -0,0 +1,49 @@
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Async iteration of blocking response generators.
+
+Under ASGI, ``StreamingHttpResponse`` consumes a synchronous iterator with
+``sync_to_async(list)``, so the whole body is built in memory before the first
+byte is sent. ``aiterate`` wraps such a generator in an async one that pulls
+one chunk at a time from the request's thread-sensitive executor. The blocking
+code, including database cursors, therefore always runs on the same thread,
+and memory stays bounded by the generator's own chunk size.
+"""
+
+from collections.abc import AsyncIterator, Iterable
+from typing import TypeVar
+
+from asgiref.sync import sync_to_async
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+async def aiterate(iterable: Iterable[T]) -> AsyncIterator[T]:
+    """
+    Yield the items of a blocking iterable without blocking the event loop.
+
+    The iterator is closed when iteration stops early, for example when the
+    client disconnects, so it can release its cursor.
+
+    Args:
+        iterable: Iterable whose items may do blocking I/O to produce
+
+    Yields:
+        The iterable's items, in order
+    """
+    iterator = iter(iterable)
+    get_next = sync_to_async(next)
+    try:
+        while True:
+            item = await get_next(iterator, _DONE)
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await sync_to_async(close)()
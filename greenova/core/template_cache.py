@@ -0,0 +1,113 @@
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Template precompilation.
+
+Both template engines keep what they compile:
+
+* The Django engine loads through the cached loader (see
+  ``settings.TEMPLATE_LOADERS``), so each worker compiles a template once and
+  keeps it in memory.
+* The Jinja2 environment writes compiled templates to a
+  ``FileSystemBytecodeCache`` in ``settings.JINJA2_BYTECODE_CACHE_DIR`` (or
+  Jinja2's per-user default), which every worker on the host reads.
+
+``warm_templates()`` compiles every template of every engine. The
+``warm_templates`` management command runs it at deploy time, which fills the
+Jinja2 cache on disk and reports templates with syntax errors. The gunicorn
+``post_worker_init`` hook runs it in each worker, so the worker's first
+requests do not pay for compiling templates.
+"""
+
+import logging
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.base import BaseEngine
+from django.template.backends.django import DjangoTemplates
+from django.template.backends.jinja2 import Jinja2
+
+logger = logging.getLogger(__name__)
+
+# Files treated as templates; template directories also hold Python modules
+TEMPLATE_EXTENSIONS = (".html", ".txt", ".xml")
+
+
+@dataclass
+class WarmResult:
+    """Templates compiled by one engine and the ones that failed."""
+
+    compiled: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+def _django_loaders(loaders: list) -> Iterator:
+    """Yield the loaders that read files, unwrapping the partials and cached loaders."""
+    for loader in loaders:
+        if hasattr(loader, "loaders"):
+            yield from _django_loaders(loader.loaders)
+        else:
+            yield loader
+
+
+def template_names(backend: BaseEngine) -> list[str]:
+    """
+    List the names of the templates an engine can load.
+
+    Args:
+        backend: A Django or Jinja2 template backend
+
+    Returns:
+        list: Template names, without duplicates, in loading order
+    """
+    if isinstance(backend, Jinja2):
+        return backend.env.list_templates(
+            filter_func=lambda name: name.endswith(TEMPLATE_EXTENSIONS)
+        )
+    if not isinstance(backend, DjangoTemplates):
+        return []
+
+    names: dict[str, None] = {}
+    for loader in _django_loaders(backend.engine.template_loaders):
+        for directory in loader.get_dirs():
+            for root, _, files in os.walk(directory):
+                for filename in sorted(files):
+                    if filename.endswith(TEMPLATE_EXTENSIONS):
+                        path = os.path.join(root, filename)
+                        name = os.path.relpath(path, directory)
+                        names[name.replace(os.sep, "/")] = None
+    return list(names)
+
+
+def warm_templates(aliases: list[str] | None = None) -> dict[str, WarmResult]:
+    """
+    Compile every template so later renders only read the caches.
+
+    Args:
+        aliases: Engine names from ``settings.TEMPLATES`` (defaults to all)
+
+    Returns:
+        dict: A ``WarmResult`` for each engine name
+    """
+    results = {}
+    for backend in engines.all():
+        if aliases and backend.name not in aliases:
+            continue
+        result = results[backend.name] = WarmResult()
+        for name in template_names(backend):
+            try:
+                backend.get_template(name)
+            except (TemplateSyntaxError, UnicodeDecodeError) as exc:
+                result.errors[name] = str(exc)
+            else:
+                result.compiled += 1
+        logger.info(
+            "Compiled %d %s templates (%d errors)",
+            result.compiled,
+            backend.name,
+            len(result.errors),
+        )
+    return results
@@ -7,6 +7,7 @@
     THEME_OPTIONS,
     USER_NAVIGATION,
 )
+from core.loaders import get_loader
 from django import template
 from django.conf import settings
 from django.urls import NoReverseMatch, reverse
@@ -138,6 +139,19 @@ def user_role_in_project(project, user):
     return None
 
 
+@register.simple_tag
+def prime_loader(name, objects):
+    """
+    Queue the keys of several objects on a batch loader.
+
+    Used before a loop, e.g. ``{% prime_loader "mechanism_names" ids %}``, so
+    the filters inside it resolve with a single query. Objects may be model
+    instances or primary keys.
+    """
+    get_loader(name).prime(getattr(obj, "pk", obj) for obj in objects)
+    return ""
+
+
 @register.simple_tag(takes_context=True)
 def base_url(context):
     """Get the base URL from the request."""
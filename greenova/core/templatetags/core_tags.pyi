@@ -12,4 +12,5 @@ def theme_switcher() -> dict: ...
 def site_version() -> str: ...
 def main_navigation(context: Any) -> dict: ...
 def user_role_in_project(project: Any, user: Any) -> Any: ...
+def prime_loader(name: str, objects: Any) -> str: ...
 def base_url(context: Any) -> str: ...
@@ -4,3 +4,7 @@
 class DashboardConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "dashboard"
+
+    def ready(self):
+        # Connect the signal handlers and the event publisher listening to them
+        from . import events, signals  # noqa: F401
@@ -0,0 +1,319 @@
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Server-sent dashboard updates.
+
+When an obligation changes, ``dashboard.signals`` sends ``dashboard_data_updated``
+and this module turns it into a compact ``DashboardEvent`` row: the obligation
+number, its new status and the changes to the dashboard counters. Bulk writes
+skip the per-row signals and send ``obligations_bulk_changed`` instead, which
+becomes one event per project with the summed counter changes. Rows are
+written when the transaction commits, so every worker sees them.
+
+Each ASGI worker runs one ``EventHub`` poller that reads new rows with a single
+indexed query every ``POLL_INTERVAL`` seconds, however many dashboards are
+open, and hands each event to the streams subscribed to its project. Streams
+are resumed from the ``Last-Event-ID`` header after a reconnect.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Max
+from django.dispatch import receiver
+from django.utils import timezone
+from obligations.constants import STATUS_COMPLETED
+from obligations.models import obligations_bulk_changed
+from obligations.templatetags.obligation_tags import display_status
+
+from .models import DashboardEvent
+from .signals import dashboard_data_updated
+
+logger = logging.getLogger(__name__)
+
+# Seconds between polls of the event table by each worker
+POLL_INTERVAL = 0.5
+
+# Seconds of silence before a stream sends a keep-alive comment
+KEEPALIVE_INTERVAL = 15
+
+# Milliseconds a disconnected browser waits before reconnecting
+RETRY_MS = 2000
+
+# Events kept for Last-Event-ID replay
+RETENTION = timedelta(minutes=10)
+
+# Seconds between prunes of expired events
+PRUNE_INTERVAL = 60
+
+# Events buffered per stream; a stream that falls further behind is closed
+# and the browser catches up by replaying from its last event id
+QUEUE_SIZE = 200
+
+# Days ahead counted by the "upcoming deadlines" card
+UPCOMING_DAYS = 7
+
+EVENT_OBLIGATION = "obligation"
+EVENT_OBLIGATIONS = "obligations"
+
+
+def dashboard_counters(
+    status: str | None, due_date: date | None, today: date | None = None
+) -> dict[str, int]:
+    """
+    Return the dashboard counters a single obligation contributes to.
+
+    Args:
+        status: Obligation status, or None for an obligation that is gone
+        due_date: Action due date
+        today: Reference date (defaults to today)
+
+    Returns:
+        dict: Counter names mapped to 1 for each counter the obligation is in
+    """
+    if not status:
+        return {}
+    today = today or timezone.now().date()
+    counters = {status: 1}
+    if status != STATUS_COMPLETED:
+        counters["active"] = 1
+        if due_date and due_date < today:
+            counters["overdue"] = 1
+        elif due_date and due_date <= today + timedelta(days=UPCOMING_DAYS):
+            counters["upcoming"] = 1
+    return counters
+
+
+def counter_deltas(before: dict[str, int], after: dict[str, int]) -> dict[str, int]:
+    """Return the non-zero changes between two sets of counters."""
+    deltas = {name: after.get(name, 0) - before.get(name, 0) for name in before | after}
+    return {name: delta for name, delta in deltas.items() if delta}
+
+
+def publish(project_id: int, kind: str, payload: dict[str, Any]) -> None:
+    """
+    Queue an event for the dashboards of a project.
+
+    The event is written once the current transaction commits, so streams
+    never report a change that was rolled back.
+    """
+    transaction.on_commit(
+        lambda: DashboardEvent.objects.create(
+            project_id=project_id, kind=kind, payload=payload
+        )
+    )
+
+
+@receiver(dashboard_data_updated)
+def publish_obligation_change(
+    sender: Any,
+    obligation: Any,
+    previous: dict[str, Any],
+    deleted: bool = False,
+    **kwargs: Any,
+) -> None:
+    """
+    Publish the counter changes caused by an obligation save or delete.
+
+    Args:
+        sender: The Obligation model
+        obligation: The saved or deleted obligation
+        previous: Previous values of the changed fields, empty for new rows
+        deleted: Whether the obligation was deleted
+    """
+    created = kwargs.get("created", False)
+    old_project = previous.get("project_id", obligation.project_id)
+    old_status = None if created else previous.get("status", obligation.status)
+    old_due = previous.get("action_due_date", obligation.action_due_date)
+    new_status = None if deleted else obligation.status
+
+    before = dashboard_counters(old_status, old_due)
+    after = dashboard_counters(new_status, obligation.action_due_date)
+    base = {"obligation": obligation.pk, "status": new_status}
+    if new_status:
+        base["status_html"] = str(display_status(obligation))
+
+    if old_project != obligation.project_id:
+        # A move leaves one project's dashboards and enters another's
+        if old_project and before:
+            publish(
+                old_project,
+                EVENT_OBLIGATION,
+                {**base, "status": None, "counters": counter_deltas(before, {})},
+            )
+        before = {}
+    if obligation.project_id:
+        publish(
+            obligation.project_id,
+            EVENT_OBLIGATION,
+            {**base, "created": created, "counters": counter_deltas(before, after)},
+        )
+
+
+@receiver(obligations_bulk_changed)
+def publish_bulk_change(
+    sender: Any,
+    before: Iterable[tuple[int | None, str | None, date | None]],
+    after: Iterable[tuple[int | None, str | None, date | None]],
+    **kwargs: Any,
+) -> None:
+    """
+    Publish one event per project for obligations written in bulk.
+
+    Args:
+        sender: The Obligation model
+        before: (project_id, status, action_due_date) of the rows before
+        after: (project_id, status, action_due_date) of the rows after
+    """
+    today = timezone.now().date()
+    totals: dict[int, Counter[str]] = {}
+    for sign, rows in ((-1, before), (1, after)):
+        for project_id, status, due_date in rows:
+            if project_id is None:
+                continue
+            counters = totals.setdefault(project_id, Counter())
+            for name, value in dashboard_counters(status, due_date, today).items():
+                counters[name] += sign * value
+
+    for project_id, counters in totals.items():
+        publish(
+            project_id,
+            EVENT_OBLIGATIONS,
+            {"counters": {name: delta for name, delta in counters.items() if delta}},
+        )
+
+
+def format_event(event: DashboardEvent) -> str:
+    """Encode an event in the ``text/event-stream`` format."""
+    data = json.dumps(event.payload, separators=(",", ":"))
+    return f"id: {event.pk}\nevent: {event.kind}\ndata: {data}\n\n"
+
+
+@dataclass(eq=False)
+class Subscription:
+    """One open stream's view of the hub."""
+
+    project_ids: frozenset[int]
+    start_id: int
+    queue: asyncio.Queue = field(
+        default_factory=lambda: asyncio.Queue(maxsize=QUEUE_SIZE)
+    )
+    overflowed: bool = False
+
+    def offer(self, event: DashboardEvent) -> None:
+        if event.project_id not in self.project_ids or self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventHub:
+    """Fan events out from one poller per worker to many streams."""
+
+    def __init__(self, poll_interval: float = POLL_INTERVAL) -> None:
+        self.poll_interval = poll_interval
+        self.subscriptions: set[Subscription] = set()
+        self.last_id: int | None = None
+        self._poller: asyncio.Task | None = None
+        self._last_prune = 0.0
+
+    async def subscribe(self, project_ids: Iterable[int]) -> Subscription:
+        """Register a stream for the events of some projects."""
+        if self.last_id is None:
+            latest = await DashboardEvent.objects.aaggregate(latest=Max("pk"))
+            if self.last_id is None:
+                self.last_id = latest["latest"] or 0
+        subscription = Subscription(frozenset(project_ids), self.last_id)
+        self.subscriptions.add(subscription)
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscriptions.discard(subscription)
+
+    async def poll_once(self) -> int:
+        """Read new events and hand them to subscribers; return how many."""
+        count = 0
+        new_events = DashboardEvent.objects.filter(pk__gt=self.last_id or 0)
+        async for event in new_events.order_by("pk")[:500]:
+            self.last_id = event.pk
+            count += 1
+            for subscription in list(self.subscriptions):
+                subscription.offer(event)
+        return count
+
+    async def _poll(self) -> None:
+        # Stops when the last stream closes; the next subscriber restarts it
+        while self.subscriptions:
+            try:
+                await self.poll_once()
+                if time.monotonic() - self._last_prune > PRUNE_INTERVAL:
+                    self._last_prune = time.monotonic()
+                    await prune_events()
+            except Exception:
+                logger.exception("Dashboard event poll failed")
+            await asyncio.sleep(self.poll_interval)
+        self.last_id = None
+
+
+hub = EventHub()
+
+
+async def prune_events(retention: timedelta = RETENTION) -> int:
+    """Delete events too old to be replayed."""
+    deleted, _ = await DashboardEvent.objects.filter(
+        created_at__lt=timezone.now() - retention
+    ).adelete()
+    return deleted
+
+
+async def stream_events(
+    project_ids: Iterable[int],
+    last_event_id: int | None = None,
+    event_hub: EventHub | None = None,
+) -> AsyncIterator[str]:
+    """
+    Yield ``text/event-stream`` chunks for the given projects until closed.
+
+    Args:
+        project_ids: Projects whose events the stream receives
+        last_event_id: Id of the last event the client saw, to replay from
+        event_hub: Hub to subscribe to (defaults to the worker's hub)
+    """
+    event_hub = event_hub or hub
+    project_ids = frozenset(project_ids)
+    subscription = await event_hub.subscribe(project_ids)
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        if last_event_id is not None:
+            missed = DashboardEvent.objects.filter(
+                project_id__in=project_ids,
+                pk__gt=last_event_id,
+                pk__lte=subscription.start_id,
+            ).order_by("pk")
+            async for event in missed:
+                yield format_event(event)
+
+        while not subscription.overflowed:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), KEEPALIVE_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_event(event)
+    finally:
+        event_hub.unsubscribe(subscription)
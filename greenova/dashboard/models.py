@@ -0,0 +1,34 @@
+"""
+models.py for the dashboard app in Greenova.
+
+``DashboardEvent`` rows are the channel that carries obligation changes from
+whichever worker saved them to every worker holding an open dashboard stream.
+They are short-lived and pruned by the streaming workers themselves.
+"""
+
+from typing import Any
+
+from django.db import models
+
+
+class DashboardEvent(models.Model):
+    """A compact change notification for the dashboards of one project."""
+
+    project_id: Any = models.BigIntegerField()
+    kind: Any = models.CharField(max_length=30)
+    payload: Any = models.JSONField(default=dict)
+    created_at: Any = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["pk"]
+        verbose_name = "Dashboard event"
+        verbose_name_plural = "Dashboard events"
+        indexes = [
+            # Serves Last-Event-ID replay for one project
+            models.Index(
+                fields=["project_id", "id"], name="dashboard_event_replay_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} #{self.pk} (project {self.project_id})"
@@ -12,14 +12,17 @@
 from typing import Any
 
 from django.contrib.auth.signals import user_logged_in
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import Signal, receiver
 from django.http import HttpRequest
-from obligations.models import Obligation
+from obligations.models import Obligation, row_handlers_suspended
 from projects.models import Project
 
 logger = logging.getLogger(__name__)
 
+# Obligation fields whose changes are reflected on open dashboards
+DASHBOARD_FIELDS = {"status", "action_due_date", "project_id"}
+
 # Custom signals
 project_selected = Signal()  # Sent when a project is selected
 dashboard_data_updated = Signal()  # Sent when dashboard data is updated
@@ -75,7 +78,7 @@ def restore_dashboard_state(
     try:
         # Try to get the user's last accessed project
         last_project = (
-            Project.objects.filter(members=user).order_by("-last_accessed").first()
+            Project.objects.filter(members=user).order_by("-updated_at").first()
         )
 
         if last_project:
@@ -91,23 +94,54 @@ def restore_dashboard_state(
 
 @receiver(post_save, sender=Obligation)
 def update_dashboard_data(
-    sender: Any, instance: Obligation, **kwargs: dict[str, Any]
+    sender: Any, instance: Obligation, created: bool = False, **kwargs: Any
 ) -> None:
     """
     Signal handler to update dashboard data when obligations change.
 
+    Sends ``dashboard_data_updated`` with the previous values of the fields
+    the dashboard shows, so listeners can publish counter changes instead of
+    recounting. Saves that leave those fields alone are ignored.
+
     Args:
         sender: The model class sending the signal
         instance: The Obligation instance that was saved
+        created: Whether the obligation was just created
         **kwargs: Additional keyword arguments
     """
-    # This currently just logs the event
-    # In a real-time application, this might trigger WebSocket updates
-    logger.debug("Dashboard data updated due to change in obligation %s", instance.id)
+    if row_handlers_suspended():
+        return
+    previous = {} if created else instance.changed_fields()
+    if not created and not previous.keys() & DASHBOARD_FIELDS:
+        return
+    logger.debug("Dashboard data updated due to change in obligation %s", instance.pk)
+    dashboard_data_updated.send(
+        sender=sender,
+        obligation=instance,
+        obligation_id=instance.pk,
+        project_id=instance.project_id,
+        created=created,
+        previous=previous,
+    )
+
 
-    # Send the custom signal
+@receiver(post_delete, sender=Obligation)
+def remove_dashboard_data(sender: Any, instance: Obligation, **kwargs: Any) -> None:
+    """
+    Signal handler to update dashboard data when an obligation is deleted.
+
+    Args:
+        sender: The model class sending the signal
+        instance: The Obligation instance that was deleted
+        **kwargs: Additional keyword arguments
+    """
+    if row_handlers_suspended():
+        return
     dashboard_data_updated.send(
         sender=sender,
-        obligation_id=instance.id,
-        project_id=instance.project_id if hasattr(instance, "project") else None,
+        obligation=instance,
+        obligation_id=instance.pk,
+        project_id=instance.project_id,
+        deleted=True,
+        previous={},
     )
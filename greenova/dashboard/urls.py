@@ -11,6 +11,9 @@
         views.UpcomingObligationsView.as_view(),
         name="upcoming_obligations",
     ),
+    path("events/", views.dashboard_events, name="events"),
+    path("trend/", views.ComplianceTrendView.as_view(), name="compliance_trend"),
+    path("calendar/", views.ObligationCalendarView.as_view(), name="calendar"),
     path(
         "projects-at-risk/", views.ProjectsAtRiskView.as_view(), name="projects_at_risk"
     ),
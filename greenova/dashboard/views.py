@@ -5,23 +5,53 @@
 
 """
 
+import asyncio
 import base64
 import logging
 from datetime import datetime, timedelta  # Use timedelta from datetime
+from functools import partial
 from typing import Any, TypedDict, cast
 
+from asgiref.sync import sync_to_async
+from core.mixins import (
+    AsyncLoginRequiredMixin,
+    ConditionalResponseMixin,
+    aqueryset_validator,
+    queryset_validator,
+)
+from core.singleflight import asingle_flight
 from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import AbstractUser
-from django.db.models import QuerySet
-from django.http import HttpRequest, HttpResponse
+from django.db.models import Count, Max, QuerySet
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.utils import timezone
 from django.utils.decorators import method_decorator
+from django.views import View
 from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_GET
 from django.views.decorators.vary import vary_on_headers
 from django.views.generic import ListView, TemplateView
-from obligations.models import Obligation
+from obligations.constants import STATUS_COMPLETED
+from obligations.models import ComplianceSnapshot, Obligation, ObligationOccurrence
+from obligations.snapshots import (
+    DEFAULT_MAX_POINTS,
+    aactive_count_on,
+    compliance_trend,
+    percentage_change,
+)
+from obligations.utils import aget_data_version, overdue_filter
 from projects.models import Project
 
+from .events import UPCOMING_DAYS, stream_events
+
 # Import our new components
 from .figures import (
     create_obligations_status_chart_svg,
@@ -34,6 +64,12 @@
 APP_VERSION = "0.0.6"  # or fetch from settings/environment
 LAST_UPDATED = datetime.now().date()  # or fetch from settings/environment
 
+# Days back the active obligations trend compares against
+TREND_DAYS = 30
+
+# Seconds shared KPI counts are reused, matching the page's max-age
+KPI_FRESH_FOR = 60
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,6 +98,50 @@ def get_selected_project_id(request: HttpRequest) -> int | None:
     return project_id or request.session.get("selected_project_id")
 
 
+async def aget_selected_project_id(request: HttpRequest) -> int | None:
+    """Async counterpart of get_selected_project_id() for async views."""
+    project_ids = request.GET.getlist("project_id")
+    project_id = next((pid for pid in reversed(project_ids) if pid), None)
+    if project_id:
+        await request.session.aset("selected_project_id", project_id)
+    else:
+        await request.session.apop("selected_project_id", None)
+    return project_id or await request.session.aget("selected_project_id")
+
+
+async def acount_obligation_kpis(project_id: str | None) -> dict[str, int]:
+    """
+    Count the obligation KPIs, running the independent queries concurrently.
+
+    Args:
+        project_id: Selected project, or None to count every project
+
+    Returns:
+        dict: Context entries for the obligation KPI cards
+    """
+    obligations = Obligation.objects.all()
+    snapshots = ComplianceSnapshot.objects.all()
+    if project_id:
+        obligations = obligations.filter(project_id=project_id)
+        snapshots = snapshots.filter(project_id=project_id)
+    active = obligations.exclude(status=STATUS_COMPLETED)
+    today = timezone.now().date()
+    later = today + timedelta(days=UPCOMING_DAYS)
+
+    overdue, active_count, upcoming, last_month = await asyncio.gather(
+        obligations.filter(overdue_filter()).acount(),
+        active.acount(),
+        active.filter(action_due_date__range=(today, later)).acount(),
+        aactive_count_on(snapshots, today - timedelta(days=TREND_DAYS)),
+    )
+    return {
+        "overdue_obligations_count": overdue,
+        "active_obligations_count": active_count,
+        "active_obligations_trend": percentage_change(last_month, active_count),
+        "upcoming_deadlines_count": upcoming,
+    }
+
+
 @method_decorator(cache_control(max_age=60), name="dispatch")
 @method_decorator(vary_on_headers("HX-Request"), name="dispatch")
 class DashboardHomeView(ProjectAwareDashboardMixin, TemplateView):
@@ -84,11 +164,23 @@ def get_template_names(self):
             return ["dashboard/partials/dashboard_content.html"]
         return [self.template_name]
 
-    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
-        """Handle GET requests with enhanced HTMX support."""
-        # Let the ProjectAwareDashboardMixin handle most of the logic
-        response = super().get(request, *args, **kwargs)
-        return response
+    async def dispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponse:
+        """Dispatch as a coroutine so the method decorators await the response."""
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def get(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponse:
+        """Count the KPIs concurrently, then build the rest of the page."""
+        # Sync code such as get_projects() reads request.user
+        request.user = await request.auser()
+        self.kpi_counts = await self.aget_kpi_counts(
+            await aget_selected_project_id(request)
+        )
+        context = await sync_to_async(self.get_context_data)(**kwargs)
+        return self.render_to_response(context)
 
     def get_context_data(self, **kwargs: dict[str, Any]) -> dict[str, Any]:
         """Get the context data for template rendering."""
@@ -118,12 +210,8 @@ def get_context_data(self, **kwargs: dict[str, Any]) -> dict[str, Any]:
                     "error": None,
                     "user_roles": user_roles,
                     "show_feedback_link": True,
-                    "overdue_obligations_count": self.get_overdue_obligations_count(),
-                    "active_obligations_count": self.get_active_obligations_count(),
-                    "active_obligations_trend": self.get_obligations_trend(),
-                    "upcoming_deadlines_count": self.get_upcoming_deadlines_count(),
-                    "active_projects_count": projects.count(),
                     "active_mechanisms_count": self.get_active_mechanisms_count(),
+                    **self.kpi_counts,
                     "selected_project_id": get_selected_project_id(self.request),
                 }
             )
@@ -185,51 +273,30 @@ def get_projects(self) -> QuerySet[Project]:
             logger.error("Error fetching projects for user %s: %s", user, e)
             return Project.objects.none()
 
-    def get_active_obligations_count(self) -> int:
-        """Get count of active obligations."""
-        project_id = self.selected_project_id
-        query_filter = {}
-        if project_id:
-            query_filter["project_id"] = project_id
+    async def aget_kpi_counts(self, project_id: str | None) -> dict[str, int]:
+        """
+        Count the dashboard KPIs, running the independent queries concurrently.
 
-        return Obligation.objects.filter(
-            status__in=["pending", "in_progress"], **query_filter
-        ).count()
+        The obligation counts are the same for every member of the project,
+        so concurrent requests share one computation per data version.
 
-    def get_overdue_obligations_count(self) -> int:
-        """Get count of overdue obligations for the selected project."""
-        project_id = self.selected_project_id
-        query_filter = {}
-        if project_id:
-            query_filter["project_id"] = project_id
-        today = timezone.now().date()
-        return Obligation.objects.filter(
-            action_due_date__lt=today,
-            status__in=["pending", "in_progress"],
-            **query_filter,
-        ).count()
-
-    def get_obligations_trend(self) -> int:
-        """Calculate the trend in obligations compared to last month."""
-        # This would typically involve more complex time-based calculations
-        # Simplified implementation for demonstration
-        return 5  # Example: 5% increase
-
-    def get_upcoming_deadlines_count(self) -> int:
-        """Get count of upcoming deadlines in the next 7 days."""
-        project_id = self.selected_project_id
-        query_filter = {}
-        if project_id:
-            query_filter["project_id"] = project_id
-
-        today = timezone.now()
-        seven_days_later = today + timedelta(days=7)
+        Args:
+            project_id: Selected project, or None to count every project
 
-        return Obligation.objects.filter(
-            action_due_date__range=(today, seven_days_later),
-            status__in=["pending", "in_progress"],
-            **query_filter,
-        ).count()
+        Returns:
+            dict: Context entries for the KPI cards
+        """
+        obligation_counts, projects = await asyncio.gather(
+            asingle_flight(
+                "dashboard.kpi_counts",
+                (str(project_id or ""), timezone.localdate()),
+                await aget_data_version(),
+                partial(acount_obligation_kpis, project_id),
+                fresh_for=KPI_FRESH_FOR,
+            ),
+            self.get_projects().acount(),
+        )
+        return {**obligation_counts, "active_projects_count": projects}
 
     def get_active_mechanisms_count(self) -> int:
         """Get count of active mechanisms."""
@@ -238,7 +305,9 @@ def get_active_mechanisms_count(self) -> int:
         return 10  # Example count
 
 
-class ChartView(ChartMixin, ProjectAwareDashboardMixin, TemplateView):
+class ChartView(
+    ChartMixin, ProjectAwareDashboardMixin, ConditionalResponseMixin, TemplateView
+):
     """View for rendering charts."""
 
     template_name = "dashboard/partials/charts.html"
@@ -248,6 +317,10 @@ def selected_project_id(self) -> str | None:
         """Return the selected project ID from the request/session."""
         return get_selected_project_id(self.request)
 
+    def get_validator_parts(self):
+        """Charts summarize every project's obligations."""
+        return [queryset_validator(Obligation.objects.all())]
+
     def get_queryset(self):
         """Return the queryset for projects at risk of missing deadlines."""
         now = timezone.now()
@@ -272,79 +345,235 @@ def get_context_data(self, **kwargs):
                 {
                     "project": project,
                     "overdue_count": overdue_count,
-                    "last_due_date": last_due_date.action_due_date
-                    if last_due_date
-                    else None,
+                    "last_due_date": (
+                        last_due_date.action_due_date if last_due_date else None
+                    ),
                 }
             )
         context["projects_with_stats"] = projects_with_stats
         return context
 
 
-class ProjectsAtRiskView(ProjectAwareDashboardMixin, ListView):
+class ProjectsAtRiskView(
+    AsyncLoginRequiredMixin,
+    ProjectAwareDashboardMixin,
+    ConditionalResponseMixin,
+    ListView,
+):
     """HTMX view for projects at risk of missing deadlines."""
 
     model = Project
     template_name = "dashboard/partials/projects_at_risk_table.html"
     context_object_name = "projects"
 
+    async def aget_validator_parts(self):
+        """Risk depends on the obligations and names of all projects."""
+        return await asyncio.gather(
+            aqueryset_validator(Obligation.objects.all()),
+            aqueryset_validator(Project.objects.all()),
+        )
+
     def get_queryset(self):
-        """Return projects with obligations at risk of missing deadlines."""
-        now = timezone.now()
-        queryset = Project.objects.filter(
-            obligations__action_due_date__lt=now,
-            obligations__status__in=["pending", "in_progress"],
-        ).distinct()
+        """Return projects with obligations at risk, with their overdue stats."""
+        at_risk = overdue_filter(prefix="obligations__")
+        # One grouped query instead of two per listed project
+        queryset = Project.objects.annotate(
+            overdue_count=Count("obligations", filter=at_risk),
+            last_due_date=Max("obligations__action_due_date", filter=at_risk),
+        ).filter(overdue_count__gt=0)
         return queryset[:10]
 
+    async def get(self, request, *args, **kwargs):
+        self.object_list = [
+            project async for project in self.get_queryset().aiterator()
+        ]
+        return self.render_to_response(self.get_context_data())
+
     def get_context_data(self, **kwargs):
         """Add projects_with_stats to the context."""
         context = super().get_context_data(**kwargs)
-        now = timezone.now()
-        projects_with_stats = []
-        for project in context["projects"]:
-            overdue_obligations = project.obligations.filter(
-                action_due_date__lt=now, status__in=["pending", "in_progress"]
-            )
-            overdue_count = overdue_obligations.count()
-            last_due_date = overdue_obligations.order_by("-action_due_date").first()
-            projects_with_stats.append(
-                {
-                    "project": project,
-                    "overdue_count": overdue_count,
-                    "last_due_date": last_due_date.action_due_date
-                    if last_due_date
-                    else None,
-                }
-            )
-        context["projects_with_stats"] = projects_with_stats
+        context["projects_with_stats"] = [
+            {
+                "project": project,
+                "overdue_count": project.overdue_count,
+                "last_due_date": project.last_due_date,
+            }
+            for project in context["projects"]
+        ]
         return context
 
 
-class UpcomingObligationsView(ProjectAwareDashboardMixin, ListView):
+class UpcomingObligationsView(
+    AsyncLoginRequiredMixin,
+    ProjectAwareDashboardMixin,
+    ConditionalResponseMixin,
+    ListView,
+):
     """View for upcoming obligations with due dates in the near future."""
 
     template_name = "dashboard/partials/upcoming_obligations_table.html"
-    context_object_name = "obligations"
+    context_object_name = "occurrences"
 
-    def get_queryset(self):
-        """Return obligations with due dates in the coming days."""
-        project_id = get_selected_project_id(self.request)
+    async def aget_validator_parts(self):
+        """Occurrences are refreshed whenever their obligations change."""
+        project_id = await aget_selected_project_id(self.request)
         if not project_id:
-            return Obligation.objects.none()
+            return [None]
+        return [
+            project_id,
+            await aqueryset_validator(Obligation.objects.filter(project_id=project_id)),
+        ]
+
+    def get_queryset(self):
+        """Return occurrences, including recurrences, due in the coming days."""
+        if not self.project_id:
+            return ObligationOccurrence.objects.none()
 
         today = timezone.now().date()
         future_date = today + timedelta(days=14)  # Next 14 days
 
-        return Obligation.objects.filter(
-            project_id=project_id,
-            action_due_date__gte=today,
-            action_due_date__lte=future_date,
-            status__in=["pending", "in_progress"],
-        ).order_by("action_due_date")[:10]
+        return (
+            ObligationOccurrence.objects.filter(
+                project_id=self.project_id,
+                due_date__gte=today,
+                due_date__lte=future_date,
+            )
+            .exclude(obligation__status=STATUS_COMPLETED)
+            .select_related("obligation")
+            .order_by("due_date")[:10]
+        )
+
+    async def get(self, request, *args, **kwargs):
+        self.project_id = await aget_selected_project_id(request)
+        self.object_list = [
+            occurrence async for occurrence in self.get_queryset().aiterator()
+        ]
+        return self.render_to_response(self.get_context_data())
 
     def get_context_data(self, **kwargs):
         """Add additional context for upcoming obligations."""
         context = super().get_context_data(**kwargs)
+        context["selected_project_id"] = self.project_id
+        return context
+
+
+class ObligationCalendarView(LoginRequiredMixin, ListView):
+    """HTMX view listing obligation due dates, grouped by day, over a window."""
+
+    template_name = "dashboard/partials/obligation_calendar.html"
+    context_object_name = "occurrences"
+    paginate_by = 50
+    default_days = 90
+    max_days = 366
+
+    def get_days(self) -> int:
+        """Return the requested window length in days, within bounds."""
+        try:
+            days = int(self.request.GET.get("days", self.default_days))
+        except (TypeError, ValueError):
+            days = self.default_days
+        return max(1, min(days, self.max_days))
+
+    def get_queryset(self):
+        """Range-scan occurrences for the selected or all member projects."""
+        today = timezone.now().date()
+        queryset = ObligationOccurrence.objects.filter(
+            due_date__gte=today,
+            due_date__lte=today + timedelta(days=self.get_days()),
+            project__members=self.request.user,
+        )
+        project_id = get_selected_project_id(self.request)
+        if project_id:
+            queryset = queryset.filter(project_id=project_id)
+        return (
+            queryset.exclude(obligation__status=STATUS_COMPLETED)
+            .select_related("obligation", "project")
+            .order_by("due_date", "obligation_id")
+        )
+
+    def get_context_data(self, **kwargs):
+        """Group the page's occurrences by due date for the calendar template."""
+        context = super().get_context_data(**kwargs)
+        days: dict[Any, list[ObligationOccurrence]] = {}
+        for occurrence in context["occurrences"]:
+            days.setdefault(occurrence.due_date, []).append(occurrence)
+        context["calendar_days"] = list(days.items())
+        context["days"] = self.get_days()
         context["selected_project_id"] = get_selected_project_id(self.request)
         return context
+
+
+class ComplianceTrendView(LoginRequiredMixin, View):
+    """JSON series of daily compliance snapshots for charts."""
+
+    default_days = 365
+    max_days = 5 * 366
+
+    def get_int(self, name: str, default: int, low: int, high: int) -> int:
+        """Read an integer query parameter, clamped to a range."""
+        try:
+            value = int(self.request.GET.get(name, default))
+        except (TypeError, ValueError):
+            value = default
+        return max(low, min(value, high))
+
+    def get(self, request, *args, **kwargs):
+        """Return the trend over ``?days=`` for the user's projects.
+
+        ``?project_id=`` and ``?mechanism_id=`` narrow the series, and
+        ``?max_points=`` bounds its length by downsampling to weeks, months or
+        groups of months.
+        """
+        snapshots = ComplianceSnapshot.objects.filter(project__members=request.user)
+        project_id = request.GET.get("project_id")
+        if project_id:
+            member = Project.objects.filter(pk=project_id, members=request.user)
+            if not project_id.isdigit() or not member.exists():
+                raise Http404("Project not found")
+            snapshots = snapshots.filter(project_id=project_id)
+        mechanism_id = request.GET.get("mechanism_id")
+        if mechanism_id:
+            if not mechanism_id.isdigit():
+                raise Http404("Mechanism not found")
+            snapshots = snapshots.filter(mechanism_id=mechanism_id)
+
+        end = timezone.localdate()
+        days = self.get_int("days", self.default_days, 1, self.max_days)
+        max_points = self.get_int("max_points", DEFAULT_MAX_POINTS, 2, self.max_days)
+        trend = compliance_trend(
+            snapshots, end - timedelta(days=days - 1), end, max_points
+        )
+        return JsonResponse(trend)
+
+
+@login_required
+@require_GET
+async def dashboard_events(request: HttpRequest) -> HttpResponse:
+    """
+    Stream obligation changes for the user's projects as server-sent events.
+
+    ``?project_id=`` narrows the stream to one project. Browsers reconnect
+    with a ``Last-Event-ID`` header and receive the events they missed.
+    """
+    user = await request.auser()
+    projects = Project.objects.filter(members=user)
+    project_id = request.GET.get("project_id")
+    if project_id:
+        if not project_id.isdigit():
+            raise Http404("Project not found")
+        projects = projects.filter(pk=project_id)
+    project_ids = [pk async for pk in projects.values_list("pk", flat=True)]
+    if project_id and not project_ids:
+        raise Http404("Project not found")
+
+    last_event_id = request.headers.get("Last-Event-ID", "")
+    response = StreamingHttpResponse(
+        stream_events(
+            project_ids, int(last_event_id) if last_event_id.isdigit() else None
+        ),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -10,16 +10,31 @@
 """
 import logging
 import sys
-from typing import Any, List, Optional
+from typing import IO, Any, Iterable, Iterator, List, Optional
 
+from core.proto_utils import encode_varint, read_varint
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.utils.timezone import datetime  # Import datetime explicitly
+from google.protobuf.message import DecodeError
 
 from .models import BugReport
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Key of each entry of BugReportCollection.reports: field 1, length-delimited
+REPORTS_FIELD_KEY = b'\x0a'
+
+# Encoded bytes collected before a streamed chunk is yielded
+FLUSH_SIZE = 64 * 1024
+
+# Larger reports are treated as corrupt rather than read into memory
+MAX_REPORT_SIZE = 4 * 1024 * 1024
+
+# Bug reports inserted per bulk_create when importing a collection
+IMPORT_BATCH_SIZE = 500
+
 # Import generated protobuf modules with improved error handling
 try:
     from .proto import feedback_pb2
@@ -305,3 +320,111 @@ def deserialize_bug_reports(data: bytes) -> List[BugReport]:
             str(e)
         )
         return []
+
+
+def stream_bug_report_collection(bug_reports: Iterable[BugReport]) -> Iterator[bytes]:
+    """
+    Serialize bug reports as a BugReportCollection, one report at a time.
+
+    A repeated field is encoded as one length-delimited entry per element, so
+    the concatenated entries form a valid BugReportCollection without the
+    whole collection being built in memory.
+
+    Args:
+        bug_reports: BugReport instances, typically a queryset iterator
+
+    Yields:
+        Chunks of the serialized collection
+    """
+    buffer = bytearray()
+    for bug_report in bug_reports:
+        report_data = serialize_bug_report(bug_report)
+        if report_data is None:
+            continue
+        buffer += REPORTS_FIELD_KEY + encode_varint(len(report_data)) + report_data
+        if len(buffer) >= FLUSH_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    yield bytes(buffer)
+
+
+def iter_bug_report_collection(stream: IO[bytes]) -> Iterator[BugReport]:
+    """
+    Deserialize a BugReportCollection incrementally from a binary stream.
+
+    Only one report is held in memory at a time.
+
+    Args:
+        stream: Binary file object containing a serialized collection
+
+    Yields:
+        Unsaved BugReport instances
+
+    Raises:
+        ValueError: If the stream is not a valid collection
+    """
+    while True:
+        key = stream.read(1)
+        if not key:
+            return
+        if key != REPORTS_FIELD_KEY:
+            raise ValueError('Not a bug report collection')
+        length = read_varint(stream)
+        if length is None or length > MAX_REPORT_SIZE:
+            raise ValueError('Invalid bug report length in collection')
+        report_data = stream.read(length)
+        if len(report_data) != length:
+            raise ValueError('Bug report collection is truncated')
+        try:
+            bug_report = deserialize_bug_report(report_data)
+        except DecodeError as e:
+            raise ValueError('Invalid bug report in collection') from e
+        if bug_report is None:
+            raise ValueError('Invalid bug report in collection')
+        yield bug_report
+
+
+def import_bug_report_collection(
+    stream: IO[bytes],
+    created_by: Optional[Any] = None,
+    batch_size: int = IMPORT_BATCH_SIZE
+) -> int:
+    """
+    Import a streamed BugReportCollection with batched bulk inserts.
+
+    The whole collection is parsed once before anything is written, so an
+    invalid collection imports nothing. Each batch is then committed on its
+    own, so the database write lock is only held while one batch is inserted
+    rather than for the whole upload.
+
+    Args:
+        stream: Seekable binary file object containing a serialized collection
+        created_by: User recorded as the creator of every imported report
+        batch_size: Bug reports inserted per query
+
+    Returns:
+        The number of bug reports imported
+
+    Raises:
+        ValueError: If the stream is not a valid collection
+    """
+    start = stream.tell()
+    for _ in iter_bug_report_collection(stream):
+        pass
+    stream.seek(start)
+
+    imported = 0
+    batch: List[BugReport] = []
+    for bug_report in iter_bug_report_collection(stream):
+        bug_report.created_by = created_by
+        batch.append(bug_report)
+        if len(batch) >= batch_size:
+            with transaction.atomic():
+                BugReport.objects.bulk_create(batch)
+            imported += len(batch)
+            batch = []
+    with transaction.atomic():
+        BugReport.objects.bulk_create(batch)
+    imported += len(batch)
+    logger.info("Imported %d bug reports", imported)
+    return imported
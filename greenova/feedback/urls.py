@@ -9,4 +9,6 @@
     path('submit/', views.submit_bug_report, name='submit_bug_report'),
     path('export/<int:report_id>/', views.export_report, name='export_report'),
     path('import/', views.import_report, name='import_report'),
+    path('export/', views.export_reports, name='export_reports'),
+    path('import/batch/', views.import_reports, name='import_reports'),
 ]
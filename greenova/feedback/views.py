@@ -1,20 +1,33 @@
 import logging
 
+from core.streaming import aiterate
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.mail import send_mail
-from django.http import HttpRequest, HttpResponse
+from django.db import DatabaseError
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.utils.translation import gettext_lazy as _
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import require_GET, require_http_methods
 
 from .forms import BugReportForm
 from .models import BugReport
-from .proto_utils import deserialize_bug_report, serialize_bug_report
+from .proto_utils import (
+    deserialize_bug_report,
+    import_bug_report_collection,
+    serialize_bug_report,
+    stream_bug_report_collection,
+)
 
 logger = logging.getLogger(__name__)
 
+# Bug reports fetched per database round trip during batch exports
+EXPORT_CHUNK_SIZE = 500
+
+# Query parameters that filter batch exports
+EXPORT_FILTERS = ('status', 'severity', 'impact_severity')
+
 
 def get_plaintext_template(template_path: str) -> str:
     """
@@ -238,3 +251,85 @@ def import_report(request: HttpRequest) -> HttpResponse:
     return render(request, 'feedback/import_report.html', {
         'page_title': _('Import Bug Report'),
     })
+
+
+@login_required
+@require_GET
+def export_reports(request: HttpRequest) -> StreamingHttpResponse:
+    """
+    Export bug reports as a streamed Protocol Buffer BugReportCollection.
+
+    Staff export every report and other users their own. The ``status``,
+    ``severity`` and ``impact_severity`` query parameters filter the reports.
+
+    Args:
+        request: The HTTP request
+
+    Returns:
+        Streaming HTTP response with the serialized collection
+    """
+    if request.user.is_staff:
+        bug_reports = BugReport.objects.all()
+    else:
+        bug_reports = BugReport.objects.filter(created_by=request.user)
+
+    filters = {
+        field: request.GET[field] for field in EXPORT_FILTERS if request.GET.get(field)
+    }
+    bug_reports = bug_reports.filter(**filters).order_by('pk')
+
+    # Under ASGI a blocking iterator would be read whole before sending
+    response = StreamingHttpResponse(
+        aiterate(
+            stream_bug_report_collection(
+                bug_reports.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+            )
+        ),
+        content_type='application/octet-stream'
+    )
+    response['Content-Disposition'] = 'attachment; filename="bug_reports.pb"'
+    return response
+
+
+@login_required
+@require_http_methods(["GET", "POST"])
+def import_reports(request: HttpRequest) -> HttpResponse:
+    """
+    Import bug reports from a Protocol Buffer BugReportCollection.
+
+    The upload is parsed one report at a time and inserted in batches, so
+    large collections are not read into memory and other writers only wait
+    for one batch at a time.
+
+    Args:
+        request: The HTTP request
+
+    Returns:
+        HTTP response with success/error message or form
+    """
+    if request.method == 'POST':
+        if 'file' not in request.FILES:
+            messages.error(request, _('No file was provided.'))
+            return redirect('feedback:import_reports')
+
+        try:
+            imported = import_bug_report_collection(
+                request.FILES['file'], created_by=request.user
+            )
+        except (ValueError, OSError, DatabaseError) as e:
+            logger.error("Error importing bug reports: %s", str(e))
+            messages.error(
+                request, _('Could not import the file. Invalid format.')
+            )
+            return redirect('feedback:import_reports')
+
+        messages.success(
+            request,
+            _('%(count)d bug reports imported successfully.') % {'count': imported}
+        )
+        return redirect('feedback:index')
+
+    # GET request - show import form
+    return render(request, 'feedback/import_reports.html', {
+        'page_title': _('Import Bug Reports'),
+    })
@@ -16,7 +16,7 @@
 import sys
 import warnings
 from pathlib import Path
-from typing import Any, TypedDict
+from typing import Any, NotRequired, TypedDict
 
 import sentry_sdk
 from dotenv import load_dotenv
@@ -39,6 +39,9 @@ class DatabaseConfig(TypedDict):
 
     ENGINE: str
     NAME: str | Path
+    CONN_MAX_AGE: NotRequired[int]
+    CONN_HEALTH_CHECKS: NotRequired[bool]
+    OPTIONS: NotRequired[dict[str, Any]]
 
 
 class TemplateOptions(TypedDict, total=False):
@@ -53,11 +56,17 @@ class TemplateOptions(TypedDict, total=False):
         Indicates whether template debugging is enabled.
     environment : str, optional
         The environment for Jinja2 templates, if applicable.
+    loaders : list, optional
+        The template loaders of the Django engine.
+    auto_reload : bool, optional
+        Whether Jinja2 checks template sources for changes on every render.
     """
 
     context_processors: list[str]
     debug: bool  # This was the missing required field
     environment: str  # Add environment as an optional field with total=False
+    loaders: list[Any]
+    auto_reload: bool
 
 
 class TemplateConfig(TypedDict):
@@ -285,6 +294,7 @@ def validate_settings() -> None:
     # Your local apps (ordered by dependency)
     "authentication.apps.AuthenticationConfig",
     "core.apps.CoreConfig",  # Core logic, should be initialized early
+    "jobs.apps.JobsConfig",  # Database-backed background job queue
     "company.apps.CompanyConfig",  # Updated to use the full AppConfig path
     "projects.apps.ProjectsConfig",  # Likely depends on `company`
     "users.apps.UsersConfig",  # User management, might depend on `company`
@@ -329,6 +339,7 @@ def validate_settings() -> None:
     "authentication.middleware.LogoutStateMiddleware",  # Add our new middleware here
     "company.middleware.ActiveCompanyMiddleware",  # Add ActiveCompanyMiddleware here
     "core.middleware.ProjectSelectionMiddleware",
+    "core.middleware.RequestLoaderMiddleware",  # Per-request template tag loaders
     "dashboard.middleware.DashboardPersistenceMiddleware",  # Add our new middleware
     "django.contrib.messages.middleware.MessageMiddleware",
     "django_htmx.middleware.HtmxMiddleware",
@@ -369,6 +380,29 @@ def validate_settings() -> None:
 
 ROOT_URLCONF = "greenova.urls"
 
+# Compiled templates are kept in memory by the cached loader. In development
+# the autoreloader clears it whenever a template changes. The partials loader
+# must be outermost, or template_partials replaces this list on startup.
+TEMPLATE_LOADERS = [
+    (
+        "template_partials.loader.Loader",
+        [
+            (
+                "django.template.loaders.cached.Loader",
+                [
+                    "django.template.loaders.filesystem.Loader",
+                    "django.template.loaders.app_directories.Loader",
+                ],
+            ),
+        ],
+    ),
+]
+
+# Compiled Jinja2 templates are shared on disk by all workers on the host. When
+# unset, Jinja2 uses its own per-user directory in the temp dir, which it
+# creates with mode 0700 and checks is owned by the current user.
+JINJA2_BYTECODE_CACHE_DIR = os.environ.get("JINJA2_BYTECODE_CACHE_DIR")
+
 # Update TEMPLATES configuration to remove the conflict
 TEMPLATES: list[TemplateConfig] = [
     {
@@ -377,7 +411,7 @@ def validate_settings() -> None:
             BASE_DIR / "authentication",  # route to custom django-allauth template!
             BASE_DIR / "templates",
         ],
-        "APP_DIRS": True,  # Keep this for app template discovery
+        "APP_DIRS": False,  # App templates are found by TEMPLATE_LOADERS
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.debug",
@@ -386,6 +420,7 @@ def validate_settings() -> None:
                 "django.contrib.messages.context_processors.messages",
             ],
             "debug": DEBUG,
+            "loaders": TEMPLATE_LOADERS,
         },
     },
     # Add Jinja2 template engine
@@ -404,6 +439,8 @@ def validate_settings() -> None:
                 "django.contrib.messages.context_processors.messages",
             ],
             "debug": DEBUG,  # Added the required 'debug' key
+            # Only check template sources for changes in development
+            "auto_reload": DEBUG,
         },
     },
 ]
@@ -415,9 +452,32 @@ def validate_settings() -> None:
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Persistent connections must stay off under ASGI, where each request
+        # runs in its own thread and would leak its connection. WSGI processes
+        # and job workers can opt in with DJANGO_CONN_MAX_AGE.
+        "CONN_MAX_AGE": int(os.environ.get("DJANGO_CONN_MAX_AGE", "0")),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            # Seconds a writer waits for the lock before "database is locked"
+            "timeout": 20,
+            # Take the write lock when a transaction starts, so a transaction
+            # that reads and then writes waits for the lock instead of failing
+            # when another writer got there first
+            "transaction_mode": "IMMEDIATE",
+        },
     }
 }
 
+# Pragmas applied to every SQLite connection by core.sqlite
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "busy_timeout": 20000,
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 AUTH_PASSWORD_VALIDATORS = [
@@ -510,6 +570,19 @@ def validate_settings() -> None:
             "MAX_ENTRIES": 1000,  # Maximum number of entries before garbage collection
         },
     },
+    # Seen by every worker process on the host, for invalidation versions and
+    # other values that must agree across workers. The directory is created
+    # with mode 0700. Entries never expire unless a timeout is given.
+    "shared": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get(
+            "DJANGO_SHARED_CACHE_DIR", os.path.join(BASE_DIR, "cache")
+        ),
+        "TIMEOUT": None,
+        "OPTIONS": {
+            "MAX_ENTRIES": 10000,
+        },
+    },
 }
 
 # Add browser cache settings (these work with runserver)
@@ -612,9 +685,25 @@ def filter(self, record: logging.LogRecord) -> bool:
 # Media settings
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "greenova", "media")
+# Media directories anyone may fetch directly; everything else under
+# MEDIA_ROOT is served only through the permission-checked download views
+PUBLIC_MEDIA_DIRS = ["profile_images/", "company_logos/"]
 
 # File upload settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 26214400  # 25MB in bytes
+# Uploads above 2.5MB stream to a temporary file, hashed as they arrive for
+# the content-addressed evidence store; evidence itself is capped at 25MB.
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2621440  # 2.5MB in bytes
+FILE_UPLOAD_HANDLERS = [
+    "django.core.files.uploadhandler.MemoryFileUploadHandler",
+    "obligations.evidence_store.HashingFileUploadHandler",
+]
+
+# Downloads: "django" streams files with range support and suits development.
+# In production use "x-accel-redirect" behind nginx, with an internal location
+# at DOWNLOAD_ACCEL_PREFIX aliased to MEDIA_ROOT, or "x-sendfile" for Apache
+# mod_xsendfile, so large downloads do not occupy the application workers
+DOWNLOAD_BACKEND = os.environ.get("DJANGO_DOWNLOAD_BACKEND", "django")
+DOWNLOAD_ACCEL_PREFIX = "/protected-media/"
 
 # Modify runserver command to force HTTP
 
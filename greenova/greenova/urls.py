@@ -1,4 +1,5 @@
 import logging
+import os
 
 from django.conf import settings
 from django.conf.urls.static import static
@@ -66,6 +67,8 @@ def trigger_error(request: HttpRequest) -> None:
     path("feedback/", include("feedback.urls", namespace="feedback")),
     # Include reports URLs
     path("reports/", include("reports.urls", namespace="reports")),
+    # Background job status polling
+    path("jobs/", include("jobs.urls", namespace="jobs")),
     # Include settings URLs
     path("settings/", include("settings.urls", namespace="settings")),
     # Sentry error page to verify Sentry is working
@@ -75,5 +78,10 @@ def trigger_error(request: HttpRequest) -> None:
 
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    # Protected media (evidence, documents) is only served by download views
+    for public_dir in settings.PUBLIC_MEDIA_DIRS:
+        urlpatterns += static(
+            settings.MEDIA_URL + public_dir,
+            document_root=os.path.join(settings.MEDIA_ROOT, public_dir),
+        )
 #    urlpatterns += [path("silk/", include("silk.urls", namespace="silk"))]
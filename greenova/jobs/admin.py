@@ -0,0 +1,23 @@
+"""admin.py for the jobs app in Greenova."""
+
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Admin configuration for background jobs."""
+
+    list_display = ["id", "task", "status", "attempts", "progress", "created_at"]
+    list_filter = ["status", "task"]
+    search_fields = ["task"]
+    readonly_fields = ["locked_by", "locked_at", "started_at", "finished_at"]
+    actions = ["retry_jobs"]
+
+    @admin.action(description="Retry selected jobs")
+    def retry_jobs(self, request, queryset):
+        count = queryset.exclude(status=Job.STATUS_RUNNING).update(
+            status=Job.STATUS_QUEUED, attempts=0, error=""
+        )
+        self.message_user(request, f"Queued {count} jobs to run again")
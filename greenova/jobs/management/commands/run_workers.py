@@ -0,0 +1,88 @@
+import logging
+import multiprocessing
+import signal
+import time
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+from jobs.queue import claim_next, requeue_stale_jobs, run_job, worker_name
+
+logger = logging.getLogger(__name__)
+
+
+def work(poll_interval, burst):
+    """Claim and run jobs until stopped, or until the queue is empty in burst mode."""
+    # Child processes must not share the parent's database connections
+    django.setup()
+    connections.close_all()
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    worker = worker_name()
+    while not stopping:
+        job = claim_next(worker)
+        if job is None:
+            if burst:
+                break
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Run background job workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Number of worker processes (default: 2)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait when no job is ready (default: 2)'
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit once no job is ready instead of waiting for more'
+        )
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale jobs")
+
+        worker_count = max(1, options['workers'])
+        work_args = (options['poll_interval'], options['burst'])
+        self.stdout.write(f"Starting {worker_count} job workers...")
+
+        if worker_count == 1:
+            work(*work_args)
+        else:
+            connections.close_all()
+            processes = [
+                multiprocessing.Process(target=work, args=work_args, daemon=True)
+                for _ in range(worker_count)
+            ]
+            for process in processes:
+                process.start()
+            try:
+                for process in processes:
+                    process.join()
+            except KeyboardInterrupt:
+                for process in processes:
+                    process.terminate()
+                for process in processes:
+                    process.join()
+
+        self.stdout.write(self.style.SUCCESS("Job workers stopped"))
@@ -0,0 +1,97 @@
+"""
+models.py for the jobs app in Greenova.
+
+A ``Job`` row is one queued call of a registered task. Workers started by the
+``run_workers`` command claim queued jobs, run them and record the outcome.
+"""
+
+from typing import Any
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """A unit of background work stored in the database."""
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    FINISHED_STATUSES = (STATUS_SUCCEEDED, STATUS_FAILED)
+
+    task: Any = models.CharField(max_length=100)
+    kwargs: Any = models.JSONField(default=dict, blank=True)
+    status: Any = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED
+    )
+    priority: Any = models.SmallIntegerField(default=0)
+    run_at: Any = models.DateTimeField(default=timezone.now)
+    attempts: Any = models.PositiveSmallIntegerField(default=0)
+    max_attempts: Any = models.PositiveSmallIntegerField(default=3)
+
+    locked_by: Any = models.CharField(max_length=100, blank=True)
+    locked_at: Any = models.DateTimeField(null=True, blank=True)
+
+    progress: Any = models.PositiveSmallIntegerField(default=0)
+    progress_message: Any = models.CharField(max_length=255, blank=True)
+    result: Any = models.JSONField(null=True, blank=True)
+    error: Any = models.TextField(blank=True)
+
+    created_by: Any = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+    created_at: Any = models.DateTimeField(auto_now_add=True)
+    started_at: Any = models.DateTimeField(null=True, blank=True)
+    finished_at: Any = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        indexes = [
+            # Serves the worker's "next ready job" query
+            models.Index(
+                fields=["status", "-priority", "run_at"], name="job_ready_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.task} #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in self.FINISHED_STATUSES
+
+    def report_progress(self, done: int, total: int, message: str = "") -> None:
+        """
+        Record how far a running job has got, for status polling.
+
+        Also refreshes the job's lock, so it is not requeued as stale.
+
+        Args:
+            done: Units of work completed
+            total: Total units of work
+            message: Optional short description of the current step
+        """
+        self.progress = min(100, int(done * 100 / total)) if total else 100
+        self.progress_message = message[:255]
+        self.locked_at = timezone.now()
+        Job.objects.filter(pk=self.pk).update(
+            progress=self.progress,
+            progress_message=self.progress_message,
+            locked_at=self.locked_at,
+        )
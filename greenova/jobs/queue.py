@@ -0,0 +1,281 @@
+"""
+Database-backed job queue.
+
+Tasks are plain functions registered with ``@task``; they receive the running
+``Job`` as their first argument, followed by the keyword arguments given to
+``enqueue``, and return a JSON-serializable result::
+
+    @task("mechanisms.recount")
+    def recount(job, mechanism_ids):
+        ...
+
+    enqueue("mechanisms.recount", mechanism_ids=[1, 2], user=request.user)
+
+Workers claim jobs with ``SELECT ... FOR UPDATE SKIP LOCKED`` where the
+database supports it. On SQLite, which serializes writers, a job is claimed
+with a conditional ``UPDATE`` that only succeeds while the row is still
+queued, so two workers can never run the same job.
+
+While a job runs, its worker refreshes ``Job.locked_at`` every
+``HEARTBEAT_INTERVAL``. A running job whose lock is older than
+``STALE_AFTER`` belonged to a worker that died and is requeued.
+"""
+
+import logging
+import os
+import socket
+import threading
+import traceback
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Seconds before the first retry; doubled for each further attempt
+RETRY_BASE_DELAY = 30
+
+# Seconds between lock refreshes of a running job
+HEARTBEAT_INTERVAL = 60
+
+# A running job whose worker has been silent this long is requeued
+STALE_AFTER = timedelta(minutes=10)
+
+
+@dataclass(frozen=True)
+class Task:
+    """A function that can be run by the job queue."""
+
+    name: str
+    func: Callable[..., Any]
+    max_attempts: int
+
+
+_TASKS: dict[str, Task] = {}
+
+
+def task(name: str, max_attempts: int = 3) -> Callable:
+    """
+    Register a function as a queue task.
+
+    Args:
+        name: Unique task name used when enqueuing
+        max_attempts: Attempts before the job is marked failed
+    """
+
+    def register(func: Callable[..., Any]) -> Callable[..., Any]:
+        _TASKS[name] = Task(name, func, max_attempts)
+        return func
+
+    return register
+
+
+def get_task(name: str) -> Task:
+    """Return a registered task, raising KeyError for unknown names."""
+    return _TASKS[name]
+
+
+def enqueue(
+    name: str,
+    user: Any = None,
+    priority: int = 0,
+    run_at: datetime | None = None,
+    **kwargs: Any,
+) -> Job:
+    """
+    Queue a task to run in a worker.
+
+    Args:
+        name: Registered task name
+        user: User who requested the work, allowed to poll its status
+        priority: Higher priorities are claimed first
+        run_at: Earliest time the job may start (defaults to now)
+        kwargs: JSON-serializable keyword arguments for the task
+
+    Returns:
+        Job: The queued job
+    """
+    registered = get_task(name)
+    job = Job.objects.create(
+        task=name,
+        kwargs=kwargs,
+        priority=priority,
+        run_at=run_at or timezone.now(),
+        max_attempts=registered.max_attempts,
+        created_by=user if getattr(user, "is_authenticated", False) else None,
+    )
+    logger.info("Queued job %s", job)
+    return job
+
+
+def worker_name() -> str:
+    """Identify the current worker process in ``Job.locked_by``."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _ready_jobs():
+    return Job.objects.filter(
+        status=Job.STATUS_QUEUED, run_at__lte=timezone.now()
+    ).order_by("-priority", "run_at", "pk")
+
+
+def claim_next(worker: str | None = None) -> Job | None:
+    """
+    Claim the next ready job for a worker.
+
+    Args:
+        worker: Worker identifier (defaults to host and process id)
+
+    Returns:
+        Job | None: The claimed job, now running, or None if none are ready
+    """
+    worker = worker or worker_name()
+    now = timezone.now()
+    claim = {
+        "status": Job.STATUS_RUNNING,
+        "locked_by": worker,
+        "locked_at": now,
+        "started_at": now,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = _ready_jobs().select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            Job.objects.filter(pk=job.pk).update(**claim)
+    else:
+        # Try the first few candidates; another worker may take any of them
+        for pk in _ready_jobs().values_list("pk", flat=True)[:5]:
+            if Job.objects.filter(pk=pk, status=Job.STATUS_QUEUED).update(**claim):
+                break
+        else:
+            return None
+        job = Job(pk=pk)
+
+    job.refresh_from_db()
+    return job
+
+
+@contextmanager
+def heartbeat(job: Job, interval: float = HEARTBEAT_INTERVAL) -> Iterator[None]:
+    """
+    Refresh a running job's lock in the background while the block runs.
+
+    Args:
+        job: Job claimed by this worker
+        interval: Seconds between refreshes
+    """
+    stopped = threading.Event()
+
+    def beat() -> None:
+        try:
+            while not stopped.wait(interval):
+                try:
+                    Job.objects.filter(
+                        pk=job.pk, status=Job.STATUS_RUNNING, locked_by=job.locked_by
+                    ).update(locked_at=timezone.now())
+                except DatabaseError:
+                    logger.warning("Could not refresh the lock of job %s", job)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f"job-{job.pk}-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def run_job(job: Job) -> Job:
+    """
+    Run a claimed job and record its result, retrying failures with backoff.
+
+    Args:
+        job: Job returned by ``claim_next``
+
+    Returns:
+        Job: The job with its final or rescheduled state
+    """
+    job.attempts += 1
+    try:
+        registered = get_task(job.task)
+        with heartbeat(job):
+            result = registered.func(job, **job.kwargs)
+    except Exception:
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            delay = RETRY_BASE_DELAY * 2 ** (job.attempts - 1)
+            job.status = Job.STATUS_QUEUED
+            job.run_at = timezone.now() + timedelta(seconds=delay)
+            logger.warning("Job %s failed, retrying in %ss", job, delay)
+        else:
+            job.status = Job.STATUS_FAILED
+            job.finished_at = timezone.now()
+            logger.error("Job %s failed after %s attempts", job, job.attempts)
+    else:
+        job.status = Job.STATUS_SUCCEEDED
+        job.result = result
+        job.error = ""
+        job.progress = 100
+        job.finished_at = timezone.now()
+        logger.info("Job %s succeeded", job)
+
+    job.locked_by = ""
+    job.locked_at = None
+    job.save(
+        update_fields=[
+            "attempts",
+            "status",
+            "run_at",
+            "result",
+            "error",
+            "progress",
+            "finished_at",
+            "locked_by",
+            "locked_at",
+        ]
+    )
+    return job
+
+
+def requeue_stale_jobs(stale_after: timedelta = STALE_AFTER) -> int:
+    """
+    Return jobs left running by a worker that died to the queue.
+
+    Returns:
+        int: Number of jobs requeued
+    """
+    return Job.objects.filter(
+        status=Job.STATUS_RUNNING, locked_at__lt=timezone.now() - stale_after
+    ).update(status=Job.STATUS_QUEUED, locked_by="", locked_at=None)
+
+
+def run_pending(limit: int | None = None, worker: str | None = None) -> int:
+    """
+    Run ready jobs in the current process until none are left.
+
+    Args:
+        limit: Maximum number of jobs to run
+        worker: Worker identifier
+
+    Returns:
+        int: Number of jobs run
+    """
+    count = 0
+    while limit is None or count < limit:
+        job = claim_next(worker)
+        if job is None:
+            break
+        run_job(job)
+        count += 1
+    return count
@@ -0,0 +1,11 @@
+"""urls.py for the jobs app in Greenova."""
+
+from django.urls import path
+
+from .views import JobStatusView
+
+app_name = "jobs"
+
+urlpatterns = [
+    path("<int:pk>/", JobStatusView.as_view(), name="status"),
+]
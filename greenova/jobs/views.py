@@ -0,0 +1,36 @@
+"""views.py for the jobs app in Greenova."""
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.views import View
+
+from .models import Job
+
+
+class JobStatusView(LoginRequiredMixin, View):
+    """Report the progress of a job to the user who queued it."""
+
+    def get(self, request, *args, **kwargs):
+        """Handle GET request for a job's status.
+
+        HTMX requests get a partial that keeps polling until the job finishes;
+        other requests get JSON.
+        """
+        jobs = Job.objects.all()
+        if not request.user.is_superuser:
+            jobs = jobs.filter(created_by=request.user)
+        job = get_object_or_404(jobs, pk=kwargs["pk"])
+
+        if request.htmx:
+            return render(request, "jobs/partials/job_status.html", {"job": job})
+        return JsonResponse(
+            {
+                "id": job.pk,
+                "task": job.task,
+                "status": job.status,
+                "progress": job.progress,
+                "message": job.progress_message,
+                "result": job.result if job.is_finished else None,
+            }
+        )
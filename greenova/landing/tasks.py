@@ -0,0 +1,19 @@
+"""Background tasks for the landing app, run by the ``jobs`` queue."""
+
+import logging
+import smtplib
+
+from jobs.queue import task
+
+logger = logging.getLogger(__name__)
+
+
+@task("landing.send_welcome_email", max_attempts=5)
+def send_welcome_email(job, email):
+    """Send the newsletter welcome email; SMTP errors are retried by the queue."""
+    smtp = smtplib.SMTP("localhost")
+    try:
+        smtp.sendmail("no-reply@greenova.com", email, "Welcome to Greenova!")
+    finally:
+        smtp.quit()
+    logger.info("Sent newsletter welcome email")
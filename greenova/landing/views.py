@@ -5,11 +5,10 @@
 """
 
 import logging
-import smtplib
-from smtplib import SMTPException
 from typing import Any, TypedDict
 
 from django.conf import settings
+from django.db import DatabaseError
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import render
 from django.utils.decorators import method_decorator
@@ -19,6 +18,7 @@
 from django.views.decorators.vary import vary_on_headers
 from django.views.generic import TemplateView
 from django_htmx.http import HttpResponseClientRefresh, push_url
+from jobs.queue import enqueue
 
 logger = logging.getLogger(__name__)
 
@@ -112,10 +112,8 @@ def newsletter_signup(request: HttpRequest) -> HttpResponse:
         return JsonResponse({"success": False, "message": "Email address is required."})
 
     try:
-        # Simulate sending an email as a placeholder for newsletter integration
-        smtp = smtplib.SMTP("localhost")
-        smtp.sendmail("no-reply@greenova.com", email, "Welcome to Greenova!")
-        smtp.quit()
+        # Send the welcome email from a background worker, not this request
+        enqueue("landing.send_welcome_email", email=email)
 
         # Return success response for HTMX to update the DOM
         return render(
@@ -125,6 +123,6 @@ def newsletter_signup(request: HttpRequest) -> HttpResponse:
                 "email": email,
             },
         )
-    except SMTPException as e:
-        logger.error("SMTP error during newsletter signup: %s", str(e))
+    except DatabaseError as e:
+        logger.error("Could not queue newsletter welcome email: %s", str(e))
         return render(request, "landing/partials/newsletter_error.html")
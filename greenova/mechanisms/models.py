@@ -5,6 +5,7 @@
 from core.types import StatusData
 from django.core.exceptions import FieldError, ObjectDoesNotExist
 from django.db import models
+from django.db.models import Count, Q
 from django.db.models.query import QuerySet
 from django_matplotlib.fields import MatplotlibFigureField  # type: ignore
 from obligations.constants import (
@@ -13,7 +14,7 @@
     STATUS_IN_PROGRESS,
     STATUS_NOT_STARTED,
 )
-from obligations.utils import is_obligation_overdue
+from obligations.utils import overdue_filter
 
 logger = logging.getLogger(__name__)
 
@@ -90,32 +91,20 @@ def update_obligation_counts(self) -> None:
         """Update obligation counts based on related obligations."""
         from obligations.models import Obligation
 
-        # Get all related obligations
-        obligations: QuerySet = Obligation.objects.filter(
+        # Count every status and overdue obligations in a single aggregate query
+        counts = Obligation.objects.filter(
             primary_environmental_mechanism=self
+        ).aggregate(
+            not_started=Count('pk', filter=Q(status=STATUS_NOT_STARTED)),
+            in_progress=Count('pk', filter=Q(status=STATUS_IN_PROGRESS)),
+            completed=Count('pk', filter=Q(status=STATUS_COMPLETED)),
+            overdue=Count('pk', filter=overdue_filter()),
         )
 
-        # Reset counts
-        self.not_started_count = 0
-        self.in_progress_count = 0
-        self.completed_count = 0
-        self.overdue_count = 0
-
-        # Count obligations by status
-        for obligation in obligations:
-            status = obligation.status
-
-            # Check if overdue using the utility function
-            if is_obligation_overdue(obligation):
-                self.overdue_count += 1
-
-            # Also count by regular status
-            if status == STATUS_NOT_STARTED:
-                self.not_started_count += 1
-            elif status == STATUS_IN_PROGRESS:
-                self.in_progress_count += 1
-            elif status == STATUS_COMPLETED:
-                self.completed_count += 1
+        self.not_started_count = counts['not_started']
+        self.in_progress_count = counts['in_progress']
+        self.completed_count = counts['completed']
+        self.overdue_count = counts['overdue']
 
         self.save()
 
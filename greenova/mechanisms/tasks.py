@@ -0,0 +1,19 @@
+"""Background tasks for mechanisms, run by the ``jobs`` queue."""
+
+from jobs.queue import task
+
+from .models import EnvironmentalMechanism
+
+
+@task("mechanisms.recount_obligations")
+def recount_obligations(job, mechanism_ids=None):
+    """Refresh the obligation counters of the given mechanisms, or all of them."""
+    mechanisms = EnvironmentalMechanism.objects.order_by("pk")
+    if mechanism_ids is not None:
+        mechanisms = mechanisms.filter(pk__in=mechanism_ids)
+    total = mechanisms.count()
+    for done, mechanism in enumerate(mechanisms.iterator(), start=1):
+        mechanism.update_obligation_counts()
+        if done % 25 == 0 or done == total:
+            job.report_progress(done, total, f"Recounted {done} of {total}")
+    return {"recounted": total}
@@ -1,5 +1,6 @@
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
 
+from core.loaders import get_loader, register_loader
 from django import template
 from django.db.models import QuerySet
 
@@ -7,6 +8,20 @@
 
 register = template.Library()
 
+MECHANISM_NAMES_LOADER = 'mechanism_names'
+
+
+def _load_mechanism_names(mechanism_ids: Iterable[int]) -> Dict[int, str]:
+    """Fetch the names of many mechanisms with one query."""
+    return dict(
+        EnvironmentalMechanism.objects.filter(id__in=mechanism_ids).values_list(
+            'id', 'name'
+        )
+    )
+
+
+register_loader(MECHANISM_NAMES_LOADER, _load_mechanism_names)
+
 
 @register.filter
 def get_item(dictionary: Dict[str, Any], key: Any) -> Any:
@@ -17,13 +32,14 @@ def get_item(dictionary: Dict[str, Any], key: Any) -> Any:
 @register.filter
 def mechanism_name(mechanism_id: int) -> str:
     """Get mechanism name by ID."""
-    try:
-        mechanism = EnvironmentalMechanism.objects.get(id=mechanism_id)
-        return mechanism.name
-    except EnvironmentalMechanism.DoesNotExist:
+    if mechanism_id is None:
         return 'Unknown Mechanism'
-    except ValueError:
+    try:
+        mechanism_id = int(mechanism_id)
+    except (TypeError, ValueError):
         return 'Error retrieving mechanism'
+    name = get_loader(MECHANISM_NAMES_LOADER).load(mechanism_id)
+    return name if name is not None else 'Unknown Mechanism'
 
 
 @register.filter
@@ -1,11 +1,24 @@
+import asyncio
 import logging
+from functools import partial
 
 import matplotlib
+from asgiref.sync import sync_to_async
+from core.commons import alist
+from core.mixins import (
+    AsyncLoginRequiredMixin,
+    ConditionalResponseMixin,
+    aqueryset_validator,
+)
+from core.singleflight import single_flight
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_control
 from django.views.decorators.vary import vary_on_headers
 from django.views.generic import ListView, TemplateView
+from obligations.models import Obligation
+from obligations.utils import aget_data_version
 from projects.models import Project
 
 from .figures import get_mechanism_chart, get_overall_chart
@@ -18,11 +31,50 @@
 
 @method_decorator(cache_control(max_age=300), name="dispatch")
 @method_decorator(vary_on_headers("HX-Request"), name="dispatch")
-class MechanismChartView(LoginRequiredMixin, TemplateView):
+class MechanismChartView(
+    AsyncLoginRequiredMixin, ConditionalResponseMixin, TemplateView
+):
     template_name = "mechanisms/mechanism_charts.html"
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
+    async def aget_validator_parts(self):
+        """Charts change with the project's obligations and mechanisms."""
+        project_id = self.request.GET.get("project_id", "")
+        if not project_id.isdigit():
+            return [None]
+        return await asyncio.gather(
+            aqueryset_validator(Obligation.objects.filter(project_id=project_id)),
+            aqueryset_validator(
+                EnvironmentalMechanism.objects.filter(project_id=project_id)
+            ),
+        )
+
+    async def get(self, request, *args, **kwargs):
+        context = await self.aget_context_data(**kwargs)
+        return self.render_to_response(context)
+
+    def get_charts(self, project_id, mechanisms):
+        """Render the overall chart and one chart per mechanism."""
+        # Add overall chart first
+        _, overall_chart_data = get_overall_chart(project_id)
+        mechanism_charts = [
+            {"name": "Overall Status", "image_data": overall_chart_data}
+        ]
+
+        # Generate charts for individual mechanisms
+        for mechanism in mechanisms:
+            _, chart_data = get_mechanism_chart(mechanism.id)
+
+            mechanism_charts.append(
+                {
+                    "id": mechanism.id,
+                    "name": mechanism.name,
+                    "image_data": chart_data,
+                }
+            )
+        return mechanism_charts
+
+    async def aget_context_data(self, **kwargs):
+        context = self.get_context_data(**kwargs)
         project_id = self.request.GET.get("project_id")
 
         if not project_id:
@@ -39,35 +91,23 @@ def get_context_data(self, **kwargs):
             return context
 
         try:
-            # Check if project exists
-            project = Project.objects.get(id=project_id)
-
-            # Get mechanisms for this project
-            mechanisms = EnvironmentalMechanism.objects.filter(project_id=project_id)
-
-            # Generate charts for each mechanism
-            mechanism_charts = []
-
-            # Add overall chart first
-            _, overall_chart_data = get_overall_chart(project_id)
-
-            mechanism_charts.append(
-                {"name": "Overall Status", "image_data": overall_chart_data}
+            # Check if project exists while loading its mechanisms
+            project, mechanisms, version = await asyncio.gather(
+                Project.objects.aget(id=project_id),
+                alist(EnvironmentalMechanism.objects.filter(project_id=project_id)),
+                aget_data_version(),
             )
 
-            # Generate charts for individual mechanisms
-            for mechanism in mechanisms:
-                _, chart_data = get_mechanism_chart(mechanism.id)
-
-                mechanism_charts.append(
-                    {
-                        "id": mechanism.id,
-                        "name": mechanism.name,
-                        "image_data": chart_data,
-                    }
-                )
-
-            context["mechanism_charts"] = mechanism_charts
+            # Charts are drawn by matplotlib, which is sync only. Concurrent
+            # requests for the project share one drawing, and a slightly
+            # stale one is served while it is redrawn.
+            context["mechanism_charts"] = await sync_to_async(single_flight)(
+                "mechanisms.charts",
+                (project_id, timezone.localdate()),
+                version,
+                partial(self.get_charts, project_id, mechanisms),
+                stale_ok=True,
+            )
             context["project"] = project
 
             # Add table data with mechanism ID
@@ -1,15 +1,23 @@
 import logging
+import os
+from datetime import date
 
 from core.utils.roles import get_responsibility_choices
 from django import forms
 from django.contrib import admin
-from django.db.models import QuerySet
+from django.db.models import Max, Min, QuerySet
 from django.forms import ModelForm
 from django.http import HttpRequest
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.html import format_html
+from jobs.queue import enqueue
 
+from .constants import STATUS_COMPLETED
+from .forms import EvidenceUploadForm
 from .models import Obligation, ObligationEvidence
-from .utils import is_obligation_overdue
+from .pagination import EstimatedCountPaginator
+from .utils import overdue_expression, overdue_filter
 
 logger = logging.getLogger(__name__)
 
@@ -27,18 +35,48 @@ def lookups(self, request, model_admin):
         )
 
     def queryset(self, request, queryset):
-        today = timezone.now().date()
         if self.value() == 'overdue':
-            return queryset.filter(action_due_date__lt=today).exclude(
-                status='completed'
-            )
+            return queryset.filter(overdue_filter())
         if self.value() == 'not_overdue':
-            return queryset.exclude(action_due_date__lt=today).exclude(
-                status='completed'
+            return queryset.exclude(overdue_filter()).exclude(
+                status=STATUS_COMPLETED
             )
         return queryset
 
 
+# Widest span of years listed by probing each year separately
+MAX_HIERARCHY_YEARS = 50
+
+
+class ObligationAdminQuerySet(QuerySet):
+    """Changelist queryset whose date hierarchy years come from index seeks."""
+
+    def dates(self, field_name, kind, order='ASC'):
+        """
+        List years with ``MIN``/``MAX`` plus one existence probe per year.
+
+        ``QuerySet.dates`` truncates every row and takes the distinct values,
+        which reads the whole table. With an index on the field, the bounds
+        and each ``__year`` range probe only touch the index.
+        """
+        if kind != 'year':
+            return super().dates(field_name, kind, order)
+        bounds = self.order_by().aggregate(
+            first=Min(field_name), last=Max(field_name)
+        )
+        if bounds['first'] is None:
+            return []
+        span = range(bounds['first'].year, bounds['last'].year + 1)
+        if len(span) > MAX_HIERARCHY_YEARS:
+            return super().dates(field_name, kind, order)
+        years = [
+            date(year, 1, 1)
+            for year in span
+            if self.order_by().filter(**{f'{field_name}__year': year}).exists()
+        ]
+        return years[::-1] if order == 'DESC' else years
+
+
 class ObligationAdminForm(forms.ModelForm):
     # Make recurring_obligation required but inspection optional
     recurring_obligation = forms.BooleanField(
@@ -118,24 +156,53 @@ def save(self, commit=True):
 
 
 class ObligationEvidenceInline(admin.TabularInline):
-    """Inline admin for obligation evidence files."""
+    """
+    Inline admin for existing obligation evidence files.
+
+    Files are read-only: replacing one here would leave the row out of step
+    with its content-addressed blob. New files go through
+    ``EvidenceUploadInline``.
+    """
 
     model = ObligationEvidence
-    extra = 1
-    fields = ['file', 'description']
+    extra = 0
+    fields = ['download', 'uploaded_at', 'description']
+    readonly_fields = ['download', 'uploaded_at']
     verbose_name = 'Evidence File'
     verbose_name_plural = 'Evidence Files'
 
-    def get_formset(self, request, obj=None, **kwargs):
-        """
-        Only show inline when editing an existing obligation
-        (not during creation).
-        """
-        if obj is None:
-            self.extra = 0  # No empty forms when creating a new obligation
-        else:
-            self.extra = 1  # Show one empty form when editing
-        return super().get_formset(request, obj, **kwargs)
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description='File')
+    def download(self, obj):
+        """Link to the permission-checked download of the evidence file."""
+        return format_html(
+            '<a href="{}">{}</a>',
+            reverse('obligations:evidence_download', args=[obj.pk]),
+            obj.original_name or os.path.basename(obj.file.name),
+        )
+
+
+class EvidenceUploadInline(admin.TabularInline):
+    """Inline admin adding evidence through the content-addressed store."""
+
+    model = ObligationEvidence
+    form = EvidenceUploadForm
+    extra = 1
+    fields = ['file', 'description']
+    verbose_name = 'New Evidence File'
+    verbose_name_plural = 'Upload Evidence Files'
+
+    def get_queryset(self, request):
+        """Show only blank upload rows; existing files are listed separately."""
+        return super().get_queryset(request).none()
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(Obligation)
@@ -143,7 +210,7 @@ class ObligationAdmin(admin.ModelAdmin):
     """Admin configuration for obligations."""
 
     form = ObligationAdminForm  # Use our custom form
-    inlines = [ObligationEvidenceInline]
+    inlines = [ObligationEvidenceInline, EvidenceUploadInline]
 
     list_display = [
         'obligation_number',
@@ -218,17 +285,24 @@ class ObligationAdmin(admin.ModelAdmin):
     ]
     date_hierarchy = 'action_due_date'
 
+    # Count large unfiltered lists from table statistics and skip the
+    # second COUNT(*) of the whole table for the "N total" link
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
     @admin.display(
         description='Overdue',
         boolean=True,
+        ordering='overdue',
     )
     def is_overdue(self, obj):
         """Display whether an obligation is overdue."""
-        return is_obligation_overdue(obj)
+        return obj.overdue
 
     def get_queryset(self, request: HttpRequest) -> QuerySet[Obligation]:
         """
-        Optimize queryset for admin view by pre-fetching related fields.
+        Optimize queryset for admin view by pre-fetching related fields
+        and computing the overdue column in SQL.
 
         Args:
             request: The HTTP request object
@@ -237,7 +311,11 @@ def get_queryset(self, request: HttpRequest) -> QuerySet[Obligation]:
             QuerySet: Optimized queryset with related fields
         """
         qs = super().get_queryset(request)
-        return qs.select_related('project', 'primary_environmental_mechanism')
+        qs = qs.select_related('project', 'primary_environmental_mechanism')
+        qs = qs.annotate(overdue=overdue_expression())
+        return ObligationAdminQuerySet(
+            model=qs.model, query=qs.query, using=qs._db, hints=qs._hints
+        )
 
     def save_model(
         self, request: HttpRequest, obj: Obligation, form: ModelForm, change: bool
@@ -281,19 +359,19 @@ def save_model(
 
     @admin.action(description='Update recurring forecasted dates')
     def update_recurring_dates(self, request, queryset):
-        """Update recurring forecasted dates for selected obligations."""
-        count = 0
-        for obligation in queryset:
-            if obligation.update_recurring_forecasted_date():
-                obligation.save()
-                count += 1
+        """Queue a job updating recurring forecasted dates for selected obligations."""
+        job = enqueue(
+            'obligations.forecast_recurring_dates',
+            user=request.user,
+            obligation_numbers=list(queryset.values_list('pk', flat=True)),
+        )
 
         self.message_user(
-            request, f'Successfully updated {count} recurring forecasted dates'
+            request, f'Queued job #{job.pk} to update recurring forecasted dates'
         )
 
     def get_inlines(self, request, obj=None):
         """Only show inlines when editing an existing object."""
         if obj:  # Only for existing obligations
-            return [ObligationEvidenceInline]
+            return self.inlines
         return []  # No inlines when creating a new obligation
@@ -0,0 +1,155 @@
+"""
+Bulk edit and delete of obligations.
+
+Saving obligations one at a time runs the ``pre_save``/``post_save`` hooks,
+recounts the mechanism and re-materializes occurrences for every row. These
+services apply a change to many obligations with one ``UPDATE`` (or
+``DELETE``) inside a transaction and then refresh derived data once: forecasts
+only for affected recurring rows, occurrences for the touched rows, counters
+once per touched mechanism, and one dashboard event per touched project.
+"""
+
+import logging
+from typing import Any
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+from mechanisms.models import EnvironmentalMechanism
+
+from .constants import (
+    FORECAST_TRIGGER_FIELDS,
+    MECHANISM_COUNT_FIELDS,
+    STATUS_COMPLETED,
+    STATUS_NOT_STARTED,
+)
+from .forecasting import forecast_next_dates
+from .models import Obligation, obligations_bulk_changed, suspend_row_handlers
+from .occurrences import refresh_occurrences
+from .utils import bump_data_version
+
+logger = logging.getLogger(__name__)
+
+# Fields that can be changed on many obligations at once
+BULK_EDITABLE_FIELDS = ("status", "responsibility", "action_due_date")
+
+# Columns sent with ``obligations_bulk_changed``
+DASHBOARD_COLUMNS = ("project_id", "status", "action_due_date")
+
+
+def _refresh_mechanism_counts(mechanism_ids: set[int | None]) -> None:
+    """Recount each touched mechanism once."""
+    for mechanism in EnvironmentalMechanism.objects.filter(pk__in=mechanism_ids):
+        mechanism.update_obligation_counts()
+
+
+def bulk_update_obligations(queryset: QuerySet, changes: dict[str, Any]) -> int:
+    """
+    Apply the same field changes to many obligations.
+
+    As with a single save, completing a recurring obligation resets it to
+    "not started" and schedules its next occurrence.
+
+    Args:
+        queryset: Obligations to change
+        changes: New values keyed by a field in ``BULK_EDITABLE_FIELDS``
+
+    Returns:
+        int: Number of obligations updated
+    """
+    unknown = set(changes) - set(BULK_EDITABLE_FIELDS)
+    if unknown:
+        raise ValueError(f"Fields cannot be bulk edited: {', '.join(sorted(unknown))}")
+    if not changes:
+        return 0
+
+    with transaction.atomic():
+        rows = list(
+            queryset.select_for_update()
+            .order_by()
+            .values_list(
+                "obligation_number",
+                "primary_environmental_mechanism_id",
+                "recurring_obligation",
+                "recurring_frequency",
+                "recurring_forcasted_date",
+                "action_due_date",
+            )
+        )
+        numbers = [row[0] for row in rows]
+        if not numbers:
+            return 0
+
+        targets = Obligation.objects.filter(pk__in=numbers)
+        before = list(targets.values_list(*DASHBOARD_COLUMNS))
+        updated = targets.update(**changes, updated_at=timezone.now())
+
+        if changes.keys() & set(FORECAST_TRIGGER_FIELDS):
+            _reforecast_recurring(rows, changes)
+
+        refresh_occurrences(numbers)
+        if changes.keys() & set(MECHANISM_COUNT_FIELDS):
+            _refresh_mechanism_counts({row[1] for row in rows})
+        obligations_bulk_changed.send(
+            sender=Obligation,
+            before=before,
+            after=list(targets.values_list(*DASHBOARD_COLUMNS)),
+        )
+
+    bump_data_version()
+    logger.info("Bulk updated %s obligations: %s", updated, sorted(changes))
+    return updated
+
+
+def _reforecast_recurring(rows: list[tuple], changes: dict[str, Any]) -> None:
+    """Reset and re-forecast the recurring rows among the updated obligations."""
+    recurring = [row for row in rows if row[2]]
+    if not recurring:
+        return
+
+    # As with a single save, every completed recurring obligation starts over,
+    # even one without a frequency to forecast its next date from
+    if changes.get("status") == STATUS_COMPLETED:
+        Obligation.objects.filter(pk__in=[row[0] for row in recurring]).update(
+            status=STATUS_NOT_STARTED
+        )
+
+    forecastable = [
+        (number, frequency, forecasted, changes.get("action_due_date", due))
+        for number, _, _, frequency, forecasted, due in recurring
+        if frequency
+    ]
+    forecasts = [
+        Obligation(obligation_number=number, recurring_forcasted_date=next_date)
+        for number, next_date in forecast_next_dates(forecastable).items()
+    ]
+    Obligation.objects.bulk_update(
+        forecasts, ["recurring_forcasted_date"], batch_size=1000
+    )
+
+
+def bulk_delete_obligations(queryset: QuerySet) -> int:
+    """
+    Delete many obligations and refresh their mechanisms once.
+
+    Args:
+        queryset: Obligations to delete
+
+    Returns:
+        int: Number of obligations deleted
+    """
+    with transaction.atomic():
+        mechanism_ids = set(
+            queryset.order_by().values_list(
+                "primary_environmental_mechanism_id", flat=True
+            )
+        )
+        before = list(queryset.order_by().values_list(*DASHBOARD_COLUMNS))
+        with suspend_row_handlers():
+            deleted = queryset.delete()[1].get(Obligation._meta.label, 0)
+        _refresh_mechanism_counts(mechanism_ids)
+        obligations_bulk_changed.send(sender=Obligation, before=before, after=[])
+
+    bump_data_version()
+    logger.info("Bulk deleted %s obligations", deleted)
+    return deleted
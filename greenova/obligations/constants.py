@@ -75,3 +75,31 @@
     FREQUENCY_BIANNUAL: 182,  # Approximate
     FREQUENCY_ANNUAL: 365,  # Approximate
 }
+
+# Number of future due dates materialized per recurring obligation
+OCCURRENCE_COUNT = 12
+
+# Obligation fields that determine its materialized occurrences
+OCCURRENCE_FIELDS = (
+    'project_id',
+    'status',
+    'action_due_date',
+    'recurring_obligation',
+    'recurring_frequency',
+    'recurring_forcasted_date',
+)
+
+# Obligation fields that require the recurring forecast to be recalculated
+FORECAST_TRIGGER_FIELDS = (
+    'recurring_obligation',
+    'recurring_frequency',
+    'status',
+    'action_due_date',
+)
+
+# Obligation fields that affect the cached mechanism status counts
+MECHANISM_COUNT_FIELDS = (
+    'primary_environmental_mechanism_id',
+    'status',
+    'action_due_date',
+)
@@ -0,0 +1,208 @@
+"""
+Content-addressed storage for obligation evidence.
+
+Field teams attach the same report to many obligations. Each distinct file is
+stored once as an ``EvidenceBlob`` named after the SHA-256 of its content and
+shared by every ``ObligationEvidence`` row that uploads it; the blob keeps a
+reference count and its file is deleted when the last evidence row goes.
+
+Uploads larger than ``FILE_UPLOAD_MAX_MEMORY_SIZE`` are hashed by
+``HashingFileUploadHandler`` while Django streams them to a temporary file,
+so the content is read exactly once and the temporary file is moved into
+place rather than copied.
+"""
+
+import hashlib
+import logging
+import mimetypes
+import os
+
+from django.core.files import File
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import EvidenceBlob, Obligation, ObligationEvidence
+
+logger = logging.getLogger(__name__)
+
+# Bytes read per chunk when hashing files that arrive without a digest
+CHUNK_SIZE = 64 * 1024
+
+BLOB_ROOT = "evidence_blobs"
+
+
+class HashingFileUploadHandler(TemporaryFileUploadHandler):
+    """Stream uploads to a temporary file, hashing each chunk as it arrives."""
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        uploaded.sha256 = self.hasher.hexdigest()
+        return uploaded
+
+
+def hash_file(file: File) -> tuple[str, int]:
+    """
+    Return the SHA-256 hex digest and size of a file.
+
+    Uses the digest computed during upload when there is one, otherwise reads
+    the file in ``CHUNK_SIZE`` chunks.
+    """
+    digest = getattr(file, "sha256", None)
+    if digest:
+        return digest, file.size
+
+    hasher = hashlib.sha256()
+    size = 0
+    for chunk in file.chunks(CHUNK_SIZE):
+        hasher.update(chunk)
+        size += len(chunk)
+    return hasher.hexdigest(), size
+
+
+def blob_path(digest: str, filename: str) -> str:
+    """Return the storage path of a blob, fanned out by its digest prefix."""
+    extension = os.path.splitext(filename)[1].lower()
+    return f"{BLOB_ROOT}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+
+def guess_content_type(filename: str, declared: str | None = None) -> str:
+    """Pick a MIME type from the file name, falling back to the declared one."""
+    return mimetypes.guess_type(filename)[0] or declared or "application/octet-stream"
+
+
+def store_file(file: File) -> EvidenceBlob:
+    """
+    Store a file by content and take a reference to its blob.
+
+    Identical content uploaded before is not written again; the existing
+    blob's reference count is incremented instead.
+
+    Args:
+        file: Uploaded or opened file
+
+    Returns:
+        EvidenceBlob: The blob holding the file's content
+    """
+    digest, size = hash_file(file)
+    storage = EvidenceBlob._meta.get_field("file").storage
+    name = os.path.basename(file.name or "")
+
+    with transaction.atomic():
+        blob = EvidenceBlob.objects.filter(sha256=digest).first()
+        if blob is None:
+            path = blob_path(digest, name)
+            if not storage.exists(path):
+                file.seek(0)
+                path = storage.save(path, file)
+            try:
+                with transaction.atomic():
+                    blob = EvidenceBlob.objects.create(
+                        sha256=digest,
+                        file=path,
+                        size=size,
+                        content_type=guess_content_type(
+                            name, getattr(file, "content_type", None)
+                        ),
+                    )
+            except IntegrityError:
+                # A concurrent upload of the same content created it first
+                blob = EvidenceBlob.objects.get(sha256=digest)
+                if path != blob.file.name:
+                    storage.delete(path)
+        EvidenceBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+
+    blob.ref_count += 1
+    return blob
+
+
+def attach_evidence(
+    obligation: Obligation, file: File, description: str = ""
+) -> ObligationEvidence:
+    """
+    Store an uploaded file and attach it to an obligation as evidence.
+
+    Args:
+        obligation: Obligation the evidence supports
+        file: Uploaded file
+        description: Optional description of the evidence
+
+    Returns:
+        ObligationEvidence: The new evidence row
+    """
+    with transaction.atomic():
+        blob = store_file(file)
+        return ObligationEvidence.objects.create(
+            obligation=obligation,
+            blob=blob,
+            file=blob.file.name,
+            original_name=os.path.basename(file.name or "")[:255],
+            description=description,
+        )
+
+
+def release_blob(blob_id: int) -> None:
+    """
+    Drop one reference to a blob, deleting it once nothing refers to it.
+
+    The file itself is removed only after the transaction commits, so a
+    rolled-back delete never loses content.
+    """
+    storage = EvidenceBlob._meta.get_field("file").storage
+    with transaction.atomic():
+        EvidenceBlob.objects.filter(pk=blob_id, ref_count__gt=0).update(
+            ref_count=F("ref_count") - 1
+        )
+        blob = EvidenceBlob.objects.filter(
+            pk=blob_id, ref_count=0, evidences__isnull=True
+        ).first()
+        if blob is None:
+            return
+        name = blob.file.name
+        blob.delete()
+        transaction.on_commit(lambda: storage.delete(name))
+    logger.info("Deleted unreferenced evidence blob %s", blob.sha256)
+
+
+def adopt_legacy_evidence(chunk_size: int = 200) -> int:
+    """
+    Move evidence uploaded before the blob store into it.
+
+    Each legacy file is stored by content, its evidence row is pointed at the
+    blob and the original copy is deleted, so duplicates collapse into one.
+
+    Args:
+        chunk_size: Evidence rows fetched per database round trip
+
+    Returns:
+        int: Number of evidence rows moved into the store
+    """
+    storage = ObligationEvidence._meta.get_field("file").storage
+    adopted = 0
+    legacy = ObligationEvidence.objects.filter(blob__isnull=True).order_by("pk")
+    for evidence in legacy.iterator(chunk_size=chunk_size):
+        old_name = evidence.file.name
+        if not old_name or not storage.exists(old_name):
+            logger.warning("Evidence %s has no stored file, skipping", evidence.pk)
+            continue
+        with transaction.atomic():
+            with storage.open(old_name, "rb") as handle:
+                blob = store_file(File(handle, name=old_name))
+            ObligationEvidence.objects.filter(pk=evidence.pk).update(
+                blob=blob,
+                file=blob.file.name,
+                original_name=evidence.display_name,
+            )
+            if old_name != blob.file.name:
+                transaction.on_commit(lambda name=old_name: storage.delete(name))
+        adopted += 1
+    logger.info("Moved %s legacy evidence files into the blob store", adopted)
+    return adopted
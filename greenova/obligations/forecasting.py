@@ -0,0 +1,220 @@
+"""
+Bulk forecasting of recurring obligation dates.
+
+``Obligation.calculate_next_recurring_date`` works on one instance at a time
+and callers then ``save()`` each row, firing every signal handler. This module
+computes the same dates for many obligations at once: rows are grouped by
+normalized frequency, each group is advanced with NumPy date arithmetic and
+the results are written back with ``bulk_update``, which sends no per-row
+signals; each written batch sends one ``obligations_bulk_changed`` instead.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from .constants import (
+    FREQUENCY_ANNUAL,
+    FREQUENCY_BIANNUAL,
+    FREQUENCY_DAILY,
+    FREQUENCY_FORTNIGHTLY,
+    FREQUENCY_MONTHLY,
+    FREQUENCY_QUARTERLY,
+    FREQUENCY_WEEKLY,
+)
+from .models import Obligation, obligations_bulk_changed
+from .utils import bump_data_version, normalize_frequency
+
+logger = logging.getLogger(__name__)
+
+# Step applied for each canonical frequency as (unit, amount). Month steps are
+# clamped to the end of the target month, matching ``relativedelta``.
+FREQUENCY_STEPS: dict[str, tuple[str, int]] = {
+    FREQUENCY_DAILY: ("days", 1),
+    FREQUENCY_WEEKLY: ("days", 7),
+    FREQUENCY_FORTNIGHTLY: ("days", 14),
+    FREQUENCY_MONTHLY: ("months", 1),
+    FREQUENCY_QUARTERLY: ("months", 3),
+    FREQUENCY_BIANNUAL: ("months", 6),
+    FREQUENCY_ANNUAL: ("months", 12),
+}
+
+# Unrecognized frequencies fall back to monthly, as in the model method.
+DEFAULT_STEP = FREQUENCY_STEPS[FREQUENCY_MONTHLY]
+
+
+def advance_dates(dates: np.ndarray, unit: str, amount: int) -> np.ndarray:
+    """
+    Advance an array of dates by a fixed number of days or months.
+
+    Args:
+        dates: Array of ``datetime64[D]`` values
+        unit: Either ``"days"`` or ``"months"``
+        amount: Number of units to add
+
+    Returns:
+        np.ndarray: The advanced ``datetime64[D]`` values
+    """
+    if unit == "days":
+        return dates + np.timedelta64(amount, "D")
+
+    months = dates.astype("datetime64[M]")
+    day_offset = dates - months.astype("datetime64[D]")
+    target = months + np.timedelta64(amount, "M")
+    target_start = target.astype("datetime64[D]")
+    month_length = (target + np.timedelta64(1, "M")).astype("datetime64[D]") - (
+        target_start
+    )
+    return target_start + np.minimum(day_offset, month_length - np.timedelta64(1, "D"))
+
+
+def frequency_step(frequency: str) -> tuple[str, int]:
+    """
+    Return the (unit, amount) step for a raw recurring frequency value.
+
+    Args:
+        frequency: A recurring frequency as stored on the obligation
+
+    Returns:
+        tuple: The step, defaulting to monthly for unknown frequencies
+    """
+    normalized = normalize_frequency(frequency)
+    if normalized not in FREQUENCY_STEPS:
+        logger.warning("Unrecognized frequency '%s' - defaulting to monthly", frequency)
+    return FREQUENCY_STEPS.get(normalized, DEFAULT_STEP)
+
+
+def forecast_next_dates(
+    rows: list[tuple[str, str, date | None, date | None]],
+    today: date | None = None,
+) -> dict[str, date]:
+    """
+    Compute next recurring dates for many obligations.
+
+    Args:
+        rows: Tuples of (obligation_number, recurring_frequency,
+            recurring_forcasted_date, action_due_date)
+        today: Reference date (defaults to today)
+
+    Returns:
+        dict: Mapping of obligation_number to its next forecasted date
+    """
+    today = today or timezone.now().date()
+    today64 = np.datetime64(today, "D")
+
+    # Normalize each distinct raw frequency once and group rows by the result.
+    steps: dict[str, tuple[str, int]] = {}
+    groups: dict[tuple[str, int], list[tuple[str, date]]] = defaultdict(list)
+    for number, frequency, forecasted, due in rows:
+        if frequency not in steps:
+            steps[frequency] = frequency_step(frequency)
+        groups[steps[frequency]].append((number, forecasted or due or today))
+
+    results: dict[str, date] = {}
+    for (unit, amount), members in groups.items():
+        numbers = [number for number, _ in members]
+        base = np.array([base_date for _, base_date in members], dtype="datetime64[D]")
+        next_dates = advance_dates(np.maximum(base, today64), unit, amount)
+        results.update(zip(numbers, next_dates.astype(object)))
+    return results
+
+
+def forecast_recurring_dates(
+    queryset: QuerySet[Obligation] | None = None,
+    today: date | None = None,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+    refresh_all: bool = False,
+) -> int:
+    """
+    Recompute and store forecasted dates for recurring obligations in bulk.
+
+    By default only obligations whose forecasted date is missing or has
+    passed are advanced, so the nightly run is idempotent. Only rows whose
+    date changes are written, using ``bulk_update`` so no per-row ``save()``
+    or signal handlers run.
+
+    Args:
+        queryset: Obligations to forecast (defaults to all obligations)
+        today: Reference date (defaults to today)
+        batch_size: Number of rows forecast and written per batch
+        dry_run: Compute the changes without writing them
+        refresh_all: Advance every recurring obligation, like calling
+            ``update_recurring_forecasted_date`` on each one
+
+    Returns:
+        int: Number of obligations whose forecasted date changed
+    """
+    today = today or timezone.now().date()
+    if queryset is None:
+        queryset = Obligation.objects.all()
+    if not refresh_all:
+        queryset = queryset.filter(
+            Q(recurring_forcasted_date__isnull=True)
+            | Q(recurring_forcasted_date__lt=today)
+        )
+
+    # Read the narrow rows up front so no cursor is open while writing.
+    rows = list(
+        queryset.filter(recurring_obligation=True, recurring_frequency__isnull=False)
+        .exclude(recurring_frequency="")
+        .order_by()
+        .values_list(
+            "obligation_number",
+            "recurring_frequency",
+            "recurring_forcasted_date",
+            "action_due_date",
+        )
+    )
+
+    updated = 0
+    with transaction.atomic():
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            updated += _apply_batch(batch, today, batch_size, dry_run)
+
+    logger.info("Forecasted %s recurring obligation dates", updated)
+    return updated
+
+
+def _apply_batch(
+    batch: list[tuple[str, str, date | None, date | None]],
+    today: date,
+    batch_size: int,
+    dry_run: bool,
+) -> int:
+    """Forecast a batch of rows and write back the ones that changed."""
+    current = {number: forecasted for number, _, forecasted, _ in batch}
+    now = timezone.now()
+    changed = [
+        Obligation(
+            obligation_number=number,
+            recurring_forcasted_date=next_date,
+            updated_at=now,
+        )
+        for number, next_date in forecast_next_dates(batch, today).items()
+        if current[number] != next_date
+    ]
+    if changed and not dry_run:
+        # Imported here because the occurrence module builds on this one.
+        from .occurrences import refresh_occurrences
+
+        # updated_at is stamped by hand; bulk_update skips auto_now
+        Obligation.objects.bulk_update(
+            changed, ["recurring_forcasted_date", "updated_at"], batch_size=batch_size
+        )
+        refresh_occurrences(obligation.pk for obligation in changed)
+        # Counters keep their values, but dashboards reload the moved dates
+        rows = list(
+            Obligation.objects.filter(
+                pk__in=[obligation.pk for obligation in changed]
+            ).values_list("project_id", "status", "action_due_date")
+        )
+        obligations_bulk_changed.send(sender=Obligation, before=rows, after=rows)
+        bump_data_version()
+    return len(changed)
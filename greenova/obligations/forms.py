@@ -15,6 +15,7 @@
     STATUS_COMPLETED,
     STATUS_NOT_STARTED,
 )
+from .evidence_store import attach_evidence
 from .models import Obligation, ObligationEvidence
 from .utils import normalize_frequency
 
@@ -594,7 +595,8 @@ def save(self, commit=True):
             instance.update_recurring_forecasted_date()
 
         if commit:
-            instance.save()
+            # Existing obligations only write the columns that were edited
+            instance.save_changed()
             self.save_m2m()  # Save Many-to-Many relationships
 
         return instance
@@ -704,6 +706,14 @@ def clean_file(self):
 
         return file
 
+    def save(self, commit=True):
+        """Store the upload by content instead of writing a new copy."""
+        evidence = super().save(commit=False)
+        upload = self.cleaned_data["file"]
+        if not commit:
+            return evidence
+        return attach_evidence(evidence.obligation, upload, evidence.description)
+
     class Meta:
         model = ObligationEvidence
         fields = ["file", "description"]
@@ -714,3 +724,55 @@ class Meta:
                 }
             ),
         }
+
+
+class BulkObligationForm(forms.Form):
+    """Form for applying the same change to several selected obligations."""
+
+    ACTION_UPDATE = "update"
+    ACTION_DELETE = "delete"
+
+    selected = forms.MultipleChoiceField(
+        error_messages={"required": "Select at least one obligation."},
+    )
+    action = forms.ChoiceField(
+        choices=[(ACTION_UPDATE, "Apply changes"), (ACTION_DELETE, "Delete")],
+        initial=ACTION_UPDATE,
+    )
+    status = forms.ChoiceField(
+        required=False,
+        choices=[("", "Status: no change"), *STATUS_CHOICES],
+        widget=forms.Select(attrs={"class": "form-input"}),
+    )
+    responsibility = forms.ChoiceField(
+        required=False,
+        widget=forms.Select(attrs={"class": "form-input"}),
+    )
+    action_due_date = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date", "class": "form-input"}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["responsibility"].choices = [
+            ("", "Responsibility: no change"),
+            *get_responsibility_choices(),
+        ]
+        # Obligation numbers are checked against the user's queryset by the view
+        selected = self.data.getlist("selected") if self.data else []
+        self.fields["selected"].choices = [(number, number) for number in selected]
+
+    def changes(self) -> dict:
+        """Return the edited fields, leaving out those set to "no change"."""
+        return {
+            field: self.cleaned_data[field]
+            for field in ("status", "responsibility", "action_due_date")
+            if self.cleaned_data.get(field) not in (None, "")
+        }
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get("action") == self.ACTION_UPDATE and not self.changes():
+            raise ValidationError("Choose at least one field to change.")
+        return cleaned_data
@@ -0,0 +1,19 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from obligations.evidence_store import adopt_legacy_evidence
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Move evidence files uploaded before deduplication into the blob store'
+
+    def handle(self, *args, **options):
+        """Store every legacy evidence file by content."""
+        self.stdout.write("Moving legacy evidence files into the blob store...")
+
+        count = adopt_legacy_evidence()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Successfully moved {count} evidence files"
+        ))
@@ -0,0 +1,99 @@
+import gzip
+import logging
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from obligations.exporting import (
+    DEFAULT_CHUNK_SIZE,
+    export_rows,
+    stream_csv,
+    stream_xlsx,
+)
+from obligations.models import Obligation
+from obligations.proto_utils import stream_register
+from projects.models import Project
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = (
+        'Export obligations as CSV (importable by import_obligations), XLSX, '
+        'or a protobuf register (importable by import_obligations_proto)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            type=str,
+            help='Only export obligations of the project with this name'
+        )
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'xlsx', 'proto'],
+            default='csv',
+            help='Output format (default: csv)'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help=(
+                'File to write to (default: standard output, CSV only); '
+                'protobuf registers are gzip compressed when it ends in .gz'
+            )
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Rows fetched per database round trip'
+        )
+
+    def handle(self, *args, **options):
+        if options['format'] == 'proto':
+            self.export_register(options)
+            return
+
+        queryset = Obligation.objects.all()
+        if options['project']:
+            queryset = queryset.filter(project__name=options['project'])
+
+        rows = export_rows(queryset, chunk_size=options['chunk_size'])
+        output = options['output']
+
+        if options['format'] == 'xlsx':
+            if not output:
+                raise CommandError('--output is required for XLSX exports')
+            with open(output, 'wb') as export_file:
+                for chunk in stream_xlsx(rows):
+                    export_file.write(chunk)
+        elif output:
+            with open(output, 'w', encoding='utf-8', newline='') as export_file:
+                for chunk in stream_csv(rows):
+                    export_file.write(chunk)
+        else:
+            for chunk in stream_csv(rows):
+                sys.stdout.write(chunk)
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"Exported obligations to {output}"))
+
+    def export_register(self, options):
+        """Write the selected projects as a length-delimited protobuf register."""
+        output = options['output']
+        if not output:
+            raise CommandError('--output is required for protobuf exports')
+
+        projects = Project.objects.all()
+        if options['project']:
+            projects = projects.filter(name=options['project'])
+            if not projects.exists():
+                raise CommandError(f"Project not found: {options['project']}")
+
+        opener = gzip.open if output.endswith('.gz') else open
+        with opener(output, 'wb') as export_file:
+            for chunk in stream_register(projects, chunk_size=options['chunk_size']):
+                export_file.write(chunk)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Exported obligation register to {output}")
+        )
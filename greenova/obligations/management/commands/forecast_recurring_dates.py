@@ -0,0 +1,55 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from obligations.forecasting import forecast_recurring_dates
+from obligations.models import Obligation
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Bulk recompute recurring forecasted dates without per-row saves'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            type=int,
+            help='Only forecast obligations belonging to this project ID'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of obligations written per bulk update'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='refresh_all',
+            help='Advance every recurring obligation, not only passed forecasts'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show how many dates would change without saving them'
+        )
+
+    def handle(self, *args, **options):
+        """Forecast next dates for recurring obligations in bulk."""
+        queryset = Obligation.objects.all()
+        if options['project']:
+            queryset = queryset.filter(project_id=options['project'])
+
+        started = time.monotonic()
+        count = forecast_recurring_dates(
+            queryset,
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+            refresh_all=options['refresh_all'],
+        )
+        elapsed = time.monotonic() - started
+
+        verb = 'Would update' if options['dry_run'] else 'Updated'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {count} recurring forecasted dates in {elapsed:.2f}s"
+        ))
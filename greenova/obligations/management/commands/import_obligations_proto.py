@@ -0,0 +1,63 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+from obligations.proto_utils import (
+    DEFAULT_BATCH_SIZE,
+    RegisterFormatError,
+    import_register,
+    open_register,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Import a protobuf obligation register written by '
+        'export_obligations --format proto'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'register_file',
+            type=str,
+            help='Path to the register file, optionally gzip compressed'
+        )
+        parser.add_argument(
+            '--project',
+            type=str,
+            help='Import every project in the register into the project with this name'
+        )
+        parser.add_argument(
+            '--update',
+            action='store_true',
+            help='Update existing obligations instead of skipping them'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Rows written per bulk insert'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open_register(options['register_file']) as register:
+                result = import_register(
+                    register,
+                    project_name=options['project'],
+                    update=options['update'],
+                    batch_size=options['batch_size'],
+                )
+        except (OSError, RegisterFormatError, DatabaseError) as e:
+            raise CommandError(f"Failed to import register: {e}") from e
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Imported {result.created} obligations ({result.updated} updated, '
+                f'{result.skipped} skipped, {result.conflicts} numbered like '
+                f'obligations of other projects), {result.mechanisms} new '
+                f'mechanisms and {result.evidence} evidence records'
+            )
+        )
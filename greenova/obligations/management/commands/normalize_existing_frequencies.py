@@ -1,7 +1,9 @@
 import logging
+from collections import defaultdict
 
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.db.models import Count
 from obligations.models import Obligation
 from obligations.utils import normalize_frequency
 
@@ -28,30 +30,43 @@ def handle(self, *args, **options):
             recurring_frequency__isnull=False
         ).exclude(recurring_frequency='')
 
-        count = obligations.count()
-        self.stdout.write(f"Found {count} obligations with recurring frequencies")
+        # Normalize each distinct raw value once instead of every row
+        distinct_values = (
+            obligations.order_by()
+            .values('recurring_frequency')
+            .annotate(total=Count('pk'))
+        )
 
+        count = 0
         changes = 0
         skipped = 0
+        raw_values_by_target = defaultdict(list)
 
-        with transaction.atomic():
-            # Only actually commit if not a dry run
-            if dry_run:
-                self.stdout.write("DRY RUN - no changes will be saved")
+        for row in distinct_values:
+            original = row['recurring_frequency']
+            normalized = normalize_frequency(original)
+            count += row['total']
 
-            for obligation in obligations:
-                original = obligation.recurring_frequency
-                normalized = normalize_frequency(original)
+            if original.lower() != normalized:
+                self.stdout.write(
+                    f"  • '{original}' → '{normalized}' ({row['total']} obligations)"
+                )
+                raw_values_by_target[normalized].append(original)
+                changes += row['total']
+            else:
+                skipped += row['total']
 
-                if original.lower() != normalized:
-                    self.stdout.write(f"  • {obligation.obligation_number}: '{original}' → '{normalized}'")
-                    changes += 1
+        self.stdout.write(f"Found {count} obligations with recurring frequencies")
 
-                    if not dry_run:
-                        obligation.recurring_frequency = normalized
-                        obligation.save(update_fields=['recurring_frequency'])
-                else:
-                    skipped += 1
+        if dry_run:
+            self.stdout.write("DRY RUN - no changes will be saved")
+        else:
+            # One UPDATE ... WHERE recurring_frequency IN (...) per canonical value
+            with transaction.atomic():
+                for normalized, raw_values in raw_values_by_target.items():
+                    obligations.filter(recurring_frequency__in=raw_values).update(
+                        recurring_frequency=normalized
+                    )
 
         if dry_run:
             self.stdout.write(self.style.SUCCESS(
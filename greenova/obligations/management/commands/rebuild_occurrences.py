@@ -0,0 +1,19 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from obligations.occurrences import rebuild_all_occurrences
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized obligation due-date calendar'
+
+    def handle(self, *args, **options):
+        """Re-materialize occurrences for every obligation."""
+        self.stdout.write("Rebuilding obligation occurrences...")
+
+        count = rebuild_all_occurrences()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Successfully materialized {count} obligation occurrences"
+        ))
@@ -1,7 +1,7 @@
 import logging
 
 from django.core.management.base import BaseCommand
-from obligations.models import Obligation
+from obligations.forecasting import forecast_recurring_dates
 
 logger = logging.getLogger(__name__)
 
@@ -12,14 +12,7 @@ def handle(self, *args, **options):
         """Update forecasted dates for all recurring obligations."""
         self.stdout.write("Updating recurring forecasted dates...")
 
-        # Get all recurring obligations
-        obligations = Obligation.objects.filter(recurring_obligation=True)
-        count = 0
-
-        for obligation in obligations:
-            if obligation.update_recurring_forecasted_date():
-                obligation.save()
-                count += 1
+        count = forecast_recurring_dates(refresh_all=True)
 
         self.stdout.write(self.style.SUCCESS(
             f"Successfully updated {count} recurring forecasted dates"
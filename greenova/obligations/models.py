@@ -1,5 +1,8 @@
 import logging
 import re
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import date
 from typing import Any
 
@@ -9,11 +12,12 @@
 from django.core.validators import FileExtensionValidator
 from django.db import models
 from django.db.models.signals import post_delete, post_save, pre_save
-from django.dispatch import receiver
+from django.dispatch import Signal, receiver
 from django.utils import timezone
 from projects.models import Project
 
 from .constants import (
+    FORECAST_TRIGGER_FIELDS,
     FREQUENCY_ANNUAL,
     FREQUENCY_BIANNUAL,
     FREQUENCY_DAILY,
@@ -21,14 +25,48 @@
     FREQUENCY_MONTHLY,
     FREQUENCY_QUARTERLY,
     FREQUENCY_WEEKLY,
+    MECHANISM_COUNT_FIELDS,
+    OCCURRENCE_FIELDS,
     STATUS_CHOICES,
     STATUS_COMPLETED,
     STATUS_NOT_STARTED,
 )
-from .utils import normalize_frequency
+from .utils import bump_data_version, normalize_frequency
 
 logger = logging.getLogger(__name__)
 
+# Set while bulk operations write many obligations and refresh derived data once
+_row_handlers_suspended: ContextVar[bool] = ContextVar(
+    "obligation_row_handlers_suspended", default=False
+)
+
+
+@contextmanager
+def suspend_row_handlers() -> Iterator[None]:
+    """
+    Skip the per-row derived data handlers for saves and deletes in the block.
+
+    Mechanism counts, materialized occurrences and the data version are not
+    refreshed per obligation, so the caller must refresh them once afterwards.
+    """
+    token = _row_handlers_suspended.set(True)
+    try:
+        yield
+    finally:
+        _row_handlers_suspended.reset(token)
+
+
+def row_handlers_suspended() -> bool:
+    """Return whether per-row handlers are suspended by ``suspend_row_handlers``."""
+    return _row_handlers_suspended.get()
+
+
+# Sent when obligations are written in bulk, which skips the per-row signals.
+# ``before`` and ``after`` hold the (project_id, status, action_due_date) of
+# the touched rows before and after the write; new or deleted rows appear in
+# only one of them.
+obligations_bulk_changed = Signal()
+
 
 class Obligation(models.Model):
     """Represents an environmental obligation."""
@@ -215,16 +253,146 @@ class Meta:
         verbose_name = "Obligation"
         verbose_name_plural = "Obligations"
         ordering = ["obligation_number"]
+        # Composite indexes follow the hot query shapes registered in
+        # obligations.query_plans; tests/test_query_plans.py checks each one
+        # still avoids a full table scan. The ForeignKey indexes cover plain
+        # project and mechanism lookups.
         indexes = [
             models.Index(fields=["status"]),
             models.Index(fields=["action_due_date"]),
-            models.Index(fields=["project"]),
+            # Dashboard counts: project, then status, then due date ranges
+            models.Index(
+                fields=["project", "status", "action_due_date"],
+                name="obligation_dashboard_idx",
+            ),
+            # Procedure charts count status and overdue per procedure; the
+            # due date makes the index covering
+            models.Index(
+                fields=[
+                    "primary_environmental_mechanism",
+                    "procedure",
+                    "status",
+                    "action_due_date",
+                ],
+                name="obligation_procedure_idx",
+            ),
+            # Responsibility charts group a mechanism's rows by responsibility
+            models.Index(
+                fields=["primary_environmental_mechanism", "responsibility"],
+                name="obligation_mech_resp_idx",
+            ),
+            # Summary of the obligations assigned to the user's roles
+            models.Index(
+                fields=["responsibility", "project"], name="obligation_resp_proj_idx"
+            ),
+            # Serves the per-project validators of conditional responses
+            models.Index(
+                fields=["project", "updated_at"], name="obligation_proj_updated_idx"
+            ),
         ]
         app_label = "obligations"
 
     def __str__(self) -> str:
         return f"{self.obligation_number} - {self.project.name}"
 
+    @classmethod
+    def from_db(
+        cls, db: str, field_names: list[str], values: list[Any]
+    ) -> "Obligation":
+        """Snapshot the loaded column values so changes can be detected on save."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def refresh_from_db(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh the change-tracking snapshot along with the reloaded fields."""
+        deferred = self.get_deferred_fields()
+        super().refresh_from_db(*args, **kwargs)
+        fields = kwargs.get("fields", args[1] if len(args) > 1 else None)
+        if fields is None:
+            fields = [
+                field.attname
+                for field in self._meta.concrete_fields
+                if field.attname not in deferred
+            ]
+        self._snapshot(fields)
+
+    def _snapshot(self, fields: Iterable[str] | None = None) -> None:
+        """
+        Record the current values of the given (or all loaded) fields.
+
+        Fields may be given by name or attname, as ``save(update_fields=...)``
+        accepts both.
+        """
+        if fields is None:
+            deferred = self.get_deferred_fields()
+            attnames = [
+                field.attname
+                for field in self._meta.concrete_fields
+                if field.attname not in deferred
+            ]
+        else:
+            attnames = [self._meta.get_field(name).attname for name in fields]
+        loaded = self.__dict__.setdefault("_loaded_values", {})
+        loaded.update({attname: self.__dict__[attname] for attname in attnames})
+
+    def changed_fields(self) -> dict[str, Any]:
+        """
+        Return the fields changed since the instance was loaded or last saved.
+
+        Instances that were not loaded from the database (for example ones
+        built with an explicit primary key) are compared against the stored
+        row, which costs one query the first time.
+
+        Returns:
+            dict: Mapping of changed field attnames to their previous values
+        """
+        if "_loaded_values" not in self.__dict__:
+            stored = (
+                type(self)
+                ._base_manager.filter(pk=self.pk)
+                .values(*(field.attname for field in self._meta.concrete_fields))
+                .first()
+            )
+            self._loaded_values = stored or {}
+            if not stored:
+                return {
+                    field.attname: None for field in self._meta.concrete_fields
+                }
+        return {
+            attname: previous
+            for attname, previous in self._loaded_values.items()
+            if self.__dict__.get(attname) != previous
+        }
+
+    def save_changed(self, **kwargs: Any) -> bool:
+        """
+        Save only the columns that changed since the instance was loaded.
+
+        New instances, and changes to the primary key, fall back to a full
+        ``save()``. Fields the ``pre_save`` hooks may rewrite are included
+        whenever the fields they depend on changed.
+
+        Returns:
+            bool: False if nothing changed and no query was issued
+        """
+        if self._state.adding:
+            self.save(**kwargs)
+            return True
+
+        changed = set(self.changed_fields())
+        if not changed:
+            return False
+        if self._meta.pk.attname in changed:
+            self.save(**kwargs)
+            return True
+
+        update_fields = changed | {"updated_at"}
+        if changed.intersection(FORECAST_TRIGGER_FIELDS):
+            update_fields |= {"status", "recurring_forcasted_date"}
+        self.save(update_fields=sorted(update_fields), **kwargs)
+        return True
+
     def calculate_next_recurring_date(self) -> date | None:
         """
         Calculate the next recurring date based on frequency and current/last date.
@@ -305,16 +473,18 @@ def get_next_obligation_number(cls) -> str:
         # Extract the highest numeric value from all obligation numbers
         highest_number = 0
 
-        # Query all obligation numbers
-        all_obligations = cls.objects.all()
+        # Read only the primary keys, which the index answers without the rows
+        obligation_numbers = (
+            cls.objects.filter(obligation_number__startswith=prefix)
+            .order_by()
+            .values_list("obligation_number", flat=True)
+        )
 
-        for obligation in all_obligations:
-            if obligation.obligation_number and obligation.obligation_number.startswith(
-                prefix
-            ):
+        for obligation_number in obligation_numbers.iterator():
+            if obligation_number:
                 try:
                     # Extract numeric part after the prefix
-                    number_part = obligation.obligation_number[len(prefix) :]
+                    number_part = obligation_number[len(prefix) :]
                     current_number = int(number_part)
 
                     # Update highest if we found a larger number
@@ -357,10 +527,9 @@ def save(self, *args: Any, **kwargs: Any) -> None:
             super().save(*args, **kwargs)
         except Exception as exc:
             logger.error("Error saving obligation: %s", str(exc))
-
-        # Update mechanism counts
-        if self.primary_environmental_mechanism:
-            self.primary_environmental_mechanism.update_obligation_counts()
+        else:
+            # Saved values become the baseline for the next changed_fields()
+            self._snapshot(kwargs.get("update_fields"))
 
     @property
     def is_overdue(self) -> bool:
@@ -374,7 +543,21 @@ def is_overdue(self) -> bool:
 @receiver(post_save, sender=Obligation)
 def update_mechanism_counts_on_save(sender, instance, **kwargs):
     """Update mechanism counts when an obligation is saved."""
+    if _row_handlers_suspended.get():
+        return
+    created = kwargs.get("created", False)
+    changed = {} if created else instance.changed_fields()
+    if not created and not changed.keys() & set(MECHANISM_COUNT_FIELDS):
+        return
     try:
+        # Moving an obligation also changes the counts of its previous mechanism
+        previous_id = changed.get("primary_environmental_mechanism_id")
+        if previous_id:
+            mechanism_model = sender._meta.get_field(
+                "primary_environmental_mechanism"
+            ).related_model
+            for mechanism in mechanism_model.objects.filter(pk=previous_id):
+                mechanism.update_obligation_counts()
         if instance.primary_environmental_mechanism:
             instance.primary_environmental_mechanism.update_obligation_counts()
             logger.info(
@@ -388,10 +571,43 @@ def update_mechanism_counts_on_save(sender, instance, **kwargs):
 @receiver(post_delete, sender=Obligation)
 def update_mechanism_counts_on_delete(sender, instance, **kwargs):
     """Update mechanism counts when an obligation is deleted."""
+    if _row_handlers_suspended.get():
+        return
     if instance.primary_environmental_mechanism:
         instance.primary_environmental_mechanism.update_obligation_counts()
 
 
+class EvidenceBlob(models.Model):
+    """
+    One stored evidence file, shared by every upload with the same content.
+
+    Blobs are addressed by the SHA-256 of their content and counted by the
+    ``ObligationEvidence`` rows that reference them; ``obligations.evidence_store``
+    creates them and deletes the file once the last reference is gone.
+    """
+
+    sha256: Any = models.CharField(max_length=64, unique=True)
+    file: Any = models.FileField(max_length=255)
+    size: Any = models.PositiveBigIntegerField()
+    content_type: Any = models.CharField(max_length=100)
+    ref_count: Any = models.PositiveIntegerField(default=0)
+    created_at: Any = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Evidence Blob"
+        verbose_name_plural = "Evidence Blobs"
+
+    def __str__(self) -> str:
+        return f"{self.sha256[:12]} ({self.ref_count} references)"
+
+
+class ObligationEvidenceManager(models.Manager):
+    """Load the stored blob with each evidence row so listings need no stat."""
+
+    def get_queryset(self) -> models.QuerySet:
+        return super().get_queryset().select_related("blob")
+
+
 class ObligationEvidence(models.Model):
     """Model to store multiple evidence files for an obligation."""
 
@@ -420,20 +636,36 @@ class ObligationEvidence(models.Model):
         max_length=255,
         help_text="Upload evidence documents (25MB max)",
     )
+    blob: Any = models.ForeignKey(
+        EvidenceBlob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="evidences",
+    )
+    original_name: Any = models.CharField(max_length=255, blank=True)
     uploaded_at: Any = models.DateTimeField(auto_now_add=True)
     description: Any = models.CharField(max_length=255, blank=True)
 
+    objects = ObligationEvidenceManager()
+
     class Meta:
         ordering = ["-uploaded_at"]
         verbose_name = "Evidence File"
         verbose_name_plural = "Evidence Files"
 
     def __str__(self) -> str:
-        return f"Evidence for {self.obligation} - {self.file.name}"
+        return f"Evidence for {self.obligation} - {self.display_name}"
+
+    @property
+    def display_name(self) -> str:
+        """Return the name the file was uploaded with."""
+        return self.original_name or self.file.name.rsplit("/", 1)[-1]
 
     def file_size(self) -> str:
         """Return the file size in a human-readable format."""
-        size = self.file.size
+        # Stored blobs record their size; only legacy uploads need a stat
+        size = self.blob.size if self.blob_id else self.file.size
         if size < 1024:
             return f"{size} bytes"
         elif size < 1024 * 1024:
@@ -442,6 +674,94 @@ def file_size(self) -> str:
             return f"{size / (1024 * 1024):.1f} MB"
 
 
+@receiver(post_delete, sender=ObligationEvidence)
+def release_evidence_blob(sender, instance, **kwargs):
+    """Drop the deleted evidence's reference to its stored blob."""
+    if instance.blob_id:
+        from .evidence_store import release_blob
+
+        release_blob(instance.blob_id)
+
+
+class ObligationOccurrence(models.Model):
+    """
+    A materialized due date of an obligation, including future recurrences.
+
+    Rows are maintained by ``obligations.occurrences`` whenever an obligation's
+    dates or recurrence settings change, so due-date range queries can scan
+    this table instead of expanding recurrences per request.
+    """
+
+    obligation: Any = models.ForeignKey(
+        Obligation, on_delete=models.CASCADE, related_name="occurrences"
+    )
+    project: Any = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="obligation_occurrences"
+    )
+    due_date: Any = models.DateField()
+    sequence: Any = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="0 for the action due date, 1..N for forecasted recurrences",
+    )
+
+    class Meta:
+        ordering = ["due_date", "obligation"]
+        verbose_name = "Obligation Occurrence"
+        verbose_name_plural = "Obligation Occurrences"
+        indexes = [
+            models.Index(fields=["project", "due_date"]),
+            models.Index(fields=["due_date"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["obligation", "due_date"], name="unique_obligation_occurrence"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.obligation_id} due {self.due_date}"
+
+
+class ComplianceSnapshot(models.Model):
+    """
+    Daily rollup of obligation statuses for one project and mechanism.
+
+    Written nightly by ``obligations.snapshots.take_snapshot`` so trends and
+    history charts read a few rows per day instead of reconstructing past
+    states from the obligations themselves.
+    """
+
+    project: Any = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="compliance_snapshots"
+    )
+    mechanism: Any = models.ForeignKey(
+        "mechanisms.EnvironmentalMechanism",
+        on_delete=models.SET_NULL,
+        related_name="compliance_snapshots",
+        null=True,
+        blank=True,
+    )
+    date: Any = models.DateField()
+    not_started: Any = models.PositiveIntegerField(default=0)
+    in_progress: Any = models.PositiveIntegerField(default=0)
+    completed: Any = models.PositiveIntegerField(default=0)
+    overdue: Any = models.PositiveIntegerField(default=0)
+    total: Any = models.PositiveIntegerField(default=0)
+    completion_percentage: Any = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ["date", "project", "mechanism"]
+        verbose_name = "Compliance Snapshot"
+        verbose_name_plural = "Compliance Snapshots"
+        indexes = [
+            models.Index(fields=["project", "date"], name="snapshot_project_date_idx"),
+            models.Index(fields=["date"], name="snapshot_date_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.project_id}/{self.mechanism_id} on {self.date}"
+
+
 @receiver(pre_save, sender="obligations.Obligation")
 def update_forecasted_date_on_change(sender, instance, **kwargs):
     """Signal handler to update forecasted date when relevant fields change."""
@@ -449,34 +769,35 @@ def update_forecasted_date_on_change(sender, instance, **kwargs):
     if not instance.pk:
         # For new instances, just make sure the date is calculated
         instance.update_recurring_forecasted_date()
+        instance._occurrences_stale = True
         return
 
-    try:
-        # Get the existing record to compare changes
-        old_instance = sender.objects.get(pk=instance.pk)
-
-        # Check if relevant fields changed
-        if (
-            instance.recurring_obligation != old_instance.recurring_obligation
-            or instance.recurring_frequency != old_instance.recurring_frequency
-            or instance.status != old_instance.status
-            or instance.action_due_date != old_instance.action_due_date
-        ):
-            instance.update_recurring_forecasted_date()
-
-        # If status changed to completed, handle recurring logic
-        if (
-            instance.status == STATUS_COMPLETED
-            and old_instance.status != STATUS_COMPLETED
-            and instance.recurring_obligation
-        ):
-            # When a recurring obligation is completed, reset status and calculate next date
-            instance.status = STATUS_NOT_STARTED
-            instance.update_recurring_forecasted_date()
-
-    except sender.DoesNotExist:
-        # This shouldn't happen but just in case
-        pass
+    if instance._state.adding:
+        # New record saved with an explicit obligation number
+        instance._occurrences_stale = True
+        return
+
+    # Compare against the values loaded with the instance, not a fresh SELECT
+    changed = instance.changed_fields()
+
+    # Check if relevant fields changed
+    if changed.keys() & set(FORECAST_TRIGGER_FIELDS):
+        instance.update_recurring_forecasted_date()
+
+    # If status changed to completed, handle recurring logic
+    if (
+        instance.status == STATUS_COMPLETED
+        and "status" in changed
+        and instance.recurring_obligation
+    ):
+        # When a recurring obligation is completed, reset status and calculate next date
+        instance.status = STATUS_NOT_STARTED
+        instance.update_recurring_forecasted_date()
+
+    # Flag the materialized occurrences for refresh after the save
+    instance._occurrences_stale = bool(
+        instance.changed_fields().keys() & set(OCCURRENCE_FIELDS)
+    )
 
 
 @receiver(pre_save, sender="obligations.Obligation")
@@ -489,3 +810,23 @@ def ensure_obligation_number(sender, instance, **kwargs):
         not instance.obligation_number or instance.obligation_number.strip() == ""
     ):
         instance.obligation_number = Obligation.get_next_obligation_number()
+
+
+@receiver(post_save, sender="obligations.Obligation")
+def refresh_occurrences_on_save(sender, instance, created, **kwargs):
+    """Re-materialize occurrences when an obligation's schedule changed."""
+    if _row_handlers_suspended.get():
+        return
+    if created or getattr(instance, "_occurrences_stale", True):
+        from .occurrences import refresh_occurrences
+
+        refresh_occurrences([instance.pk])
+    instance._occurrences_stale = False
+
+
+@receiver(post_save, sender="obligations.Obligation")
+@receiver(post_delete, sender="obligations.Obligation")
+def bump_data_version_on_change(sender, instance, **kwargs):
+    """Invalidate cached counts and other data derived from obligations."""
+    if not _row_handlers_suspended.get():
+        bump_data_version()
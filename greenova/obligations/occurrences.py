@@ -0,0 +1,135 @@
+"""
+Materialized due-date calendar for obligations.
+
+Each obligation's action due date and its next ``OCCURRENCE_COUNT``
+recurrences are stored as ``ObligationOccurrence`` rows indexed on
+``(project, due_date)``. Questions such as "what is due in the next 90 days"
+then become a range scan instead of expanding recurrences per request. Rows
+are refreshed incrementally from the obligation ``post_save`` hook and by the
+bulk forecasting engine.
+"""
+
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+
+import numpy as np
+from django.db import transaction
+
+from .constants import OCCURRENCE_COUNT, STATUS_COMPLETED
+from .forecasting import advance_dates, frequency_step
+from .models import Obligation, ObligationOccurrence
+
+logger = logging.getLogger(__name__)
+
+# Obligations per DELETE/SELECT, kept below SQLite's bound parameter limit.
+REFRESH_CHUNK_SIZE = 500
+
+OCCURRENCE_SOURCE_FIELDS = (
+    "obligation_number",
+    "project_id",
+    "status",
+    "action_due_date",
+    "recurring_obligation",
+    "recurring_frequency",
+    "recurring_forcasted_date",
+)
+
+
+def expand_occurrences(
+    rows: Iterable[tuple], count: int = OCCURRENCE_COUNT
+) -> list[ObligationOccurrence]:
+    """
+    Build occurrence rows for a batch of obligations.
+
+    Args:
+        rows: Tuples of the values named in ``OCCURRENCE_SOURCE_FIELDS``
+        count: Number of recurrences to materialize per recurring obligation
+
+    Returns:
+        list: Unsaved ObligationOccurrence instances
+    """
+    occurrences: dict[tuple[str, date], ObligationOccurrence] = {}
+    steps: dict[str, tuple[str, int]] = {}
+    series: dict[tuple[str, int, int], list[tuple[str, int, date]]] = defaultdict(list)
+
+    for number, project_id, status, due, recurring, frequency, forecasted in rows:
+        if due and status != STATUS_COMPLETED:
+            occurrences[number, due] = ObligationOccurrence(
+                obligation_id=number, project_id=project_id, due_date=due, sequence=0
+            )
+        if recurring and frequency and (forecasted or due):
+            if frequency not in steps:
+                steps[frequency] = frequency_step(frequency)
+            # Without a forecast the first recurrence is one step after the due date
+            offset = 0 if forecasted else 1
+            series[(*steps[frequency], offset)].append(
+                (number, project_id, forecasted or due)
+            )
+
+    # Expand each group with one vectorized step per recurrence, always measured
+    # from the start date so month-end clamping cannot drift.
+    for (unit, amount, offset), members in series.items():
+        start = np.array([member[2] for member in members], dtype="datetime64[D]")
+        for sequence in range(1, count + 1):
+            dates = advance_dates(start, unit, (sequence - 1 + offset) * amount)
+            for (number, project_id, _), due_date in zip(members, dates.astype(object)):
+                occurrences.setdefault(
+                    (number, due_date),
+                    ObligationOccurrence(
+                        obligation_id=number,
+                        project_id=project_id,
+                        due_date=due_date,
+                        sequence=sequence,
+                    ),
+                )
+
+    return list(occurrences.values())
+
+
+def refresh_occurrences(obligation_numbers: Iterable[str]) -> int:
+    """
+    Replace the materialized occurrences of the given obligations.
+
+    Args:
+        obligation_numbers: Primary keys of the obligations to refresh
+
+    Returns:
+        int: Number of occurrence rows written
+    """
+    numbers = list(obligation_numbers)
+    written = 0
+    with transaction.atomic():
+        for start in range(0, len(numbers), REFRESH_CHUNK_SIZE):
+            chunk = numbers[start : start + REFRESH_CHUNK_SIZE]
+            ObligationOccurrence.objects.filter(obligation_id__in=chunk).delete()
+            rows = Obligation.objects.filter(pk__in=chunk).values_list(
+                *OCCURRENCE_SOURCE_FIELDS
+            )
+            occurrences = expand_occurrences(rows)
+            ObligationOccurrence.objects.bulk_create(occurrences, batch_size=1000)
+            written += len(occurrences)
+    return written
+
+
+def rebuild_all_occurrences(batch_size: int = 2000) -> int:
+    """
+    Rebuild the occurrence table for every obligation.
+
+    Args:
+        batch_size: Number of obligations expanded per bulk insert
+
+    Returns:
+        int: Number of occurrence rows written
+    """
+    rows = list(Obligation.objects.order_by().values_list(*OCCURRENCE_SOURCE_FIELDS))
+    written = 0
+    with transaction.atomic():
+        ObligationOccurrence.objects.all().delete()
+        for start in range(0, len(rows), batch_size):
+            occurrences = expand_occurrences(rows[start : start + batch_size])
+            ObligationOccurrence.objects.bulk_create(occurrences, batch_size=1000)
+            written += len(occurrences)
+    logger.info("Rebuilt %s obligation occurrences", written)
+    return written
@@ -0,0 +1,263 @@
+"""
+Keyset pagination and cached counts for obligation lists.
+
+``Paginator`` pages with ``OFFSET`` and a ``COUNT(*)`` per request, both of
+which get slower the deeper a user scrolls. ``KeysetPaginator`` instead seeks
+past the last row of the previous page using the sort column plus the primary
+key as a tiebreaker, so every page costs the same index range scan. Totals
+are served by ``cached_count``, keyed on the obligation data version so any
+change to obligations invalidates them. ``EstimatedCountPaginator`` goes one
+step further for unfiltered admin lists and reads the table size from the
+database statistics instead of counting rows.
+"""
+
+import base64
+import hashlib
+import json
+from collections.abc import Iterator
+from typing import Any
+
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connections
+from django.db.models import F, Model, Q, QuerySet
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .utils import get_data_version
+
+COUNT_CACHE_TIMEOUT = 300
+
+# Counts are shared by every worker process, like the data version they are
+# keyed on
+COUNT_CACHE = "shared"
+
+# Below this many rows an exact count is cheap enough to run
+ESTIMATE_THRESHOLD = 10000
+
+
+def cached_count(queryset: QuerySet, *key_parts: Any) -> int:
+    """
+    Count a queryset, caching the result until obligation data changes.
+
+    Args:
+        queryset: The filtered queryset to count
+        key_parts: Values identifying the filters applied to the queryset
+
+    Returns:
+        int: The number of rows
+    """
+    digest = hashlib.md5(
+        json.dumps(
+            [timezone.now().date(), *key_parts], cls=DjangoJSONEncoder, sort_keys=True
+        ).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    key = f"obligations:count:{get_data_version()}:{digest}"
+    cache = caches[COUNT_CACHE]
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, COUNT_CACHE_TIMEOUT)
+    return count
+
+
+class CachedCountPaginator(Paginator):
+    """Page-number paginator whose total comes from ``cached_count``."""
+
+    def __init__(self, object_list, per_page, count_key, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self) -> int:
+        return cached_count(self.object_list, *self.count_key)
+
+
+def estimated_row_count(model: type[Model], using: str = "default") -> int | None:
+    """
+    Read the approximate row count of a model's table from planner statistics.
+
+    Args:
+        model: Model whose table is estimated
+        using: Database alias to query
+
+    Returns:
+        int | None: The estimate, or None if the backend has no statistics yet
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    queries = {
+        "postgresql": (
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(table)],
+        ),
+        "mysql": (
+            "SELECT table_rows FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = %s",
+            [table],
+        ),
+        # Populated by ANALYZE; the first number of each row is the table size
+        "sqlite": ("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table]),
+    }
+    if connection.vendor not in queries:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(*queries[connection.vendor])
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if not row or row[0] is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    # PostgreSQL reports -1 for tables that have never been analyzed
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for large admin changelists.
+
+    An unfiltered list of a large table takes its total from the planner
+    statistics. Filtered lists are counted exactly, with the result cached by
+    ``cached_count`` until obligation data changes.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return super().count
+        if not queryset.query.has_filters():
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= ESTIMATE_THRESHOLD:
+                return estimate
+        try:
+            sql, params = queryset.order_by().query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        return cached_count(queryset, queryset.model._meta.label, sql, params)
+
+
+class KeysetPage:
+    """One page of a keyset paginated queryset."""
+
+    def __init__(self, object_list: list, next_cursor: str | None, cursor: str | None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.cursor = cursor
+
+    def __iter__(self) -> Iterator:
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Seek-based paginator ordered by a sort field and the primary key.
+
+    Null sort values are always ordered last, so the seek condition is well
+    defined whichever way the list is sorted.
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        sort_field: str,
+        descending: bool = False,
+        per_page: int = 15,
+    ):
+        self.model = queryset.model
+        self.pk_name = self.model._meta.pk.name
+        self.sort_field = self._validate_sort_field(sort_field)
+        self.descending = descending
+        self.per_page = per_page
+        self.queryset = queryset.order_by(*self._ordering())
+
+    def _validate_sort_field(self, sort_field: str) -> str:
+        """Fall back to the primary key for unknown or relational fields."""
+        try:
+            field = self.model._meta.get_field(sort_field)
+        except FieldDoesNotExist:
+            return self.pk_name
+        if field.is_relation or not field.concrete:
+            return self.pk_name
+        return sort_field
+
+    def _ordering(self) -> list:
+        fields = [self.sort_field]
+        if self.sort_field != self.pk_name:
+            fields.append(self.pk_name)
+        if self.descending:
+            return [F(field).desc(nulls_last=True) for field in fields]
+        return [F(field).asc(nulls_last=True) for field in fields]
+
+    def encode_cursor(self, obj: Any) -> str:
+        """Encode the position just after an object or ``values()`` row."""
+        if isinstance(obj, dict):
+            position = [obj[self.sort_field], obj[self.pk_name]]
+        else:
+            position = [getattr(obj, self.sort_field), obj.pk]
+        payload = json.dumps(position, cls=DjangoJSONEncoder).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    def decode_cursor(self, cursor: str) -> tuple[Any, Any] | None:
+        """Decode a cursor, returning None if it is malformed."""
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            field = self.model._meta.get_field(self.sort_field)
+            return field.to_python(value), pk
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+    def _seek(self, value: Any, pk: Any) -> Q:
+        """Build the condition selecting rows after the cursor position."""
+        after = "lt" if self.descending else "gt"
+        if self.sort_field == self.pk_name:
+            return Q(**{f"{self.pk_name}__{after}": pk})
+        if value is None:
+            # Nulls sort last, so only later nulls remain
+            return Q(**{f"{self.sort_field}__isnull": True}) & Q(
+                **{f"{self.pk_name}__{after}": pk}
+            )
+        return (
+            Q(**{f"{self.sort_field}__{after}": value})
+            | Q(**{self.sort_field: value, f"{self.pk_name}__{after}": pk})
+            | Q(**{f"{self.sort_field}__isnull": True})
+        )
+
+    def get_page(self, cursor: str | None = None) -> KeysetPage:
+        """
+        Return the page that starts after the given cursor.
+
+        Args:
+            cursor: Cursor from a previous page, or None for the first page
+
+        Returns:
+            KeysetPage: The rows plus the cursor of the following page
+        """
+        queryset = self.queryset
+        position = self.decode_cursor(cursor) if cursor else None
+        if position is not None:
+            queryset = queryset.filter(self._seek(*position))
+
+        rows = list(queryset[: self.per_page + 1])
+        next_cursor = None
+        if len(rows) > self.per_page:
+            rows = rows[: self.per_page]
+            next_cursor = self.encode_cursor(rows[-1])
+        return KeysetPage(rows, next_cursor, cursor if position else None)
@@ -0,0 +1,109 @@
+"""
+Lightweight obligation rows for list and table views.
+
+Obligation rows carry a dozen large text columns (the obligation text,
+supporting information and every comment field) that list templates never
+display. ``obligation_rows`` selects only the displayed columns, truncating the
+obligation text in the database, and ``ObligationRow`` holds each result in a
+``__slots__`` object instead of a full model instance.
+"""
+
+from collections.abc import Iterable
+from datetime import date
+from typing import Any
+
+from django.db.models import F, QuerySet
+from django.db.models.functions import Left
+from django.utils import timezone
+
+from .constants import STATUS_CHOICES, STATUS_COMPLETED
+
+# Characters of obligation text fetched for list previews
+PREVIEW_LENGTH = 80
+
+ROW_FIELDS = (
+    "obligation_number",
+    "action_due_date",
+    "status",
+    "project_phase",
+    "recurring_obligation",
+    "responsibility",
+)
+
+_STATUS_LABELS = dict(STATUS_CHOICES)
+
+
+class ObligationRow:
+    """The columns of an obligation shown in list views."""
+
+    __slots__ = (*ROW_FIELDS, "obligation", "mechanism_name")
+
+    def __init__(self, values: dict[str, Any]) -> None:
+        for name in ROW_FIELDS:
+            setattr(self, name, values.get(name))
+        self.obligation = values.get("obligation_preview")
+        self.mechanism_name = values.get("mechanism_name")
+
+    @property
+    def pk(self) -> str:
+        return self.obligation_number
+
+    @property
+    def is_overdue(self) -> bool:
+        """Check if obligation is overdue, as ``Obligation.is_overdue``."""
+        if self.status != STATUS_COMPLETED and self.action_due_date:
+            return self.action_due_date < timezone.now().date()
+        return False
+
+    def get_status_display(self) -> str:
+        return _STATUS_LABELS.get(self.status, self.status)
+
+    def __repr__(self) -> str:
+        return f"<ObligationRow {self.obligation_number}>"
+
+
+def obligation_rows(queryset: QuerySet, *extra_fields: str) -> QuerySet:
+    """
+    Project an obligation queryset onto the columns used by list views.
+
+    Args:
+        queryset: Filtered obligation queryset
+        extra_fields: Additional columns to select, e.g. a sort key
+
+    Returns:
+        QuerySet: A ``values()`` queryset to pass to ``to_rows``
+    """
+    fields = dict.fromkeys((*ROW_FIELDS, *extra_fields))
+    return queryset.annotate(
+        obligation_preview=Left("obligation", PREVIEW_LENGTH),
+        mechanism_name=F("primary_environmental_mechanism__name"),
+    ).values(*fields, "obligation_preview", "mechanism_name")
+
+
+def to_rows(values: Iterable[dict[str, Any]]) -> list[ObligationRow]:
+    """Wrap ``obligation_rows`` results in ``ObligationRow`` objects."""
+    return [ObligationRow(row) for row in values]
+
+
+def count_by_status(
+    queryset: QuerySet, reference_date: date | None = None
+) -> dict[str, int]:
+    """
+    Count obligations per status plus overdue, reading only two columns.
+
+    Args:
+        queryset: Obligations to count
+        reference_date: Date used to decide overdue (defaults to today)
+
+    Returns:
+        dict: Counts keyed by status value and ``"overdue"``
+    """
+    reference_date = reference_date or timezone.now().date()
+    counts = {"overdue": 0}
+    # Without ordering the two columns are read from a covering index
+    rows = queryset.order_by().values_list("status", "action_due_date")
+    for status, due_date in rows:
+        counts[status] = counts.get(status, 0) + 1
+        if status != STATUS_COMPLETED and due_date and due_date < reference_date:
+            counts["overdue"] += 1
+    return counts
@@ -0,0 +1,2 @@
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: 	AGPL-3.0-or-later
@@ -0,0 +1,45 @@
+# pylint: skip-file
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: obligations.proto
+# Protobuf Python Version: 6.30.2
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    30,
+    2,
+    '',
+    'obligations.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11obligations.proto\x12\x0bobligations\"\x8d\x02\n\x0eRegisterRecord\x12-\n\x06header\x18\x01 \x01(\x0b\x32\x1b.obligations.RegisterHeaderH\x00\x12,\n\x07project\x18\x02 \x01(\x0b\x32\x19.obligations.ProjectProtoH\x00\x12\x30\n\tmechanism\x18\x03 \x01(\x0b\x32\x1b.obligations.MechanismProtoH\x00\x12\x32\n\nobligation\x18\x04 \x01(\x0b\x32\x1c.obligations.ObligationProtoH\x00\x12.\n\x08\x65vidence\x18\x05 \x01(\x0b\x32\x1a.obligations.EvidenceProtoH\x00\x42\x08\n\x06record\"=\n\x0eRegisterHeader\x12\x16\n\x0e\x66ormat_version\x18\x01 \x01(\x05\x12\x13\n\x0b\x65xported_at\x18\x02 \x01(\x03\"1\n\x0cProjectProto\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\"\xbe\x02\n\x0eMechanismProto\x12\n\n\x02id\x18\x01 \x01(\x03\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x18\n\x0b\x64\x65scription\x18\x03 \x01(\tH\x00\x88\x01\x01\x12\x15\n\x08\x63\x61tegory\x18\x04 \x01(\tH\x01\x88\x01\x01\x12\x1d\n\x10reference_number\x18\x05 \x01(\tH\x02\x88\x01\x01\x12\x1b\n\x0e\x65\x66\x66\x65\x63tive_date\x18\x06 \x01(\x05H\x03\x88\x01\x01\x12\x0e\n\x06status\x18\x07 \x01(\t\x12,\n\x1fprimary_environmental_mechanism\x18\x08 \x01(\tH\x04\x88\x01\x01\x42\x0e\n\x0c_descriptionB\x0b\n\t_categoryB\x13\n\x11_reference_numberB\x11\n\x0f_effective_dateB\"\n _primary_environmental_mechanism\"\x84\n\n\x0fObligationProto\x12\x19\n\x11obligation_number\x18\x01 \x01(\t\x12/\n\"primary_environmental_mechanism_id\x18\x02 \x01(\x03H\x00\x88\x01\x01\x12\x11\n\tprocedure\x18\x03 \x01(\t\x12\x1c\n\x14\x65nvironmental_aspect\x18\x04 \x01(\t\x12(\n\x1b\x63ustom_environmental_aspect\x18\x05 \x01(\tH\x01\x88\x01\x01\x12\x12\n\nobligation\x18\x06 \x01(\t\x12\x16\n\x0e\x61\x63\x63ountability\x18\x07 \x01(\t\x12\x16\n\x0eresponsibility\x18\x08 \x01(\t\x12\x1a\n\rproject_phase\x18\t \x01(\tH\x02\x88\x01\x01\x12\x1c\n\x0f\x61\x63tion_due_date\x18\n \x01(\x05H\x03\x88\x01\x01\x12\x1b\n\x0e\x63lose_out_date\x18\x0b \x01(\x05H\x04\x88\x01\x01\x12\x0e\n\x06status\x18\x0c \x01(\t\x12#\n\x16supporting_information\x18\r \x01(\tH\x05\x88\x01\x01\x12\x1d\n\x10general_comments\x18\x0e \x01(\tH\x06\x88\x01\x01\x12 \n\x13\x63ompliance_comments\x18\x0f \x01(\tH\x07\x88\x01\x01\x12%\n\x18non_conformance_comments\x18\x10 \x01(\tH\x08\x88\x01\x01\x12\x1b\n\x0e\x65vidence_notes\x18\x11 \x01(\tH\t\x88\x01\x01\x12\x1c\n\x14recurring_obligation\x18\x12 \x01(\x08\x12 \n\x13recurring_frequency\x18\x13 \x01(\tH\n\x88\x01\x01\x12\x1d\n\x10recurring_status\x18\x14 \x01(\tH\x0b\x88\x01\x01\x12%\n\x18recurring_forcasted_date\x18\x15 \x01(\x05H\x0c\x88\x01\x01\x12\x12\n\ninspection\x18\x16 \x01(\x08\x12!\n\x14inspection_frequency\x18\x17 \x01(\tH\r\x88\x01\x01\x12\x1c\n\x0fsite_or_desktop\x18\x18 \x01(\tH\x0e\x88\x01\x01\x12#\n\x1bnew_control_action_required\x18\x19 \x01(\x08\x12\x1c\n\x0fobligation_type\x18\x1a \x01(\tH\x0f\x88\x01\x01\x12\x14\n\x0cgap_analysis\x18\x1b \x01(\x08\x12#\n\x16notes_for_gap_analysis\x18\x1c \x01(\tH\x10\x88\x01\x01\x42%\n#_primary_environmental_mechanism_idB\x1e\n\x1c_custom_environmental_aspectB\x10\n\x0e_project_phaseB\x12\n\x10_action_due_dateB\x11\n\x0f_close_out_dateB\x19\n\x17_supporting_informationB\x13\n\x11_general_commentsB\x16\n\x14_compliance_commentsB\x1b\n\x19_non_conformance_commentsB\x11\n\x0f_evidence_notesB\x16\n\x14_recurring_frequencyB\x13\n\x11_recurring_statusB\x1b\n\x19_recurring_forcasted_dateB\x17\n\x15_inspection_frequencyB\x12\n\x10_site_or_desktopB\x12\n\x10_obligation_typeB\x19\n\x17_notes_for_gap_analysis\"\x95\x01\n\rEvidenceProto\x12\x15\n\robligation_id\x18\x01 \x01(\t\x12\x0c\n\x04\x66ile\x18\x02 \x01(\t\x12\x15\n\roriginal_name\x18\x03 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t\x12\x13\n\x0buploaded_at\x18\x05 \x01(\x03\x12\x13\n\x06sha256\x18\x06 \x01(\tH\x00\x88\x01\x01\x42\t\n\x07_sha256b\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'obligations_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+    DESCRIPTOR._loaded_options = None
+    _globals['_REGISTERRECORD']._serialized_start = 35
+    _globals['_REGISTERRECORD']._serialized_end = 304
+    _globals['_REGISTERHEADER']._serialized_start = 306
+    _globals['_REGISTERHEADER']._serialized_end = 367
+    _globals['_PROJECTPROTO']._serialized_start = 369
+    _globals['_PROJECTPROTO']._serialized_end = 418
+    _globals['_MECHANISMPROTO']._serialized_start = 421
+    _globals['_MECHANISMPROTO']._serialized_end = 739
+    _globals['_OBLIGATIONPROTO']._serialized_start = 742
+    _globals['_OBLIGATIONPROTO']._serialized_end = 2026
+    _globals['_EVIDENCEPROTO']._serialized_start = 2029
+    _globals['_EVIDENCEPROTO']._serialized_end = 2178
+# @@protoc_insertion_point(module_scope)
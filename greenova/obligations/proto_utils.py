@@ -0,0 +1,507 @@
+"""
+Protocol buffer export and import of obligation registers.
+
+A register is a stream of ``RegisterRecord`` messages from
+``proto/obligations.proto``, each preceded by its length as a varint. The
+stream starts with a header. Each project record is followed by the project's
+mechanisms, obligations and evidence metadata. Dates are sent as day numbers
+and empty columns are left out, and the stream is usually gzip compressed,
+so it is much smaller than the CSV ``import_obligations`` reads.
+
+Both sides hold a bounded amount of data. ``stream_register`` reads rows with
+``QuerySet.iterator`` and yields encoded chunks. ``import_register`` reads
+one record at a time and writes obligations and evidence with batched
+``bulk_create``. Derived data is refreshed per batch (occurrences) or once at
+the end (mechanism counts and the data version), as in ``obligations.bulk``.
+
+Evidence files are not part of the stream. Imported evidence is linked to the
+stored blob with the same SHA-256 when the target has one. Otherwise it keeps
+its file name, for files copied separately, and ``adopt_legacy_evidence``
+moves those files into the blob store later.
+"""
+
+import gzip
+import logging
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import IO, Any
+
+from core.proto_utils import encode_varint, read_varint
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+from google.protobuf.message import DecodeError
+from mechanisms.models import EnvironmentalMechanism
+from projects.models import Project
+
+from .exporting import DEFAULT_CHUNK_SIZE, FLUSH_SIZE
+from .models import (
+    EvidenceBlob,
+    Obligation,
+    ObligationEvidence,
+    obligations_bulk_changed,
+)
+from .occurrences import refresh_occurrences
+from .proto import obligations_pb2
+from .utils import bump_data_version
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# Obligations or evidence rows written per bulk insert
+DEFAULT_BATCH_SIZE = 1000
+
+# Larger records are treated as corrupt rather than read into memory
+MAX_RECORD_SIZE = 16 * 1024 * 1024
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+EPOCH = date(1970, 1, 1)
+
+# Message fields sent as days since EPOCH and as Unix timestamps
+DATE_FIELDS = frozenset(
+    {"effective_date", "action_due_date", "close_out_date", "recurring_forcasted_date"}
+)
+DATETIME_FIELDS = frozenset({"exported_at", "uploaded_at"})
+
+MECHANISM_FIELDS = tuple(obligations_pb2.MechanismProto.DESCRIPTOR.fields_by_name)
+OBLIGATION_FIELDS = tuple(obligations_pb2.ObligationProto.DESCRIPTOR.fields_by_name)
+EVIDENCE_FIELDS = (
+    "obligation_id",
+    "file",
+    "original_name",
+    "description",
+    "uploaded_at",
+    "blob__sha256",
+)
+
+# Columns replaced when an existing obligation is imported with update=True
+OBLIGATION_UPDATE_FIELDS = (
+    *(name for name in OBLIGATION_FIELDS if name != "obligation_number"),
+    "project",
+    "updated_at",
+)
+
+
+class RegisterFormatError(ValueError):
+    """Raised when a register stream is truncated or out of order."""
+
+
+@dataclass
+class ImportResult:
+    """Rows written by one register import."""
+
+    projects: int = 0
+    mechanisms: int = 0
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    conflicts: int = 0
+    evidence: int = 0
+
+
+def encode_delimited(record: obligations_pb2.RegisterRecord) -> bytes:
+    """Serialize a record preceded by its length."""
+    data = record.SerializeToString()
+    return encode_varint(len(data)) + data
+
+
+def read_delimited(stream: IO[bytes]) -> Iterator[obligations_pb2.RegisterRecord]:
+    """
+    Read length-delimited records one at a time.
+
+    Args:
+        stream: Binary file object positioned at the start of a record
+
+    Yields:
+        RegisterRecord: Each record in the stream
+    """
+    while True:
+        try:
+            length = read_varint(stream)
+        except ValueError as exc:
+            raise RegisterFormatError(str(exc)) from exc
+        if length is None:
+            return
+        if length > MAX_RECORD_SIZE:
+            raise RegisterFormatError(f"Record of {length} bytes exceeds the limit")
+        data = stream.read(length)
+        if len(data) != length:
+            raise RegisterFormatError("Register ends inside a record")
+        record = obligations_pb2.RegisterRecord()
+        try:
+            record.ParseFromString(data)
+        except DecodeError as exc:
+            raise RegisterFormatError(f"Invalid record: {exc}") from exc
+        yield record
+
+
+def open_register(path: str) -> IO[bytes]:
+    """Open a register file for reading, decompressing gzip files."""
+    with open(path, "rb") as handle:
+        compressed = handle.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+    return gzip.open(path, "rb") if compressed else open(path, "rb")
+
+
+def _record(kind: str, values: dict[str, Any]) -> obligations_pb2.RegisterRecord:
+    """Build a record of one kind from model values; None leaves a field unset."""
+    record = obligations_pb2.RegisterRecord()
+    message = getattr(record, kind)
+    message.SetInParent()
+    for name in message.DESCRIPTOR.fields_by_name:
+        value = values.get(name)
+        if value is None:
+            continue
+        if name in DATETIME_FIELDS:
+            value = int(value.timestamp())
+        elif name in DATE_FIELDS:
+            value = (value - EPOCH).days
+        setattr(message, name, value)
+    return record
+
+
+def _values(message: Any) -> dict[str, Any]:
+    """Convert a message back to model values; unset optional fields are None."""
+    values = {}
+    for field in message.DESCRIPTOR.fields:
+        if field.has_presence and not message.HasField(field.name):
+            values[field.name] = None
+            continue
+        value = getattr(message, field.name)
+        if field.name in DATETIME_FIELDS:
+            value = datetime.fromtimestamp(value, tz=dt_timezone.utc)
+        elif field.name in DATE_FIELDS:
+            value = EPOCH + timedelta(days=value)
+        values[field.name] = value
+    return values
+
+
+def register_records(
+    projects: QuerySet, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[obligations_pb2.RegisterRecord]:
+    """
+    Yield the records of a register export without loading it into memory.
+
+    Args:
+        projects: Projects to export with their mechanisms and obligations
+        chunk_size: Rows fetched per database round trip
+
+    Yields:
+        RegisterRecord: The header, then each project's records
+    """
+    yield _record(
+        "header", {"format_version": FORMAT_VERSION, "exported_at": timezone.now()}
+    )
+    for project in projects.order_by("pk").iterator(chunk_size=chunk_size):
+        yield _record(
+            "project", {"name": project.name, "description": project.description}
+        )
+        mechanisms = (
+            EnvironmentalMechanism.objects.filter(project=project)
+            .order_by("pk")
+            .values(*MECHANISM_FIELDS)
+        )
+        for values in mechanisms.iterator(chunk_size=chunk_size):
+            yield _record("mechanism", values)
+
+        obligations = (
+            Obligation.objects.filter(project=project)
+            .order_by("obligation_number")
+            .values(*OBLIGATION_FIELDS)
+        )
+        for values in obligations.iterator(chunk_size=chunk_size):
+            yield _record("obligation", values)
+
+        evidence = (
+            ObligationEvidence.objects.filter(obligation__project=project)
+            .order_by("pk")
+            .values(*EVIDENCE_FIELDS)
+        )
+        for values in evidence.iterator(chunk_size=chunk_size):
+            values["sha256"] = values.pop("blob__sha256")
+            yield _record("evidence", values)
+
+
+def stream_register(
+    projects: QuerySet, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Encode a register export in bounded chunks.
+
+    Args:
+        projects: Projects to export
+        chunk_size: Rows fetched per database round trip
+
+    Yields:
+        bytes: Length-delimited records, about ``FLUSH_SIZE`` bytes at a time
+    """
+    buffer = bytearray()
+    for record in register_records(projects, chunk_size):
+        buffer += encode_delimited(record)
+        if len(buffer) >= FLUSH_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    yield bytes(buffer)
+
+
+class RegisterImporter:
+    """Write the records of one register stream in batches."""
+
+    def __init__(
+        self,
+        project_name: str | None = None,
+        update: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        self.project_name = project_name
+        self.update = update
+        self.batch_size = batch_size
+        self.result = ImportResult()
+        self.project: Project | None = None
+        self.started = False
+        # Exported mechanism IDs mapped to the IDs in this database
+        self.mechanism_ids: dict[int, int] = {}
+        self.touched_mechanisms: set[int] = set()
+        self.obligations: list[Obligation] = []
+        # Numbers of the current project's obligations written by this import
+        self.written: set[str] = set()
+        self.evidence: list[tuple[ObligationEvidence, datetime, str | None]] = []
+
+    def feed(self, record: obligations_pb2.RegisterRecord) -> None:
+        """Handle one record, writing a batch when it is full."""
+        kind = record.WhichOneof("record")
+        if kind == "header":
+            if self.started:
+                raise RegisterFormatError("Unexpected second header")
+            if record.header.format_version > FORMAT_VERSION:
+                raise RegisterFormatError(
+                    f"Unsupported register format {record.header.format_version}"
+                )
+            self.started = True
+            return
+        if not self.started:
+            raise RegisterFormatError("Register does not start with a header")
+        if kind == "project":
+            self.flush()
+            self._start_project(record.project)
+            return
+        if self.project is None:
+            raise RegisterFormatError(f"{kind} record before the first project")
+
+        if kind == "mechanism":
+            self._add_mechanism(record.mechanism)
+        elif kind == "obligation":
+            self._add_obligation(record.obligation)
+        elif kind == "evidence":
+            # Evidence rows reference obligations of earlier batches
+            self._flush_obligations()
+            values = _values(record.evidence)
+            uploaded_at = values.pop("uploaded_at")
+            sha256 = values.pop("sha256")
+            self.evidence.append((ObligationEvidence(**values), uploaded_at, sha256))
+            if len(self.evidence) >= self.batch_size:
+                self._flush_evidence()
+
+    def flush(self) -> None:
+        """Write the pending batches."""
+        self._flush_obligations()
+        self._flush_evidence()
+
+    def finish(self) -> ImportResult:
+        """Write the pending batches and refresh the derived data once."""
+        self.flush()
+        for mechanism in EnvironmentalMechanism.objects.filter(
+            pk__in=self.touched_mechanisms
+        ):
+            mechanism.update_obligation_counts()
+        return self.result
+
+    def _start_project(self, message: obligations_pb2.ProjectProto) -> None:
+        name = self.project_name or message.name
+        self.project = Project.objects.filter(name=name).order_by("pk").first()
+        if self.project is None:
+            self.project = Project.objects.create(
+                name=name, description=message.description
+            )
+            self.result.projects += 1
+        self.mechanism_ids = {}
+        self.written = set()
+
+    def _add_mechanism(self, message: obligations_pb2.MechanismProto) -> None:
+        values = _values(message)
+        exported_id = values.pop("id")
+        mechanism = EnvironmentalMechanism.objects.filter(
+            project=self.project, name=values["name"]
+        ).first()
+        if mechanism is None:
+            mechanism = EnvironmentalMechanism.objects.create(
+                project=self.project, **values
+            )
+            self.result.mechanisms += 1
+        self.mechanism_ids[exported_id] = mechanism.pk
+
+    def _add_obligation(self, message: obligations_pb2.ObligationProto) -> None:
+        values = _values(message)
+        exported_id = values.pop("primary_environmental_mechanism_id")
+        mechanism_id = None
+        if exported_id is not None:
+            try:
+                mechanism_id = self.mechanism_ids[exported_id]
+            except KeyError:
+                raise RegisterFormatError(
+                    f"Obligation {values['obligation_number']} refers to "
+                    f"unknown mechanism {exported_id}"
+                ) from None
+        self.obligations.append(
+            Obligation(
+                project=self.project,
+                primary_environmental_mechanism_id=mechanism_id,
+                **values,
+            )
+        )
+        if len(self.obligations) >= self.batch_size:
+            self._flush_obligations()
+
+    def _flush_obligations(self) -> None:
+        if not self.obligations:
+            return
+        batch, self.obligations = self.obligations, []
+        numbers = [obligation.obligation_number for obligation in batch]
+        existing = {}
+        previous = []
+        conflicts = []
+        rows = Obligation.objects.filter(pk__in=numbers).values_list(
+            "pk",
+            "primary_environmental_mechanism_id",
+            "project_id",
+            "status",
+            "action_due_date",
+        )
+        for number, mechanism_id, project_id, status, due_date in rows:
+            if project_id == self.project.pk:
+                existing[number] = mechanism_id
+                previous.append((project_id, status, due_date))
+            else:
+                conflicts.append(number)
+
+        # Numbers are only unique within one instance, so a number another
+        # project already uses is a different obligation and is left alone
+        if conflicts:
+            logger.warning(
+                "Not importing obligations numbered like those of other projects: %s",
+                ", ".join(sorted(conflicts)),
+            )
+            batch = [o for o in batch if o.obligation_number not in conflicts]
+            numbers = [obligation.obligation_number for obligation in batch]
+            self.result.conflicts += len(conflicts)
+
+        if self.update:
+            Obligation.objects.bulk_create(
+                batch,
+                update_conflicts=True,
+                unique_fields=["obligation_number"],
+                update_fields=OBLIGATION_UPDATE_FIELDS,
+            )
+            # Obligations moved away from a mechanism change its counts too
+            self.touched_mechanisms.update(existing.values())
+            self.result.created += len(batch) - len(existing)
+            self.result.updated += len(existing)
+        else:
+            batch = [o for o in batch if o.obligation_number not in existing]
+            Obligation.objects.bulk_create(batch)
+            numbers = [obligation.obligation_number for obligation in batch]
+            self.result.created += len(batch)
+            self.result.skipped += len(existing)
+            previous = []
+
+        refresh_occurrences(numbers)
+        obligations_bulk_changed.send(
+            sender=Obligation,
+            before=previous,
+            after=[(o.project_id, o.status, o.action_due_date) for o in batch],
+        )
+        self.written.update(numbers)
+        self.touched_mechanisms.update(
+            obligation.primary_environmental_mechanism_id for obligation in batch
+        )
+
+    def _flush_evidence(self) -> None:
+        if not self.evidence:
+            return
+        batch, self.evidence = self.evidence, []
+        # Evidence of skipped obligations would land on an existing obligation
+        # the register does not describe
+        batch = [item for item in batch if item[0].obligation_id in self.written]
+        blobs = EvidenceBlob.objects.in_bulk(
+            {sha256 for _, _, sha256 in batch if sha256}, field_name="sha256"
+        )
+        for evidence, _, sha256 in batch:
+            blob = blobs.get(sha256)
+            if blob is not None:
+                evidence.blob = blob
+                evidence.file = blob.file.name
+
+        # Evidence imported before has the same obligation and file
+        known = set(
+            ObligationEvidence.objects.filter(
+                obligation_id__in={evidence.obligation_id for evidence, _, _ in batch}
+            ).values_list("obligation_id", "file")
+        )
+        batch = [
+            item for item in batch if (item[0].obligation_id, item[0].file) not in known
+        ]
+
+        created = ObligationEvidence.objects.bulk_create(
+            [evidence for evidence, _, _ in batch]
+        )
+        # uploaded_at is set to now on insert; restore the exported times
+        for evidence, uploaded_at, _ in batch:
+            evidence.uploaded_at = uploaded_at
+        ObligationEvidence.objects.bulk_update(created, ["uploaded_at"])
+
+        references = Counter(e.blob_id for e in created if e.blob_id is not None)
+        for blob_id, count in references.items():
+            EvidenceBlob.objects.filter(pk=blob_id).update(
+                ref_count=F("ref_count") + count
+            )
+        self.result.evidence += len(created)
+
+
+def import_register(
+    stream: IO[bytes],
+    project_name: str | None = None,
+    update: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportResult:
+    """
+    Import a register stream written by ``stream_register``.
+
+    The import runs in one transaction, so a truncated or invalid stream
+    leaves the database unchanged. Obligation numbers already used by another
+    project are not imported, and evidence is only attached to the obligations
+    this import writes.
+
+    Args:
+        stream: Binary file object to read from
+        project_name: Import every project into this project instead
+        update: Replace existing obligations instead of skipping them
+        batch_size: Obligations or evidence rows written per bulk insert
+
+    Returns:
+        ImportResult: Counts of the rows written
+    """
+    importer = RegisterImporter(project_name, update, batch_size)
+    with transaction.atomic():
+        for record in read_delimited(stream):
+            importer.feed(record)
+        if not importer.started:
+            raise RegisterFormatError("Register is empty")
+        result = importer.finish()
+
+    bump_data_version()
+    logger.info("Imported obligation register: %s", result)
+    return result
@@ -0,0 +1,151 @@
+"""
+Hot obligation queries and their query plans.
+
+Each function registered with ``@hot_query`` builds a queryset with the same
+shape as a query the views run on every page load; counts and aggregates
+drop the model's default ordering, so their querysets do too.
+``tests/test_query_plans.py`` runs ``EXPLAIN`` on each one against a
+generated dataset and fails when the plan scans the whole obligations table,
+so a dropped or unusable index is caught before deploy. Register new hot
+queries here when adding views that filter obligations in new ways.
+"""
+
+import re
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+from django.db import connection
+from django.db.models import Count, QuerySet
+from django.utils import timezone
+
+from .constants import STATUS_COMPLETED
+from .models import Obligation
+from .utils import overdue_filter
+
+# Builds a queryset from sample values such as "project_id" and "mechanism_id"
+HotQuery = Callable[[dict[str, Any]], QuerySet]
+
+HOT_QUERIES: dict[str, HotQuery] = {}
+
+# Plan lines that read every row of a table, per database vendor
+FULL_SCAN_PATTERNS = {
+    "sqlite": r"\bSCAN {table}\b",
+    "postgresql": r"\bSeq Scan on {table}\b",
+}
+
+
+def hot_query(name: str) -> Callable[[HotQuery], HotQuery]:
+    """Register a function building one of the hot queries."""
+
+    def register(func: HotQuery) -> HotQuery:
+        HOT_QUERIES[name] = func
+        return func
+
+    return register
+
+
+def full_table_scans(queryset: QuerySet, table: str | None = None) -> list[str]:
+    """
+    Return the plan lines in which a query scans a whole table.
+
+    Args:
+        queryset: Query to explain
+        table: Table to look for (defaults to the queryset's model table)
+
+    Returns:
+        list: Offending plan lines; empty when only index lookups are used
+    """
+    pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+    if pattern is None:
+        raise NotImplementedError(f"No scan pattern for {connection.vendor}")
+    table = table or queryset.model._meta.db_table
+    scan = re.compile(pattern.format(table=re.escape(table)))
+    return [line for line in queryset.explain().splitlines() if scan.search(line)]
+
+
+@hot_query("dashboard.overdue_count")
+def dashboard_overdue(sample: dict[str, Any]) -> QuerySet:
+    return Obligation.objects.filter(
+        overdue_filter(), project_id=sample["project_id"]
+    ).order_by()
+
+
+@hot_query("dashboard.active_count")
+def dashboard_active(sample: dict[str, Any]) -> QuerySet:
+    return (
+        Obligation.objects.filter(project_id=sample["project_id"])
+        .exclude(status=STATUS_COMPLETED)
+        .order_by()
+    )
+
+
+@hot_query("dashboard.upcoming_count")
+def dashboard_upcoming(sample: dict[str, Any]) -> QuerySet:
+    today = timezone.now().date()
+    return (
+        Obligation.objects.filter(
+            project_id=sample["project_id"],
+            action_due_date__range=(today, today + timedelta(days=7)),
+        )
+        .exclude(status=STATUS_COMPLETED)
+        .order_by()
+    )
+
+
+@hot_query("procedures.status_counts")
+def procedure_status_counts(sample: dict[str, Any]) -> QuerySet:
+    return (
+        Obligation.objects.filter(
+            primary_environmental_mechanism_id=sample["mechanism_id"],
+            procedure=sample["procedure"],
+        )
+        .order_by()
+        .values_list("status", "action_due_date")
+    )
+
+
+@hot_query("procedures.status_filter")
+def procedure_status_filter(sample: dict[str, Any]) -> QuerySet:
+    return Obligation.objects.filter(
+        primary_environmental_mechanism_id=sample["mechanism_id"],
+        procedure=sample["procedure"],
+        status=sample["status"],
+    )
+
+
+@hot_query("responsibility.chart")
+def responsibility_chart(sample: dict[str, Any]) -> QuerySet:
+    return (
+        Obligation.objects.filter(
+            primary_environmental_mechanism_id=sample["mechanism_id"]
+        )
+        .values("responsibility")
+        .annotate(count=Count("obligation_number"))
+        .order_by("-count")
+    )
+
+
+@hot_query("summary.overdue_for_roles")
+def summary_overdue_for_roles(sample: dict[str, Any]) -> QuerySet:
+    return Obligation.objects.filter(
+        overdue_filter(),
+        responsibility__in=[sample["responsibility"]],
+        project_id__in=[sample["project_id"]],
+    )
+
+
+@hot_query("summary.mechanism_page")
+def summary_mechanism_page(sample: dict[str, Any]) -> QuerySet:
+    return Obligation.objects.filter(
+        primary_environmental_mechanism_id=sample["mechanism_id"]
+    ).order_by("obligation_number")[:15]
+
+
+@hot_query("conditional.project_validator")
+def project_validator(sample: dict[str, Any]) -> QuerySet:
+    return (
+        Obligation.objects.filter(project_id=sample["project_id"])
+        .order_by()
+        .values("updated_at")
+    )
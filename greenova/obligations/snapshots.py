@@ -0,0 +1,216 @@
+"""
+Daily compliance snapshots.
+
+``take_snapshot`` rolls the current obligation statuses up into one
+``ComplianceSnapshot`` row per project, mechanism and day with a single
+grouped query. It runs nightly from the ``snapshot_compliance`` command or
+the ``obligations.snapshot_compliance`` job. Trends and history charts then
+range-scan the ``(project, date)`` index instead of reconstructing past
+states. ``compliance_trend`` sums the rows per day and downsamples long
+ranges to weekly, monthly or multi-month points.
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Count, F, Q, QuerySet, Subquery, Sum
+from django.utils import timezone
+
+from .constants import STATUS_COMPLETED, STATUS_IN_PROGRESS, STATUS_NOT_STARTED
+from .models import ComplianceSnapshot, Obligation
+from .utils import overdue_filter
+
+logger = logging.getLogger(__name__)
+
+# Count columns of a snapshot, summed when snapshots are combined
+SNAPSHOT_COUNTS = ("not_started", "in_progress", "completed", "overdue", "total")
+
+DEFAULT_MAX_POINTS = 60
+
+
+def completion_percentage(completed: int, total: int) -> float:
+    """Return the completed share of obligations as a percentage."""
+    return round(completed / total * 100, 1) if total else 0.0
+
+
+def take_snapshot(day: date | None = None) -> int:
+    """
+    Write the compliance snapshot rows for one day.
+
+    Running it again on the same day replaces that day's rows.
+
+    Args:
+        day: Snapshot date and the reference date for overdue obligations
+            (defaults to today)
+
+    Returns:
+        int: Number of snapshot rows written
+    """
+    day = day or timezone.localdate()
+    rows = (
+        Obligation.objects.order_by()
+        .values("project_id", "primary_environmental_mechanism_id")
+        .annotate(
+            not_started=Count("pk", filter=Q(status=STATUS_NOT_STARTED)),
+            in_progress=Count("pk", filter=Q(status=STATUS_IN_PROGRESS)),
+            completed=Count("pk", filter=Q(status=STATUS_COMPLETED)),
+            overdue=Count("pk", filter=overdue_filter(day)),
+            total=Count("pk"),
+        )
+    )
+    snapshots = [
+        ComplianceSnapshot(
+            project_id=row["project_id"],
+            mechanism_id=row["primary_environmental_mechanism_id"],
+            date=day,
+            completion_percentage=completion_percentage(row["completed"], row["total"]),
+            **{name: row[name] for name in SNAPSHOT_COUNTS},
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        ComplianceSnapshot.objects.filter(date=day).delete()
+        ComplianceSnapshot.objects.bulk_create(snapshots, batch_size=500)
+    logger.info("Wrote %d compliance snapshots for %s", len(snapshots), day)
+    return len(snapshots)
+
+
+def latest_snapshot(snapshots: QuerySet, day: date) -> QuerySet:
+    """
+    Narrow snapshots to the most recent day on or before ``day``.
+
+    Args:
+        snapshots: Snapshots of the projects and mechanisms of interest
+        day: Latest acceptable snapshot date
+
+    Returns:
+        QuerySet: The rows of that day, empty if there is no earlier snapshot
+    """
+    latest = snapshots.filter(date__lte=day).order_by("-date").values("date")[:1]
+    return snapshots.filter(date=Subquery(latest))
+
+
+async def aactive_count_on(snapshots: QuerySet, day: date) -> int | None:
+    """
+    Count the obligations not yet completed in the latest snapshot by ``day``.
+
+    Args:
+        snapshots: Snapshots of the projects and mechanisms of interest
+        day: Latest acceptable snapshot date
+
+    Returns:
+        int | None: The count, or None if there is no earlier snapshot
+    """
+    values = await latest_snapshot(snapshots, day).aaggregate(
+        active=Sum(F("total") - F("completed"))
+    )
+    return values["active"]
+
+
+def percentage_change(previous: int | None, current: int) -> int:
+    """Return the whole-number percentage change, or 0 without a baseline."""
+    if not previous:
+        return 0
+    return round((current - previous) / previous * 100)
+
+
+def _month_number(day: date) -> int:
+    """Return the number of months from year 0 to the month of ``day``."""
+    return day.year * 12 + day.month - 1
+
+
+def resolution_for(start: date, end: date, max_points: int) -> tuple[str, int]:
+    """
+    Pick the finest buckets that fit the range in ``max_points``.
+
+    Days are tried first, then weeks, then months. Ranges with more months
+    than points group several months per bucket.
+
+    Returns:
+        tuple: The resolution ("day", "week" or "month") and its units per bucket
+    """
+    if (end - start).days + 1 <= max_points:
+        return "day", 1
+    weeks = (bucket_start(end, "week") - bucket_start(start, "week")).days // 7 + 1
+    if weeks <= max_points:
+        return "week", 1
+    months = _month_number(end) - _month_number(start) + 1
+    return "month", -(-months // max_points)
+
+
+def bucket_start(
+    day: date, resolution: str, step: int = 1, origin: date | None = None
+) -> date:
+    """
+    Return the first day of the bucket containing ``day``.
+
+    Buckets of ``step`` months are counted from the month of ``origin``.
+    """
+    if resolution == "week":
+        return day - timedelta(days=day.weekday())
+    if resolution == "month":
+        number = _month_number(day)
+        if step > 1:
+            first = _month_number(origin or day)
+            number -= (number - first) % step
+        return date(number // 12, number % 12 + 1, 1)
+    return day
+
+
+def compliance_trend(
+    snapshots: QuerySet,
+    start: date,
+    end: date,
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> dict[str, Any]:
+    """
+    Summarize snapshots between two dates as a downsampled series.
+
+    Rows are summed per day in the database. When the range has more days
+    than ``max_points`` the days are grouped by week, month or several months,
+    and each group reports its last day: the counts describe a state, so
+    adding up the days of a month would count the same obligation thirty
+    times.
+
+    Args:
+        snapshots: Snapshots of the projects and mechanisms to include
+        start: First day of the range
+        end: Last day of the range
+        max_points: Most points to return
+
+    Returns:
+        dict: The resolution and units per point used, and at most
+        ``max_points`` points, oldest first
+    """
+    resolution, step = resolution_for(start, end, max_points)
+    daily = (
+        snapshots.filter(date__range=(start, end))
+        .order_by("date")
+        .values("date")
+        .annotate(**{name: Sum(name) for name in SNAPSHOT_COUNTS})
+    )
+
+    points: dict[date, dict[str, Any]] = {}
+    for row in daily:
+        # Later days replace earlier ones in the same bucket
+        points[bucket_start(row["date"], resolution, step, start)] = row
+
+    return {
+        "resolution": resolution,
+        "step": step,
+        "start": start,
+        "end": end,
+        "points": [
+            {
+                "date": bucket,
+                "as_of": row["date"],
+                **{name: row[name] for name in SNAPSHOT_COUNTS},
+                "completion_percentage": completion_percentage(
+                    row["completed"], row["total"]
+                ),
+            }
+            for bucket, row in points.items()
+        ],
+    }
@@ -0,0 +1,23 @@
+"""Background tasks for obligations, run by the ``jobs`` queue."""
+
+from jobs.queue import task
+
+from .forecasting import forecast_recurring_dates
+from .models import Obligation
+from .snapshots import take_snapshot
+
+
+@task("obligations.forecast_recurring_dates")
+def forecast_recurring_dates_task(job, obligation_numbers=None, refresh_all=True):
+    """Recompute forecasted dates for the given obligations, or all of them."""
+    queryset = Obligation.objects.all()
+    if obligation_numbers is not None:
+        queryset = queryset.filter(pk__in=obligation_numbers)
+    updated = forecast_recurring_dates(queryset, refresh_all=refresh_all)
+    return {"updated": updated}
+
+
+@task("obligations.snapshot_compliance")
+def snapshot_compliance_task(job):
+    """Write today's compliance snapshot rows."""
+    return {"snapshots": take_snapshot()}
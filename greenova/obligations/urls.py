@@ -19,6 +19,13 @@ def root_redirect(request):
     # Summary view that shows obligations list
     path("summary/", ObligationSummaryView.as_view(), name="summary"),
     path("count-overdue/", views.TotalOverdueObligationsView.as_view(), name="overdue"),
+    path("export/", views.ObligationExportView.as_view(), name="export"),
+    path("bulk/", views.ObligationBulkActionView.as_view(), name="bulk"),
+    path(
+        "evidence/<int:pk>/download/",
+        views.EvidenceDownloadView.as_view(),
+        name="evidence_download",
+    ),
     # Make the root URL properly handle project_id parameter by redirecting
     path("", root_redirect, name="index"),
     # Other existing URLs
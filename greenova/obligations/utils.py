@@ -1,8 +1,14 @@
 import logging
+import re
+import time
 from datetime import date, timedelta
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Dict, Optional, Union
 
 from core.utils.roles import get_role_display
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import BooleanField, Case, Q, Value, When
 from django.utils import timezone
 
 # Import Obligation only for type checking to avoid circular imports
@@ -25,6 +31,12 @@
 
 logger = logging.getLogger(__name__)
 
+# Incremented whenever obligation rows change, so derived caches can be keyed on it
+DATA_VERSION_CACHE_KEY = 'obligations:data_version'
+
+# Cache seen by every worker process, so a bump invalidates all of them
+DATA_VERSION_CACHE = 'shared'
+
 
 def is_obligation_overdue(
     obligation: Union['Obligation', Dict[str, Any]],
@@ -66,6 +78,99 @@ def is_obligation_overdue(
     return due_date < reference_date
 
 
+def overdue_filter(reference_date: Optional[date] = None, prefix: str = '') -> Q:
+    """
+    Return a query expression matching overdue obligations.
+
+    Mirrors ``is_obligation_overdue`` so overdue rows can be selected in the
+    database instead of testing every obligation in Python.
+
+    Args:
+        reference_date: Optional date to compare against (defaults to today)
+        prefix: Lookup path to the obligations, e.g. ``'obligations__'`` to
+            filter or aggregate over a project's obligations
+
+    Returns:
+        Q: Filter for obligations that are not completed and past their due date
+    """
+    if reference_date is None:
+        reference_date = timezone.now().date()
+    return Q(**{f'{prefix}action_due_date__lt': reference_date}) & ~Q(
+        **{f'{prefix}status': STATUS_COMPLETED}
+    )
+
+
+def overdue_expression(reference_date: Optional[date] = None) -> Case:
+    """
+    Return a boolean expression telling whether an obligation is overdue.
+
+    Use it to annotate querysets so overdue can be displayed and sorted on
+    without evaluating ``is_obligation_overdue`` for each row.
+
+    Args:
+        reference_date: Optional date to compare against (defaults to today)
+
+    Returns:
+        Case: Expression that is true for overdue obligations
+    """
+    return Case(
+        When(overdue_filter(reference_date), then=Value(True)),
+        default=Value(False),
+        output_field=BooleanField(),
+    )
+
+
+def get_data_version() -> int:
+    """Return the current obligation data version."""
+    cache = caches[DATA_VERSION_CACHE]
+    version = cache.get(DATA_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_CACHE_KEY, initial_data_version(), timeout=None)
+        version = cache.get(DATA_VERSION_CACHE_KEY)
+    return version
+
+
+async def aget_data_version() -> int:
+    """Async counterpart of get_data_version() for async views."""
+    cache = caches[DATA_VERSION_CACHE]
+    version = await cache.aget(DATA_VERSION_CACHE_KEY)
+    if version is None:
+        await cache.aadd(DATA_VERSION_CACHE_KEY, initial_data_version(), timeout=None)
+        version = await cache.aget(DATA_VERSION_CACHE_KEY)
+    return version
+
+
+def bump_data_version() -> None:
+    """
+    Invalidate caches derived from obligation data once the change commits.
+
+    Bumping earlier would let another worker, still reading the old rows,
+    cache them under the new version. The shared cache increments with a
+    separate read and write, so concurrent bumps may advance the version only
+    once; the version only needs to change, not count the changes.
+    """
+    transaction.on_commit(_bump_data_version)
+
+
+def _bump_data_version() -> None:
+    cache = caches[DATA_VERSION_CACHE]
+    try:
+        cache.incr(DATA_VERSION_CACHE_KEY)
+    except ValueError:
+        cache.add(DATA_VERSION_CACHE_KEY, initial_data_version(), timeout=None)
+
+
+def initial_data_version() -> int:
+    """
+    Return a starting data version.
+
+    Versions start from the clock rather than 1, so if the counter is ever
+    lost it does not return to a version that older cache entries are still
+    keyed on.
+    """
+    return time.time_ns()
+
+
 def get_obligation_status(obligation):
     """
     Determine the real status of an obligation based on its due date and current status.
@@ -88,26 +193,37 @@ def get_obligation_status(obligation):
     return status
 
 
+# Canonical frequencies and alias lookups, built once at import time
+CANONICAL_FREQUENCIES = frozenset({
+    FREQUENCY_DAILY, FREQUENCY_WEEKLY, FREQUENCY_FORTNIGHTLY,
+    FREQUENCY_MONTHLY, FREQUENCY_QUARTERLY, FREQUENCY_BIANNUAL,
+    FREQUENCY_ANNUAL
+})
+_FREQUENCY_ALIAS_ITEMS = tuple(FREQUENCY_ALIASES.items())
+
+# Substring patterns checked in order; the monthly ones only apply when the
+# value mentions "month".
+_FREQUENCY_PATTERNS = (
+    (re.compile(r'day|daily'), FREQUENCY_DAILY),
+    (re.compile(r'fortnight|bi-week|biweek'), FREQUENCY_FORTNIGHTLY),
+    (re.compile(r'week'), FREQUENCY_WEEKLY),
+)
+_MONTHLY_PATTERNS = (
+    (re.compile(r'quarter|3 month|three month'), FREQUENCY_QUARTERLY),
+    (re.compile(r'biannual|bi annual|semi|twice a year'), FREQUENCY_BIANNUAL),
+    (re.compile(r'annual|year|12 month|twelve month'), FREQUENCY_ANNUAL),
+)
+
+
 def _match_frequency_pattern(frequency_lower: str) -> Optional[str]:
     """Helper function to match frequency patterns and return canonical form."""
-    # Daily/Weekly patterns
-    if any(term in frequency_lower for term in ['day', 'daily']):
-        return FREQUENCY_DAILY
-    if any(term in frequency_lower for term in ['fortnight', 'bi-week', 'biweek']):
-        return FREQUENCY_FORTNIGHTLY
-    if 'week' in frequency_lower:
-        return FREQUENCY_WEEKLY
-
-    # Monthly patterns
-    monthly_patterns = {
-        ('quarter', '3 month', 'three month'): FREQUENCY_QUARTERLY,
-        ('biannual', 'bi annual', 'semi', 'twice a year'): FREQUENCY_BIANNUAL,
-        ('annual', 'year', '12 month', 'twelve month'): FREQUENCY_ANNUAL
-    }
+    for pattern, freq in _FREQUENCY_PATTERNS:
+        if pattern.search(frequency_lower):
+            return freq
 
     if 'month' in frequency_lower:
-        for terms, freq in monthly_patterns.items():
-            if any(term in frequency_lower for term in terms):
+        for pattern, freq in _MONTHLY_PATTERNS:
+            if pattern.search(frequency_lower):
                 return freq
         return FREQUENCY_MONTHLY
 
@@ -118,6 +234,8 @@ def normalize_frequency(frequency: str) -> str:
     """
     Normalize a frequency string to its canonical form.
 
+    Results are memoized, as only a handful of distinct raw values exist.
+
     Args:
         frequency: A string representing the frequency
 
@@ -126,20 +244,20 @@ def normalize_frequency(frequency: str) -> str:
     """
     if not frequency:
         return ''
+    return _normalize_frequency(frequency)
+
 
+@lru_cache(maxsize=512)
+def _normalize_frequency(frequency: str) -> str:
+    """Normalize a non-empty frequency string (memoized)."""
     frequency_lower = frequency.lower().strip()
 
     # Check if it's already in canonical form
-    canonical_frequencies = {
-        FREQUENCY_DAILY, FREQUENCY_WEEKLY, FREQUENCY_FORTNIGHTLY,
-        FREQUENCY_MONTHLY, FREQUENCY_QUARTERLY, FREQUENCY_BIANNUAL,
-        FREQUENCY_ANNUAL
-    }
-    if frequency_lower in canonical_frequencies:
+    if frequency_lower in CANONICAL_FREQUENCIES:
         return frequency_lower
 
     # Check aliases first
-    for alias, canonical in FREQUENCY_ALIASES.items():
+    for alias, canonical in _FREQUENCY_ALIAS_ITEMS:
         if alias in frequency_lower:
             return canonical
 
@@ -1,18 +1,30 @@
+import asyncio
 import logging
 import os
 from datetime import date, timedelta
 from typing import Any
 
+from asgiref.sync import sync_to_async
 from company.models import CompanyMembership
+from core.commons import alist
+from core.downloads import serve_file
+from core.mixins import (
+    AsyncLoginRequiredMixin,
+    ConditionalResponseMixin,
+    aqueryset_validator,
+    queryset_validator,
+)
+from core.streaming import aiterate
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import ValidationError
-from django.core.paginator import Paginator
 from django.db.models import Q, QuerySet
-from django.http import HttpResponse, JsonResponse
-from django.shortcuts import get_object_or_404, redirect, render
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
+from django.template.response import TemplateResponse
 from django.urls import reverse
 from django.utils.decorators import method_decorator
+from django.utils.text import slugify
 from django.views import View
 from django.views.decorators.cache import cache_control
 from django.views.decorators.vary import vary_on_headers
@@ -22,9 +34,13 @@
 from mechanisms.models import EnvironmentalMechanism
 from projects.models import Project, ProjectMembership
 
-from .forms import EvidenceUploadForm, ObligationForm
+from .bulk import bulk_delete_obligations, bulk_update_obligations
+from .exporting import XLSX_CONTENT_TYPE, export_rows, stream_csv, stream_xlsx
+from .forms import BulkObligationForm, EvidenceUploadForm, ObligationForm
 from .models import Obligation, ObligationEvidence
-from .utils import is_obligation_overdue
+from .pagination import CachedCountPaginator, KeysetPaginator, cached_count
+from .projections import obligation_rows, to_rows
+from .utils import overdue_filter
 
 # Ensure the Django settings module is correctly configured.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "greenova.settings")
@@ -52,14 +68,50 @@
 
 @method_decorator(cache_control(max_age=300), name="dispatch")
 @method_decorator(vary_on_headers("HX-Request"), name="dispatch")
-class ObligationSummaryView(LoginRequiredMixin, View):
+class ObligationSummaryView(AsyncLoginRequiredMixin, ConditionalResponseMixin, View):
     """View for displaying obligation summary with filtering capabilities.
 
     This view handles both standard requests and HTMX requests for
-    dynamically loading filtered obligations.
+    dynamically loading filtered obligations. It is async, so the independent
+    queries behind each summary run concurrently with the async ORM.
     """
 
-    def get(self, request, *args, **kwargs):
+    async def aget_validator_parts(self):
+        """Summarize the obligations each kind of summary is built from."""
+        params = self.request.GET
+        mechanism_id = params.get("mechanism_id")
+        user = self.request.user
+        if (
+            params.get("status")
+            and params.get("procedure")
+            and params.get("project_id")
+        ):
+            obligations = Obligation.objects.filter(project_id=params["project_id"])
+            return [await aqueryset_validator(obligations)]
+        if mechanism_id:
+            obligations = Obligation.objects.filter(
+                primary_environmental_mechanism_id=mechanism_id
+            )
+            return await asyncio.gather(
+                aqueryset_validator(
+                    obligations,
+                    "updated_at",
+                    "primary_environmental_mechanism__updated_at",
+                ),
+                user.ahas_perm("obligations.change_obligation"),
+            )
+        # The overdue list depends on the user's projects and company roles
+        roles = CompanyMembership.objects.filter(user=user).values_list(
+            "role", flat=True
+        )
+        validator, roles, can_edit = await asyncio.gather(
+            aqueryset_validator(Obligation.objects.filter(project__members=user)),
+            alist(roles),
+            user.ahas_perm("obligations.change_obligation"),
+        )
+        return [validator, sorted(roles), can_edit]
+
+    async def get(self, request, *args, **kwargs):
         """Handle GET requests for obligation summary.
 
         When accessed via HTMX from procedure charts, this returns filtered obligations.
@@ -83,12 +135,7 @@ def get(self, request, *args, **kwargs):
 
                 # Apply status filter (handle overdue special case)
                 if status == "overdue":
-                    # Find obligations that are overdue
-                    filtered_ids = []
-                    for obligation in obligations:
-                        if is_obligation_overdue(obligation):
-                            filtered_ids.append(obligation.obligation_number)
-                    obligations = obligations.filter(obligation_number__in=filtered_ids)
+                    obligations = obligations.filter(overdue_filter())
                 else:
                     obligations = obligations.filter(status=status)
 
@@ -96,14 +143,15 @@ def get(self, request, *args, **kwargs):
                 if procedure:
                     obligations = obligations.filter(procedure__icontains=procedure)
 
-                return render(
+                rows = to_rows(await alist(obligation_rows(obligations)))
+                return TemplateResponse(
                     request,
                     "obligations/partials/obligation_list.html",
-                    {"obligations": obligations},
+                    {"obligations": rows},
                 )
             except Exception as exc:
                 logger.error("Error filtering obligations: %s", str(exc))
-                return render(
+                return TemplateResponse(
                     request,
                     "obligations/partials/obligation_list.html",
                     {
@@ -113,14 +161,15 @@ def get(self, request, *args, **kwargs):
                 )
 
         # For regular requests, proceed with full view
-        context = self.get_context_data(**kwargs)
+        context = await self.aget_context_data(**kwargs)
 
-        if self.request.htmx:
-            return render(
-                request, "obligations/components/_obligations_summary.html", context
+        # Infinite scroll requests only need the next rows
+        if context.get("keyset_mode") and request.GET.get("cursor"):
+            return TemplateResponse(
+                request, "obligations/partials/obligation_summary_rows.html", context
             )
 
-        return render(
+        return TemplateResponse(
             request, "obligations/components/_obligations_summary.html", context
         )
 
@@ -139,23 +188,8 @@ def _filter_by_status(self, queryset: QuerySet, status_values: list) -> QuerySet
             # Remove overdue to handle separately
             standard_statuses = [s for s in status_values if s != "overdue"]
 
-            # Get obligations that match standard statuses
-            if standard_statuses:
-                filtered_by_status = queryset.filter(status__in=standard_statuses)
-            else:
-                filtered_by_status = queryset.none()
-
-            # Find overdue obligations
-            overdue_ids = []
-            for obligation in queryset:
-                if is_obligation_overdue(obligation):
-                    overdue_ids.append(obligation.obligation_number)
-
-            if overdue_ids:
-                # Combine with standard status filter
-                overdue_queryset = queryset.filter(obligation_number__in=overdue_ids)
-                return filtered_by_status.union(overdue_queryset)
-            return filtered_by_status
+            # Express overdue in SQL so the result stays a plain, sliceable query
+            return queryset.filter(Q(status__in=standard_statuses) | overdue_filter())
 
         # Standard status filtering
         if status_values:
@@ -172,7 +206,7 @@ def apply_filters(self, queryset: QuerySet, filters: dict[str, Any]) -> QuerySet
         Returns:
             Filtered queryset
         """
-        if not queryset:
+        if queryset is None:
             return queryset
 
         # Apply status filter
@@ -198,9 +232,7 @@ def apply_filters(self, queryset: QuerySet, filters: dict[str, Any]) -> QuerySet
 
             if date_filter == "past_due":
                 # Past due - action_due_date is in the past and status isn't completed
-                queryset = queryset.filter(
-                    action_due_date__lt=today, status__ne="completed"
-                )
+                queryset = queryset.filter(overdue_filter(today))
             elif date_filter == "14days":
                 # Due in next 14 days
                 future_date = today + timedelta(days=14)
@@ -253,7 +285,64 @@ def get_filters(self) -> dict[str, Any]:
 
         return filters
 
-    def get_context_data(self, **kwargs):
+    def paginate(
+        self, queryset: QuerySet, filters: dict[str, Any], mechanism_id: str
+    ) -> dict[str, Any]:
+        """Fetch the requested page of a mechanism's obligations.
+
+        Args:
+            queryset: Filtered obligations of the mechanism
+            filters: Dictionary of filter values
+            mechanism_id: ID of the mechanism
+
+        Returns:
+            Context entries for the page
+        """
+        context: dict[str, Any] = {}
+        count_key = ("summary", mechanism_id, filters)
+        rows = obligation_rows(queryset, filters["sort"])
+
+        # A cursor parameter selects keyset pagination for infinite scroll,
+        # which seeks instead of scanning OFFSET rows on deep pages
+        cursor = self.request.GET.get("cursor")
+        if cursor is not None:
+            paginator = KeysetPaginator(
+                rows,
+                filters["sort"],
+                descending=filters["order"] == "desc",
+                per_page=15,
+            )
+            page_obj = paginator.get_page(cursor or None)
+            page_obj.object_list = to_rows(page_obj.object_list)
+            query = self.request.GET.copy()
+            query.pop("cursor", None)
+            context["keyset_mode"] = True
+            context["keyset_query"] = query.urlencode()
+            total_count = cached_count(queryset, *count_key)
+        else:
+            sort_field = filters["sort"]
+            if filters["order"] == "desc":
+                sort_field = f"-{sort_field}"
+
+            # Paginate results
+            paginator = CachedCountPaginator(
+                rows.order_by(sort_field, "obligation_number"), 15, count_key
+            )
+            page_number = self.request.GET.get("page", 1)
+            page_obj = paginator.get_page(page_number)
+            page_obj.object_list = to_rows(page_obj.object_list)
+            total_count = paginator.count
+
+        context.update(
+            {
+                "obligations": page_obj,
+                "page_obj": page_obj,
+                "total_count": total_count,
+            }
+        )
+        return context
+
+    async def aget_context_data(self, **kwargs):
         """Get context data for the template.
 
         Returns:
@@ -261,28 +350,24 @@ def get_context_data(self, **kwargs):
         """
         context = {}
         mechanism_id = self.request.GET.get("mechanism_id")
+        user = self.request.user
 
         try:
             # Check if we're coming from user profile (without mechanism_id)
             if not mechanism_id:
-                # Get overdue obligations for the current user
-                user = self.request.user
-                user_roles = []
-
-                # Get user's company roles using the CompanyMembership model directly
-                company_memberships = CompanyMembership.objects.filter(user=user)
-                if company_memberships:
-                    user_roles = list(
-                        company_memberships.values_list("role", flat=True).distinct()
-                    )
-
-                # Get projects where user is a member using the ProjectMembership model directly
-                project_ids = []
-                project_memberships = ProjectMembership.objects.filter(user=user)
-                if project_memberships:
-                    project_ids = list(
-                        project_memberships.values_list("project_id", flat=True)
-                    )
+                # Get the user's company roles and member projects together
+                user_roles, project_ids = await asyncio.gather(
+                    alist(
+                        CompanyMembership.objects.filter(user=user)
+                        .values_list("role", flat=True)
+                        .distinct()
+                    ),
+                    alist(
+                        ProjectMembership.objects.filter(user=user).values_list(
+                            "project_id", flat=True
+                        )
+                    ),
+                )
 
                 # Find obligations that match user's roles and are in their projects
                 if user_roles and project_ids:
@@ -290,31 +375,24 @@ def get_context_data(self, **kwargs):
                         responsibility__in=user_roles, project_id__in=project_ids
                     )
 
-                    # Find overdue obligations
-                    overdue_obligations = []
-                    for obligation in queryset:
-                        if is_obligation_overdue(obligation):
-                            overdue_obligations.append(obligation.obligation_number)
+                    # Find overdue obligations, reading only the listed columns
+                    overdue_obligations, user_can_edit = await asyncio.gather(
+                        alist(obligation_rows(queryset.filter(overdue_filter()))),
+                        user.ahas_perm("obligations.change_obligation"),
+                    )
+                    overdue_obligations = to_rows(overdue_obligations)
 
                     if overdue_obligations:
-                        queryset = queryset.filter(
-                            obligation_number__in=overdue_obligations
-                        )
                         # Create simple context for displaying just overdue obligations
                         context.update(
                             {
-                                "obligations": queryset,
-                                "total_count": len(queryset),
+                                "obligations": overdue_obligations,
+                                "total_count": len(overdue_obligations),
                                 "filters": {"status": ["overdue"]},
                                 "show_overdue_only": True,
+                                "user_can_edit": user_can_edit,
                             }
                         )
-
-                        # Add user permissions
-                        context["user_can_edit"] = self.request.user.has_perm(
-                            "obligations.change_obligation"
-                        )
-
                         return context
                     else:
                         context["error"] = "No overdue obligations found for your role"
@@ -326,7 +404,9 @@ def get_context_data(self, **kwargs):
                     return context
 
             # Regular mechanism-based view (existing code)
-            mechanism = get_object_or_404(EnvironmentalMechanism, id=mechanism_id)
+            mechanism = await aget_object_or_404(
+                EnvironmentalMechanism, id=mechanism_id
+            )
 
             # Get filters and base queryset
             filters = self.get_filters()
@@ -337,29 +417,6 @@ def get_context_data(self, **kwargs):
             # Apply filters and sorting
             queryset = self.apply_filters(queryset, filters)
 
-            sort_field = filters["sort"]
-            if filters["order"] == "desc":
-                sort_field = f"-{sort_field}"
-
-            queryset = queryset.order_by(sort_field)
-
-            # Paginate results
-            paginator = Paginator(queryset, 15)
-            page_number = self.request.GET.get("page", 1)
-            page_obj = paginator.get_page(page_number)
-
-            # Update context
-            context.update(
-                {
-                    "obligations": page_obj,
-                    "page_obj": page_obj,
-                    "project": mechanism,
-                    "mechanism_id": mechanism_id,
-                    "filters": filters,
-                    "total_count": paginator.count,
-                }
-            )
-
             # Get unique project phases
             phases = (
                 Obligation.objects.filter(primary_environmental_mechanism=mechanism_id)
@@ -368,13 +425,29 @@ def get_context_data(self, **kwargs):
                 .values_list("project_phase", flat=True)
                 .distinct()
             )
-            context["phases"] = list({phase.strip() for phase in phases})
 
-            # Add user permissions
-            context["user_can_edit"] = self.request.user.has_perm(
-                "obligations.change_obligation"
+            # The paginators are sync, so the page runs in a worker thread
+            # while the phases and permission queries are awaited alongside
+            page, phases, user_can_edit = await asyncio.gather(
+                sync_to_async(self.paginate)(queryset, filters, mechanism_id),
+                alist(phases),
+                user.ahas_perm("obligations.change_obligation"),
             )
 
+            # Update context
+            context.update(
+                {
+                    **page,
+                    "project": mechanism,
+                    "mechanism_id": mechanism_id,
+                    "filters": filters,
+                    "phases": list({phase.strip() for phase in phases}),
+                    "user_can_edit": user_can_edit,
+                }
+            )
+            if user_can_edit:
+                context["bulk_form"] = BulkObligationForm()
+
         except Exception as exc:
             logger.error("Error in ObligationSummaryView: %s", str(exc))
             context["error"] = f"Error loading obligations: {exc!s}"
@@ -399,14 +472,84 @@ def get(self, request, *args, **kwargs):
         if not project_id:
             return JsonResponse({"error": "Project ID is required"}, status=400)
 
-        obligations = Obligation.objects.filter(project_id=project_id)
-        overdue_count = sum(
-            1 for obligation in obligations if is_obligation_overdue(obligation)
-        )
+        overdue_count = Obligation.objects.filter(
+            overdue_filter(), project_id=project_id
+        ).count()
 
         return JsonResponse(overdue_count, safe=False)
 
 
+class ObligationExportView(LoginRequiredMixin, View):
+    """Stream a project's obligation register as CSV or XLSX."""
+
+    def get(self, request, *args, **kwargs):
+        """Handle GET request to export obligations.
+
+        Args:
+            request: HTTP request with project_id and optional format parameters
+
+        Returns:
+            StreamingHttpResponse with the export file
+        """
+        project_id = request.GET.get("project_id")
+        if not project_id:
+            return JsonResponse({"error": "Project ID is required"}, status=400)
+
+        projects = Project.objects.all()
+        if not request.user.is_superuser:
+            projects = projects.filter(members=request.user)
+        project = get_object_or_404(projects, pk=project_id)
+
+        export_format = request.GET.get("format", "csv")
+        rows = export_rows(Obligation.objects.filter(project=project))
+        # Async content is sent chunk by chunk under ASGI; a sync generator
+        # would be collected into a list before the first byte is sent
+        if export_format == "xlsx":
+            response = StreamingHttpResponse(
+                aiterate(stream_xlsx(rows)), content_type=XLSX_CONTENT_TYPE
+            )
+        elif export_format == "csv":
+            response = StreamingHttpResponse(
+                aiterate(stream_csv(rows)), content_type="text/csv; charset=utf-8"
+            )
+        else:
+            return JsonResponse({"error": "Unsupported export format"}, status=400)
+
+        filename = f"{slugify(project.name) or 'project'}-obligations.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class EvidenceDownloadView(LoginRequiredMixin, View):
+    """Serve an evidence file to members of the obligation's project."""
+
+    def get(self, request, *args, **kwargs):
+        """Handle GET request to download evidence.
+
+        Args:
+            request: HTTP request, optionally with Range or conditional headers
+
+        Returns:
+            The file response from ``serve_file``
+        """
+        evidence = ObligationEvidence.objects.all()
+        if not request.user.is_superuser:
+            evidence = evidence.filter(obligation__project__members=request.user)
+        evidence = get_object_or_404(evidence, pk=kwargs["pk"])
+
+        blob = evidence.blob
+        if blob is None:
+            return serve_file(request, evidence.file, evidence.display_name)
+        return serve_file(
+            request,
+            blob.file,
+            evidence.display_name,
+            content_type=blob.content_type,
+            etag=blob.sha256,
+            size=blob.size,
+        )
+
+
 class ObligationCreateView(LoginRequiredMixin, CreateView):
     """View for creating a new obligation."""
 
@@ -472,7 +615,7 @@ def form_invalid(self, form):
         return super().form_invalid(form)
 
 
-class ObligationDetailView(LoginRequiredMixin, DetailView):
+class ObligationDetailView(LoginRequiredMixin, ConditionalResponseMixin, DetailView):
     """View for viewing a single obligation."""
 
     model = Obligation
@@ -480,6 +623,11 @@ class ObligationDetailView(LoginRequiredMixin, DetailView):
     context_object_name = "obligation"
     pk_url_kwarg = "obligation_number"
 
+    def get_validator_parts(self):
+        """The page shows the obligation and its evidence."""
+        obligations = Obligation.objects.filter(pk=self.kwargs["obligation_number"])
+        return [queryset_validator(obligations, "updated_at", "evidences__pk")]
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Add project_id to context for back navigation
@@ -634,6 +782,66 @@ def post(self, request, *args, **kwargs):
             )
 
 
+class ObligationBulkActionView(LoginRequiredMixin, View):
+    """Apply one edit, or a delete, to several obligations at once."""
+
+    def post(self, request, *args, **kwargs):
+        """Handle POST request for a bulk action.
+
+        Args:
+            request: HTTP request with the selected obligation numbers, the
+                action and the field values to apply
+
+        Returns:
+            HttpResponse for HTMX requests, otherwise a redirect back
+        """
+        form = BulkObligationForm(request.POST)
+        if not form.is_valid():
+            errors = "; ".join(
+                error for field_errors in form.errors.values() for error in field_errors
+            )
+            return JsonResponse({"status": "error", "message": errors}, status=400)
+
+        action = form.cleaned_data["action"]
+        permission = (
+            "obligations.delete_obligation"
+            if action == BulkObligationForm.ACTION_DELETE
+            else "obligations.change_obligation"
+        )
+        if not request.user.has_perm(permission):
+            return JsonResponse(
+                {"status": "error", "message": "Permission denied"}, status=403
+            )
+
+        obligations = Obligation.objects.filter(pk__in=form.cleaned_data["selected"])
+        if not request.user.is_superuser:
+            obligations = obligations.filter(project__members=request.user)
+
+        try:
+            if action == BulkObligationForm.ACTION_DELETE:
+                count = bulk_delete_obligations(obligations)
+                message = f"Deleted {count} obligations."
+            else:
+                count = bulk_update_obligations(obligations, form.changes())
+                message = f"Updated {count} obligations."
+        except Exception as exc:
+            logger.exception("Error in bulk obligation %s: %s", action, str(exc))
+            return JsonResponse(
+                {"status": "error", "message": f"Bulk {action} failed: {exc!s}"},
+                status=400,
+            )
+
+        if request.htmx:
+            response = HttpResponse(message)
+            trigger_client_event(
+                response, "path-deps-refresh", {"path": "/obligations/"}
+            )
+            return response
+
+        messages.success(request, message)
+        return redirect("obligations:summary")
+
+
 @method_decorator(vary_on_headers("HX-Request"), name="dispatch")
 class ToggleCustomAspectView(View):
     """View for toggling custom aspect field visibility."""
@@ -664,7 +872,7 @@ class ObligationListView(LoginRequiredMixin, ListView):
     context_object_name = "obligations"
 
     def get_queryset(self):
-        return Obligation.objects.all()
+        return to_rows(obligation_rows(Obligation.objects.all()))
 
 
 def upload_evidence(request, obligation_id):
@@ -688,11 +896,13 @@ def upload_evidence(request, obligation_id):
         return redirect("obligation_detail", obligation_id=obligation_id)
 
     if request.method == "POST":
-        form = EvidenceUploadForm(request.POST, request.FILES)
+        form = EvidenceUploadForm(
+            request.POST,
+            request.FILES,
+            instance=ObligationEvidence(obligation=obligation),
+        )
         if form.is_valid():
-            evidence = form.save(commit=False)
-            evidence.obligation = obligation
-            evidence.save()
+            form.save()
             messages.success(request, "Evidence file uploaded successfully")
             return redirect("obligation_detail", obligation_id=obligation_id)
 
@@ -13,4 +13,9 @@
     path("charts/", views.ProcedureChartsView.as_view(), name="procedure_charts"),
     path("charts/", views.ProcedureChartsView.as_view(), name="procedure_charts_query"),
     path("", views.ProcedureListView.as_view(), name="procedure_list"),
+    path(
+        "<int:pk>/document/",
+        views.ProcedureDocumentDownloadView.as_view(),
+        name="document_download",
+    ),
 ]
@@ -2,18 +2,24 @@
 import io
 import logging
 from datetime import timedelta
+from functools import partial
 from typing import Any
 
 import matplotlib
+from core.downloads import serve_file
+from core.singleflight import single_flight
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_control
 from django.views.decorators.vary import vary_on_headers
-from django.views.generic import ListView, TemplateView
+from django.views.generic import ListView, TemplateView, View
 from mechanisms.models import EnvironmentalMechanism
 from obligations.models import Obligation
+from obligations.projections import count_by_status
+from obligations.utils import get_data_version
 from responsibility.figures import get_responsibility_chart
 
 from .figures import get_procedure_charts as get_all_procedure_charts
@@ -212,19 +218,13 @@ def _create_procedure_chart_data(
             f'width="300" height="250">'
         )
 
-        # Get obligations for this procedure
-        proc_obligations = obligations.filter(procedure=procedure_name)
-
-        # Count status types
+        # Count status types, reading only the status and due date columns
+        counts = count_by_status(obligations.filter(procedure=procedure_name))
         status_counts = {
-            "not_started": sum(
-                1 for o in proc_obligations if o.status == "not started"
-            ),
-            "in_progress": sum(
-                1 for o in proc_obligations if o.status == "in progress"
-            ),
-            "completed": sum(1 for o in proc_obligations if o.status == "completed"),
-            "overdue": sum(1 for o in proc_obligations if o.is_overdue),
+            "not_started": counts.get("not started", 0),
+            "in_progress": counts.get("in progress", 0),
+            "completed": counts.get("completed", 0),
+            "overdue": counts["overdue"],
         }
         status_counts["total"] = (
             status_counts["not_started"]
@@ -233,6 +233,19 @@ def _create_procedure_chart_data(
         )
         return {"name": procedure_name, "chart": chart_img, "stats": status_counts}
 
+    def _generate_charts(
+        self, mechanism_id, filtered_obligations, all_obligations, filters_applied
+    ):
+        """Generate the responsibility chart and the procedure charts."""
+        return {
+            "responsibility_chart": self._generate_responsibility_chart(
+                mechanism_id, filtered_obligations, filters_applied
+            ),
+            "procedure_charts": self._generate_procedure_charts(
+                mechanism_id, filtered_obligations, all_obligations, filters_applied
+            ),
+        }
+
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         """Get context data for rendering the template."""
         context = super().get_context_data(**kwargs)
@@ -284,20 +297,27 @@ def get_context_data(self, **kwargs) -> dict[str, Any]:
                 }
             )
 
-            # Generate responsibility chart
-            responsibility_chart_img = self._generate_responsibility_chart(
-                mechanism_id, filtered_obligations, filter_params["filters_applied"]
-            )
-            context["responsibility_chart"] = responsibility_chart_img
-
-            # Generate procedure charts
-            procedure_charts = self._generate_procedure_charts(
-                mechanism_id,
-                filtered_obligations,
-                all_obligations,
-                filter_params["filters_applied"],
+            # Concurrent requests with the same filters share one drawing,
+            # and a slightly stale one is served while it is redrawn
+            charts = single_flight(
+                "procedures.charts",
+                (
+                    str(mechanism_id),
+                    tuple(sorted(filter_params.items())),
+                    timezone.localdate(),
+                ),
+                get_data_version(),
+                partial(
+                    self._generate_charts,
+                    mechanism_id,
+                    filtered_obligations,
+                    all_obligations,
+                    filter_params["filters_applied"],
+                ),
+                stale_ok=True,
             )
-            context["procedure_charts"] = procedure_charts
+            context.update(charts)
+            procedure_charts = charts["procedure_charts"]
 
             # Add table data for all procedures
             context["table_data"] = [
@@ -333,3 +353,20 @@ class ProcedureListView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         return Procedure.objects.all()
+
+
+class ProcedureDocumentDownloadView(LoginRequiredMixin, View):
+    """Serve a procedure's document to members of its project."""
+
+    def get(self, request, *args, **kwargs):
+        procedures = Procedure.objects.all()
+        if not request.user.is_superuser:
+            procedures = procedures.filter(project__members=request.user)
+        procedure = get_object_or_404(procedures, pk=kwargs["pk"])
+        if not procedure.document_file:
+            raise Http404("This procedure has no document")
+        return serve_file(
+            request,
+            procedure.document_file,
+            procedure.document_file.name.rsplit("/", 1)[-1],
+        )
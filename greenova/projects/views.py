@@ -91,12 +91,13 @@ def get_queryset(self):
 def project_obligations(_request: HttpRequest, project_id: str) -> JsonResponse:
     """Retrieve obligations associated with a specific project."""
     project = get_object_or_404(Project, id=project_id)
-    obligations = Obligation.objects.filter(project=project)
+    obligation_numbers = Obligation.objects.filter(project=project).values_list(
+        "obligation_number", flat=True
+    )
 
     # Serialize obligations
     obligations_data = [
-        {"id": o.obligation_number, "obligation_number": o.obligation_number}
-        for o in obligations
+        {"id": number, "obligation_number": number} for number in obligation_numbers
     ]
 
     return JsonResponse({"obligations": obligations_data})
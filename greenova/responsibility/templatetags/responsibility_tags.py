@@ -1,3 +1,6 @@
+from collections import defaultdict
+
+from core.loaders import get_loader, register_loader
 from django import template
 from django.utils.html import format_html
 
@@ -5,24 +8,45 @@
 
 register = template.Library()
 
+ASSIGNMENTS_LOADER = 'responsibility_assignments'
+
+
+def _load_assignments(obligation_ids):
+    """Fetch the assignments of many obligations with one query."""
+    assignments = defaultdict(list)
+    queryset = ResponsibilityAssignment.objects.filter(
+        obligation_id__in=obligation_ids
+    ).select_related('user', 'role')
+    for assignment in queryset:
+        assignments[assignment.obligation_id].append(assignment)
+    return assignments
+
+
+register_loader(ASSIGNMENTS_LOADER, _load_assignments, default=[])
+
+
+def _obligation_assignments(obligation):
+    """Return the batched assignments for an obligation or obligation number."""
+    return get_loader(ASSIGNMENTS_LOADER).load(getattr(obligation, 'pk', obligation))
+
 
 @register.filter
 def user_has_responsibility(user, obligation):
     """Check if a user has any responsibility for an obligation."""
-    return ResponsibilityAssignment.objects.filter(
-        user=user,
-        obligation=obligation
-    ).exists()
+    return any(
+        assignment.user_id == user.pk
+        for assignment in _obligation_assignments(obligation)
+    )
 
 
 @register.filter
 def user_responsibility_roles(user, obligation):
     """Get a list of responsibility roles a user has for an obligation."""
-    assignments = ResponsibilityAssignment.objects.filter(
-        user=user,
-        obligation=obligation
-    ).select_related('role')
-    return [assignment.role for assignment in assignments if assignment.role]
+    return [
+        assignment.role
+        for assignment in _obligation_assignments(obligation)
+        if assignment.user_id == user.pk and assignment.role
+    ]
 
 
 @register.filter
@@ -40,8 +64,5 @@ def format_responsibility_roles(roles):
 
 @register.simple_tag
 def get_responsible_users(obligation):
-    """Get all users responsible for an obligation."""
-    assignments = ResponsibilityAssignment.objects.filter(
-        obligation=obligation
-    ).select_related('user', 'role')
-    return assignments
+    """Get all responsibility assignments for an obligation."""
+    return _obligation_assignments(obligation)
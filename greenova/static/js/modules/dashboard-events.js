@@ -0,0 +1,114 @@
+/**
+ * Dashboard Events
+ *
+ * Applies obligation changes pushed by the server-sent event stream to the
+ * open dashboard instead of re-requesting whole fragments:
+ * 1. KPI values marked with data-counter are adjusted by the event's deltas
+ * 2. Rows marked with data-obligation get the new status badge, or are
+ *    removed when the obligation leaves the project
+ * 3. New obligations fire an "obligation-created" event on the body so htmx
+ *    regions can reload themselves with hx-trigger="obligation-created from:body"
+ * 4. Bulk changes carry the summed deltas of a whole project and fire
+ *    "obligations-changed" on the body, as the changed rows are not listed
+ *
+ * The stream URL is read from the element carrying data-dashboard-events and
+ * the connection follows it across htmx swaps.
+ */
+
+(function () {
+  'use strict';
+
+  const SELECTORS = {
+    source: '[data-dashboard-events]',
+    status: '[data-field="status"]',
+  };
+
+  let source = null;
+  let streamUrl = null;
+
+  function disconnect() {
+    if (source) {
+      source.close();
+    }
+    source = null;
+    streamUrl = null;
+  }
+
+  function connect() {
+    const element = document.querySelector(SELECTORS.source);
+    const url = element ? element.getAttribute('data-dashboard-events') : null;
+    if (url === streamUrl) {
+      return;
+    }
+    disconnect();
+    if (!url || !('EventSource' in window)) {
+      return;
+    }
+    streamUrl = url;
+    source = new EventSource(url);
+    source.addEventListener('obligation', handleObligation);
+    source.addEventListener('obligations', handleBulkChange);
+  }
+
+  function applyCounters(counters) {
+    Object.entries(counters || {}).forEach(([name, delta]) => {
+      const selector = `[data-counter="${CSS.escape(name)}"]`;
+      document.querySelectorAll(selector).forEach((element) => {
+        const value = parseInt(element.textContent, 10) || 0;
+        element.textContent = String(Math.max(0, value + delta));
+      });
+    });
+  }
+
+  function patchRows(change) {
+    const selector = `[data-obligation="${CSS.escape(change.obligation)}"]`;
+    document.querySelectorAll(selector).forEach((row) => {
+      if (!change.status) {
+        row.remove();
+        return;
+      }
+      const cell = row.querySelector(SELECTORS.status);
+      if (cell && change.status_html) {
+        cell.innerHTML = change.status_html;
+      }
+    });
+  }
+
+  function parseEvent(message) {
+    try {
+      return JSON.parse(message.data);
+    } catch (error) {
+      console.error('Invalid dashboard event:', error);
+      return null;
+    }
+  }
+
+  function handleObligation(message) {
+    const change = parseEvent(message);
+    if (!change) {
+      return;
+    }
+    applyCounters(change.counters);
+    patchRows(change);
+    if (change.created) {
+      document.body.dispatchEvent(
+        new CustomEvent('obligation-created', { detail: change })
+      );
+    }
+  }
+
+  function handleBulkChange(message) {
+    const change = parseEvent(message);
+    if (!change) {
+      return;
+    }
+    applyCounters(change.counters);
+    document.body.dispatchEvent(
+      new CustomEvent('obligations-changed', { detail: change })
+    );
+  }
+
+  document.addEventListener('DOMContentLoaded', connect);
+  document.addEventListener('htmx:afterSettle', connect);
+  window.addEventListener('pagehide', disconnect);
+})();
@@ -0,0 +1,136 @@
+"""
+Unit tests for the chatbot app in the Greenova project.
+
+These tests cover the in-memory retrieval index used to answer messages
+from training data and the trigger matcher for predefined responses.
+"""
+
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import pytest
+from chatbot.matching import MATCHER_VERSION_CACHE_KEY, TriggerMatcher, trigger_matcher
+from chatbot.models import PredefinedResponse, TrainingData
+from chatbot.retrieval import (
+    INDEX_VERSION_CACHE_KEY,
+    TrainingDataIndex,
+    bump_version,
+    training_index,
+)
+from chatbot.services import ChatbotService
+from django.core.cache import caches
+
+DEFAULT_RESPONSE = "I'm sorry, I don't have an answer for that question."
+
+
+@pytest.fixture(autouse=True)
+def reset_chatbot_indexes():
+    """Start every test with an unloaded index and matcher."""
+    training_index.invalidate()
+    trigger_matcher.invalidate()
+    yield
+    training_index.invalidate()
+    trigger_matcher.invalidate()
+
+
+@pytest.mark.django_db
+def test_generate_response_ranks_best_match():
+    """Test that the closest training question wins."""
+    TrainingData.objects.create(
+        question="How do I upload evidence?", answer="Use the evidence form."
+    )
+    TrainingData.objects.create(
+        question="How do I add a new project?", answer="Open the projects page."
+    )
+
+    response = ChatbotService._generate_response("upload evidence for obligation")
+    assert response == "Use the evidence form."
+    assert ChatbotService._generate_response("weather today") == DEFAULT_RESPONSE
+
+
+@pytest.mark.django_db
+def test_training_index_refreshes_incrementally(django_capture_on_commit_callbacks):
+    """Test that saves and deletes are reflected without a rebuild."""
+    item = TrainingData.objects.create(
+        question="Where are reports?", answer="Reports tab."
+    )
+    assert [answer for _, answer in training_index.search("reports")] == [
+        "Reports tab."
+    ]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        item.answer = "Open the reports app."
+        item.save()
+        TrainingData.objects.create(question="Where is the map?", answer="Map tab.")
+    assert training_index.search("where are reports", k=1)[0][1] == (
+        "Open the reports app."
+    )
+    assert len(training_index) == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        item.delete()
+    assert training_index.search("reports") == []
+    assert len(training_index) == 1
+
+
+@pytest.mark.django_db
+def test_training_changes_reach_other_workers(django_capture_on_commit_callbacks):
+    """Test that an index in another worker rebuilds after a committed change."""
+    other_worker = TrainingDataIndex()
+    with django_capture_on_commit_callbacks(execute=True):
+        TrainingData.objects.create(
+            question="Where are reports?", answer="Reports tab."
+        )
+    assert other_worker.search("reports")[0][1] == "Reports tab."
+
+    with django_capture_on_commit_callbacks(execute=True):
+        TrainingData.objects.create(question="Where is the map?", answer="Map tab.")
+        # Other workers are not told before the row is committed
+        assert caches["shared"].get(INDEX_VERSION_CACHE_KEY) == other_worker._version
+    assert caches["shared"].get(INDEX_VERSION_CACHE_KEY) != other_worker._version
+    assert other_worker.search("map")[0][1] == "Map tab."
+
+    # A culled counter does not restart at a version a worker has loaded
+    caches["shared"].delete(INDEX_VERSION_CACHE_KEY)
+    assert bump_version(INDEX_VERSION_CACHE_KEY) > other_worker._version
+
+
+@pytest.mark.django_db
+def test_predefined_response_matches_trigger_in_message(
+    django_capture_on_commit_callbacks,
+):
+    """Test that triggers contained in a message match by priority."""
+    PredefinedResponse.objects.create(
+        trigger_phrase="hello", response_text="Hi there!", priority=1
+    )
+    PredefinedResponse.objects.create(
+        trigger_phrase="Reset password",
+        response_text="Use the reset link.",
+        priority=5,
+    )
+
+    match = ChatbotService._check_predefined_responses("Hello, how are you?")
+    assert match.response_text == "Hi there!"
+    match = ChatbotService._check_predefined_responses("hello, please RESET password")
+    assert match.response_text == "Use the reset link."
+    assert ChatbotService._check_predefined_responses("othello") is None
+
+    with django_capture_on_commit_callbacks(execute=True):
+        PredefinedResponse.objects.filter(priority=5).delete()
+    match = ChatbotService._check_predefined_responses("hello, reset password")
+    assert match.response_text == "Hi there!"
+
+
+@pytest.mark.django_db
+def test_trigger_changes_reach_other_workers(django_capture_on_commit_callbacks):
+    """Test that a matcher in another worker recompiles after a committed change."""
+    other_worker = TriggerMatcher()
+    PredefinedResponse.objects.create(trigger_phrase="hello", response_text="Hi!")
+    assert other_worker.match("hello there").response_text == "Hi!"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        PredefinedResponse.objects.create(trigger_phrase="bye", response_text="Bye!")
+        # Other workers are not told before the row is committed
+        assert caches["shared"].get(MATCHER_VERSION_CACHE_KEY) == other_worker._version
+    assert caches["shared"].get(MATCHER_VERSION_CACHE_KEY) != other_worker._version
+    assert other_worker.match("bye now").response_text == "Bye!"
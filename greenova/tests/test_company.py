@@ -10,6 +10,10 @@
 
 import pytest
 from company.models import Company, CompanyMembership
+from company.templatetags.company_tags import company_role, prime_company_roles
+from core.loaders import loader_scope
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from users.models import User
 
@@ -190,3 +194,23 @@ def test_company_membership_removal(authenticated_client, test_company, regular_
 
     assert response.status_code == HTTP_OK  # HTMX response is 200 OK
     assert not CompanyMembership.objects.filter(id=membership.id).exists()
+
+
+@pytest.mark.django_db
+def test_company_role_lookups_are_batched(regular_user):
+    """Test that primed company role lookups resolve with a single query."""
+    companies = [Company.objects.create(name=f"Batch {i}") for i in range(3)]
+    CompanyMembership.objects.create(
+        company=companies[0], user=regular_user, role="owner"
+    )
+    CompanyMembership.objects.create(
+        company=companies[1], user=regular_user, role="manager"
+    )
+
+    with loader_scope(), CaptureQueriesContext(connection) as queries:
+        prime_company_roles(regular_user, companies)
+        roles = [company_role(company.id, regular_user) for company in companies]
+        assert company_role(regular_user, companies[0]) == "owner"
+
+    assert roles == ["owner", "manager", None]
+    assert len(queries) == 1
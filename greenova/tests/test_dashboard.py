@@ -0,0 +1,248 @@
+"""
+Tests for the dashboard's server-sent event stream.
+"""
+
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from dashboard.events import EventHub, stream_events
+from dashboard.models import DashboardEvent
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from obligations.bulk import bulk_delete_obligations, bulk_update_obligations
+from obligations.models import Obligation
+from projects.models import ProjectMembership
+
+HTTP_OK = 200
+HTTP_FOUND = 302
+HTTP_NOT_MODIFIED = 304
+HTTP_NOT_FOUND = 404
+
+
+@pytest.mark.django_db
+def test_obligation_changes_stream_compact_events(
+    project, mechanism, django_capture_on_commit_callbacks
+):
+    """Test that a status change is published once and replayed to streams."""
+    with django_capture_on_commit_callbacks(execute=True):
+        obligation = Obligation.objects.create(
+            obligation_number="PCEMP-001",
+            obligation="Monitor groundwater",
+            status="not started",
+            action_due_date=timezone.now().date() - timedelta(days=3),
+            primary_environmental_mechanism=mechanism,
+            project=project,
+        )
+    created = DashboardEvent.objects.get()
+    assert created.project_id == project.pk
+    assert created.payload["created"] is True
+    assert created.payload["counters"] == {"not started": 1, "active": 1, "overdue": 1}
+
+    # Saves that leave the dashboard fields alone publish nothing
+    with django_capture_on_commit_callbacks(execute=True):
+        obligation.responsibility = "Site Manager"
+        obligation.save()
+        obligation.status = "completed"
+        obligation.save()
+    assert DashboardEvent.objects.count() == 2
+    completed = DashboardEvent.objects.latest("pk")
+    assert completed.payload["obligation"] == "PCEMP-001"
+    assert completed.payload["status"] == "completed"
+    assert completed.payload["counters"] == {
+        "not started": -1,
+        "completed": 1,
+        "active": -1,
+        "overdue": -1,
+    }
+
+    async def read():
+        hub = EventHub(poll_interval=0.01)
+        stream = stream_events([project.pk], last_event_id=created.pk, event_hub=hub)
+        try:
+            chunks = [await anext(stream), await anext(stream)]
+            # Events published after subscribing arrive through the poller
+            await DashboardEvent.objects.acreate(
+                project_id=project.pk + 1, kind="obligation", payload={}
+            )
+            await DashboardEvent.objects.acreate(
+                project_id=project.pk, kind="obligation", payload={"status": None}
+            )
+            chunks.append(await anext(stream))
+            return chunks
+        finally:
+            await stream.aclose()
+
+    retry, replayed, live = async_to_sync(read)()
+    assert retry.startswith("retry:")
+    assert replayed.startswith(f"id: {completed.pk}\nevent: obligation\n")
+    assert '"status":"completed"' in replayed
+    assert live.endswith('data: {"status":null}\n\n')
+
+
+@pytest.mark.django_db
+def test_bulk_edits_publish_project_events(
+    project, mechanism, django_capture_on_commit_callbacks
+):
+    """Test that bulk edits and deletes publish one event per project."""
+    for number in range(1, 4):
+        Obligation.objects.create(
+            obligation_number=f"PCEMP-00{number}",
+            obligation="Monitor groundwater",
+            status="not started",
+            action_due_date=timezone.now().date() - timedelta(days=3),
+            primary_environmental_mechanism=mechanism,
+            project=project,
+        )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bulk_update_obligations(
+            Obligation.objects.filter(pk__in=["PCEMP-001", "PCEMP-002"]),
+            {"status": "completed"},
+        )
+    event = DashboardEvent.objects.get()
+    assert (event.project_id, event.kind) == (project.pk, "obligations")
+    assert event.payload["counters"] == {
+        "not started": -2,
+        "completed": 2,
+        "active": -2,
+        "overdue": -2,
+    }
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bulk_delete_obligations(Obligation.objects.all())
+    assert DashboardEvent.objects.latest("pk").payload["counters"] == {
+        "not started": -1,
+        "completed": -2,
+        "active": -1,
+        "overdue": -1,
+    }
+
+
+@pytest.mark.django_db
+def test_dashboard_events_require_project_membership(
+    authenticated_client, regular_user, project
+):
+    """Test that the stream refuses projects the user is not a member of."""
+    url = reverse("dashboard:events")
+    response = authenticated_client.get(url, {"project_id": project.pk})
+    assert response.status_code == HTTP_NOT_FOUND
+
+    ProjectMembership.objects.create(project=project, user=regular_user)
+    response = authenticated_client.get(url, {"project_id": project.pk})
+    assert response["Content-Type"] == "text/event-stream"
+    assert response["Cache-Control"] == "no-cache"
+    response.close()
+
+
+@pytest.mark.django_db
+def test_unchanged_fragments_answer_not_modified(
+    authenticated_client, project, mechanism
+):
+    """Test that a repeated refresh gets a 304 until the obligations change."""
+    obligation = Obligation.objects.create(
+        obligation_number="PCEMP-001",
+        obligation="Monitor groundwater",
+        status="not started",
+        action_due_date=timezone.now().date() + timedelta(days=2),
+        primary_environmental_mechanism=mechanism,
+        project=project,
+    )
+    url = reverse("dashboard:upcoming_obligations")
+    params = {"project_id": project.pk}
+    headers = {"HX-Request": "true"}
+
+    response = authenticated_client.get(url, params, headers=headers)
+    assert response.status_code == HTTP_OK
+    assert "PCEMP-001" in response.content.decode()
+    etag = response["ETag"]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = authenticated_client.get(
+            url, params, headers={**headers, "If-None-Match": etag}
+        )
+    assert response.status_code == HTTP_NOT_MODIFIED
+    assert response.content == b""
+    # Only the validator aggregate reads obligation data
+    reads = [q["sql"] for q in queries if "obligations_" in q["sql"]]
+    assert len(reads) == 1
+    assert "COUNT" in reads[0]
+
+    obligation.status = "in progress"
+    obligation.save()
+    response = authenticated_client.get(
+        url, params, headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == HTTP_OK
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_async_fragments_require_login_and_group_stats(
+    client, authenticated_client, project, mechanism
+):
+    """Test that the async at-risk fragment reads its stats in one query."""
+    url = reverse("dashboard:projects_at_risk")
+    response = client.get(url)
+    assert response.status_code == HTTP_FOUND
+
+    obligations = (
+        ("PCEMP-001", "in progress", -3),
+        ("PCEMP-002", "not started", -10),
+        ("PCEMP-003", "completed", -1),
+        ("PCEMP-004", "not started", 5),
+    )
+    for number, status, days in obligations:
+        Obligation.objects.create(
+            obligation_number=number,
+            obligation="Monitor groundwater",
+            status=status,
+            action_due_date=timezone.now().date() + timedelta(days=days),
+            primary_environmental_mechanism=mechanism,
+            project=project,
+        )
+    with CaptureQueriesContext(connection) as queries:
+        response = authenticated_client.get(url)
+    assert response.status_code == HTTP_OK
+    (stats,) = response.context["projects_with_stats"]
+    assert stats["project"] == project
+    assert stats["overdue_count"] == 2
+    assert stats["last_due_date"] == timezone.now().date() - timedelta(days=3)
+    reads = [q["sql"] for q in queries if "projects_project" in q["sql"]]
+    # The ETag validator plus the grouped listing
+    assert len(reads) == 2
+
+
+@pytest.mark.django_db
+def test_calendar_pages_member_occurrences(authenticated_client, regular_user, project):
+    """Test that the calendar lists member projects' due dates page by page."""
+    due_date = timezone.now().date() + timedelta(days=1)
+    for number in range(1, 6):
+        Obligation.objects.create(
+            obligation_number=f"PCEMP-{number:03d}",
+            obligation="Weekly inspection",
+            project=project,
+            action_due_date=due_date,
+            recurring_obligation=True,
+            recurring_frequency="Weekly",
+        )
+    url = reverse("dashboard:calendar")
+
+    response = authenticated_client.get(url)
+    assert response.status_code == HTTP_OK
+    assert response.context["calendar_days"] == []
+
+    ProjectMembership.objects.create(project=project, user=regular_user)
+    response = authenticated_client.get(url, {"days": 90})
+    page = response.context["page_obj"]
+    assert (page.paginator.count, len(page.object_list)) == (65, 50)
+    assert response.context["calendar_days"][0][0] == due_date
+    assert "page=2" in response.content.decode()
+
+    response = authenticated_client.get(url, {"days": 90, "page": 2})
+    assert len(response.context["page_obj"].object_list) == 15
@@ -0,0 +1,97 @@
+"""
+Tests for the streamed bug report collection export and import.
+"""
+
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import io
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from feedback.models import BugReport
+from feedback.proto_utils import (
+    deserialize_bug_reports,
+    import_bug_report_collection,
+    iter_bug_report_collection,
+    stream_bug_report_collection,
+)
+
+
+def make_reports(user, count=3, **fields):
+    """Create bug reports owned by ``user``."""
+    for number in range(count):
+        BugReport.objects.create(
+            title=f"Chart fails to load {number}",
+            description="The mechanism chart stays blank",
+            environment="Production",
+            application_version="1.0.0",
+            operating_system="Linux",
+            device_type="Desktop",
+            steps_to_reproduce="Open the dashboard",
+            expected_behavior="Chart renders",
+            actual_behavior="Chart is blank",
+            frequency="always",
+            user_impact="Cannot review compliance",
+            created_by=user,
+            **fields,
+        )
+
+
+def read_streaming(response):
+    """Consume a streaming response the way the ASGI handler does."""
+
+    async def read():
+        return b"".join([chunk async for chunk in response])
+
+    return async_to_sync(read)()
+
+
+@pytest.mark.django_db
+def test_streamed_collection_round_trip(regular_user):
+    """Test that a streamed collection parses back both whole and incrementally."""
+    make_reports(regular_user, count=3)
+    data = b"".join(stream_bug_report_collection(BugReport.objects.order_by("pk")))
+
+    titles = [report.title for report in BugReport.objects.order_by("pk")]
+    assert [report.title for report in deserialize_bug_reports(data)] == titles
+    assert [
+        report.title for report in iter_bug_report_collection(io.BytesIO(data))
+    ] == titles
+
+
+@pytest.mark.django_db
+def test_export_and_import_reports(authenticated_client, regular_user, admin_user):
+    """Test that users export their own filtered reports and import them back."""
+    make_reports(regular_user, count=3)
+    make_reports(regular_user, count=1, severity="high")
+    make_reports(admin_user, count=2)
+
+    response = authenticated_client.get(
+        reverse("feedback:export_reports"), {"severity": "medium"}
+    )
+    assert response.status_code == 200
+    assert response.is_async
+    data = read_streaming(response)
+
+    response = authenticated_client.post(
+        reverse("feedback:import_reports"),
+        {"file": SimpleUploadedFile("bug_reports.pb", data)},
+    )
+    assert response.status_code == 302
+    assert BugReport.objects.filter(created_by=regular_user).count() == 7
+    assert BugReport.objects.filter(created_by=admin_user).count() == 2
+
+
+@pytest.mark.django_db
+def test_truncated_collection_imports_nothing(regular_user):
+    """Test that a broken collection is rejected without a partial import."""
+    make_reports(regular_user, count=4)
+    data = b"".join(stream_bug_report_collection(BugReport.objects.all()))
+    BugReport.objects.all().delete()
+
+    with pytest.raises(ValueError):
+        import_bug_report_collection(io.BytesIO(data[:-3]), batch_size=1)
+    assert not BugReport.objects.exists()
@@ -0,0 +1,111 @@
+"""
+Tests for the database-backed job queue.
+"""
+
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import time
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from jobs.models import Job
+from jobs.queue import (
+    claim_next,
+    enqueue,
+    heartbeat,
+    requeue_stale_jobs,
+    run_job,
+    run_pending,
+    task,
+)
+
+HTTP_OK = 200
+HTTP_NOT_FOUND = 404
+
+
+@task("tests.add")
+def add(job, a, b):
+    job.report_progress(1, 2, "Adding")
+    return a + b
+
+
+@task("tests.flaky", max_attempts=2)
+def flaky(job):
+    raise RuntimeError("temporary failure")
+
+
+@pytest.mark.django_db
+def test_jobs_run_once_and_report_results(authenticated_client, regular_user):
+    """Test that a queued job is claimed by one worker and its status polled."""
+    job = enqueue("tests.add", user=regular_user, a=2, b=3)
+
+    claimed = claim_next("worker-1")
+    assert claimed.pk == job.pk
+    assert claimed.status == Job.STATUS_RUNNING
+    assert claim_next("worker-2") is None
+
+    run_job(claimed)
+    job.refresh_from_db()
+    assert job.status == Job.STATUS_SUCCEEDED
+    assert job.result == 5
+    assert job.progress == 100
+
+    url = reverse("jobs:status", args=[job.pk])
+    response = authenticated_client.get(url)
+    assert response.status_code == HTTP_OK
+    assert response.json()["result"] == 5
+
+    response = authenticated_client.get(url, HTTP_HX_REQUEST="true")
+    assert b"hx-trigger" not in response.content
+
+    other = enqueue("tests.add", a=1, b=1)
+    response = authenticated_client.get(reverse("jobs:status", args=[other.pk]))
+    assert response.status_code == HTTP_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_failed_jobs_retry_with_backoff():
+    """Test that failing jobs are retried later and then marked failed."""
+    job = enqueue("tests.flaky")
+
+    assert run_pending() == 1
+    job.refresh_from_db()
+    assert job.status == Job.STATUS_QUEUED
+    assert job.attempts == 1
+    assert job.run_at > timezone.now()
+    assert "temporary failure" in job.error
+
+    # Not ready until the backoff has passed
+    assert run_pending() == 0
+    Job.objects.filter(pk=job.pk).update(run_at=timezone.now() - timedelta(seconds=1))
+    assert run_pending() == 1
+    job.refresh_from_db()
+    assert job.status == Job.STATUS_FAILED
+    assert job.finished_at is not None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_running_jobs_are_not_requeued_while_alive():
+    """Test that heartbeats and progress reports keep a long job's lock fresh."""
+    job = enqueue("tests.add", a=1, b=1)
+    claimed = claim_next("worker-1")
+    stale = timezone.now() - timedelta(hours=2)
+
+    Job.objects.filter(pk=job.pk).update(locked_at=stale)
+    with heartbeat(claimed, interval=0.01):
+        deadline = time.monotonic() + 5
+        while Job.objects.get(pk=job.pk).locked_at == stale:
+            assert time.monotonic() < deadline, "no heartbeat"
+            time.sleep(0.01)
+    assert requeue_stale_jobs() == 0
+
+    Job.objects.filter(pk=job.pk).update(locked_at=stale)
+    claimed.report_progress(1, 2)
+    assert requeue_stale_jobs() == 0
+
+    Job.objects.filter(pk=job.pk).update(locked_at=stale)
+    assert requeue_stale_jobs() == 1
+    assert Job.objects.get(pk=job.pk).status == Job.STATUS_QUEUED
@@ -2,17 +2,45 @@
 Unit tests for the obligations app in the Greenova project.
 
 These tests cover the summary view, template rendering, HTMX interactivity,
-and delete functionality for obligations.
+delete functionality, bulk recurring date forecasting and the materialized
+due-date calendar for obligations.
 """
 
 # Copyright 2025 Enveng Group.
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+import csv
+import io
+import zipfile
+from datetime import date, timedelta
+from xml.etree import ElementTree
+
+import numpy as np
 import pytest
-from django.test import Client
+from asgiref.sync import async_to_sync
+from django.contrib import admin
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from mechanisms.models import EnvironmentalMechanism
-from obligations.models import Obligation
+from obligations.constants import OCCURRENCE_COUNT
+from obligations.evidence_store import attach_evidence
+from obligations.exporting import EXPORT_HEADERS
+from obligations.forecasting import advance_dates, forecast_recurring_dates
+from obligations.forms import EvidenceUploadForm
+from obligations.models import (
+    EvidenceBlob,
+    Obligation,
+    ObligationEvidence,
+    ObligationOccurrence,
+)
+from obligations.pagination import KeysetPaginator, cached_count
+from obligations.projections import PREVIEW_LENGTH, obligation_rows, to_rows
+from obligations.utils import get_data_version
 from projects.models import Project
 
 HTTP_OK = 200
@@ -119,3 +147,450 @@ def test_obligation_delete_view(admin_client: Client):
     response = admin_client.post(url)
     assert response.status_code == HTTP_OK
     assert not Obligation.objects.filter(obligation_number="OBL001").exists()
+
+
+@pytest.mark.django_db
+def test_bulk_forecast_matches_per_instance_calculation():
+    """Test that the bulk forecasting engine matches the model method."""
+    project = Project.objects.create(name="Test Project")
+    due_date = timezone.now().date() + timedelta(days=40)
+    for index, frequency in enumerate(["Daily", "Weekly", "Quarterly", "yearly"]):
+        Obligation.objects.create(
+            obligation_number=f"PCEMP-{index + 1}",
+            obligation="Recurring obligation",
+            project=project,
+            action_due_date=due_date,
+            recurring_obligation=True,
+            recurring_frequency=frequency,
+        )
+    Obligation.objects.update(recurring_forcasted_date=None)
+
+    expected = {
+        obligation.pk: obligation.calculate_next_recurring_date()
+        for obligation in Obligation.objects.all()
+    }
+    assert forecast_recurring_dates() == len(expected)
+    assert {
+        obligation.pk: obligation.recurring_forcasted_date
+        for obligation in Obligation.objects.all()
+    } == expected
+    assert forecast_recurring_dates(dry_run=True) == 0
+
+
+def test_advance_dates_clamps_to_month_end():
+    """Test that month steps clamp to the last day like relativedelta."""
+    dates = np.array([date(2024, 1, 31), date(2023, 8, 31)], dtype="datetime64[D]")
+    assert list(advance_dates(dates, "months", 1).astype(object)) == [
+        date(2024, 2, 29),
+        date(2023, 9, 30),
+    ]
+
+
+@pytest.mark.django_db
+def test_occurrences_follow_recurrence_changes():
+    """Test that occurrences are materialized and refreshed on save."""
+    project = Project.objects.create(name="Test Project")
+    due_date = timezone.now().date() + timedelta(days=3)
+    obligation = Obligation.objects.create(
+        obligation_number="PCEMP-1",
+        obligation="Weekly inspection",
+        project=project,
+        action_due_date=due_date,
+        recurring_obligation=True,
+        recurring_frequency="Weekly",
+    )
+
+    occurrences = ObligationOccurrence.objects.filter(obligation=obligation)
+    assert occurrences.count() == 1 + OCCURRENCE_COUNT
+    assert list(occurrences.values_list("due_date", flat=True)[:3]) == [
+        due_date,
+        due_date + timedelta(weeks=1),
+        due_date + timedelta(weeks=2),
+    ]
+
+    obligation.recurring_obligation = False
+    obligation.save()
+    assert list(occurrences.values_list("due_date", flat=True)) == [due_date]
+
+
+@pytest.mark.django_db
+def test_changed_fields_tracks_loaded_values():
+    """Test that saves detect changes without re-reading the obligation."""
+    project = Project.objects.create(name="Test Project")
+    Obligation.objects.create(
+        obligation_number="PCEMP-1", obligation="Tracked", project=project
+    )
+
+    obligation = Obligation.objects.get(pk="PCEMP-1")
+    assert obligation.changed_fields() == {}
+
+    obligation.general_comments = "Reviewed"
+    assert obligation.changed_fields() == {"general_comments": None}
+
+    with CaptureQueriesContext(connection) as queries:
+        assert obligation.save_changed()
+    assert not any(
+        query["sql"].lstrip().upper().startswith("SELECT") for query in queries
+    )
+    assert obligation.changed_fields() == {}
+    assert not obligation.save_changed()
+    assert Obligation.objects.get(pk="PCEMP-1").general_comments == "Reviewed"
+
+
+@pytest.mark.django_db
+def test_save_foreign_key_by_field_name(mechanism):
+    """Test that update_fields may name a foreign key by its field name."""
+    Obligation.objects.create(
+        obligation_number="PCEMP-1", obligation="Tracked", project=mechanism.project
+    )
+
+    obligation = Obligation.objects.get(pk="PCEMP-1")
+    obligation.primary_environmental_mechanism = mechanism
+    obligation.save(update_fields=["primary_environmental_mechanism"])
+    assert obligation.changed_fields() == {}
+
+    obligation.project = Project.objects.create(name="Other Project")
+    obligation.save(update_fields=["project"])
+    assert obligation.changed_fields() == {}
+    assert Obligation.objects.get(pk="PCEMP-1").project.name == "Other Project"
+
+
+@pytest.mark.django_db
+def test_keyset_pages_match_ordered_results(django_capture_on_commit_callbacks):
+    """Test that keyset pages walk the same rows as an ordered scan."""
+    project = Project.objects.create(name="Test Project")
+    today = timezone.now().date()
+    for index in range(7):
+        Obligation.objects.create(
+            obligation_number=f"PCEMP-{index + 1}",
+            obligation="Paged obligation",
+            project=project,
+            # Shared and missing due dates exercise the tiebreaker and nulls
+            action_due_date=None if index == 3 else today + timedelta(days=index % 3),
+        )
+
+    queryset = Obligation.objects.all()
+    for descending in (False, True):
+        paginator = KeysetPaginator(
+            queryset, "action_due_date", descending=descending, per_page=2
+        )
+        seen, cursor = [], None
+        while True:
+            page = paginator.get_page(cursor)
+            seen.extend(obligation.pk for obligation in page)
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+        assert seen == [obligation.pk for obligation in paginator.queryset]
+        assert seen[-1] == "PCEMP-4"
+
+    assert cached_count(queryset, "all") == 7
+    version = get_data_version()
+    with django_capture_on_commit_callbacks(execute=True):
+        Obligation.objects.create(
+            obligation_number="PCEMP-8", obligation="New", project=project
+        )
+        # Other workers keep the old version until the row is committed
+        assert get_data_version() == version
+    assert cached_count(queryset, "all") == 8
+
+    # Counts and the version they are keyed on outlive the per-process cache
+    caches["default"].clear()
+    with CaptureQueriesContext(connection) as queries:
+        assert cached_count(queryset, "all") == 8
+    assert not queries
+
+
+@pytest.mark.django_db
+def test_obligation_rows_select_only_listed_columns():
+    """Test that list projections skip the large text columns."""
+    project = Project.objects.create(name="Test Project")
+    mechanism = EnvironmentalMechanism.objects.create(name="Permit", project=project)
+    Obligation.objects.create(
+        obligation_number="PCEMP-1",
+        obligation="x" * 500,
+        supporting_information="y" * 500,
+        project=project,
+        primary_environmental_mechanism=mechanism,
+    )
+
+    rows = obligation_rows(Obligation.objects.all())
+    sql = str(rows.query)
+    assert "supporting_information" not in sql
+    assert "general_comments" not in sql
+
+    (row,) = to_rows(rows)
+    assert row.pk == "PCEMP-1"
+    assert row.obligation == "x" * PREVIEW_LENGTH
+    assert row.mechanism_name == "Permit"
+    assert row.get_status_display() == "Not Started"
+    assert not hasattr(row, "__dict__")
+
+
+def read_streaming(response):
+    """Consume a streaming response the way the ASGI handler does."""
+
+    async def read():
+        return b"".join([chunk async for chunk in response])
+
+    return async_to_sync(read)()
+
+
+@pytest.mark.django_db
+def test_export_streams_importable_csv_and_xlsx(authenticated_client, regular_user):
+    """Test that obligation exports stream the import_obligations columns."""
+    project = Project.objects.create(name="Export Project")
+    project.members.add(regular_user)
+    Obligation.objects.create(
+        obligation_number="PCEMP-1",
+        obligation='Check "fences", report\nweekly',
+        project=project,
+        action_due_date=date(2025, 3, 1),
+        recurring_obligation=True,
+        recurring_frequency="Weekly",
+    )
+
+    url = reverse("obligations:export")
+    response = authenticated_client.get(url, {"project_id": project.id})
+    # Sync content would be collected into a list by the ASGI handler
+    assert response.streaming and response.is_async
+    content = read_streaming(response).decode()
+    (row,) = csv.DictReader(io.StringIO(content))
+    assert tuple(row) == EXPORT_HEADERS
+    assert row["obligation__number"] == "PCEMP-1"
+    assert row["obligation"] == 'Check "fences", report\nweekly'
+    assert row["action__due_date"] == "2025-03-01"
+    assert row["recurring__obligation"] == "True"
+
+    response = authenticated_client.get(
+        url, {"project_id": project.id, "format": "xlsx"}
+    )
+    assert response.is_async
+    archive = zipfile.ZipFile(io.BytesIO(read_streaming(response)))
+    sheet = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+    assert len(sheet.findall(".//{*}row")) == 2
+
+    other = Project.objects.create(name="Other Project")
+    response = authenticated_client.get(url, {"project_id": other.id})
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_bulk_actions_recount_mechanisms_once(admin_client, mechanism):
+    """Test that bulk edits and deletes refresh derived data once per request."""
+    yesterday = timezone.now().date() - timedelta(days=1)
+    for number in range(1, 21):
+        Obligation.objects.create(
+            obligation_number=f"PCEMP-{number}",
+            obligation="Bulk obligation",
+            project=mechanism.project,
+            primary_environmental_mechanism=mechanism,
+            action_due_date=yesterday,
+            recurring_obligation=number == 1,
+            recurring_frequency="Monthly" if number == 1 else None,
+        )
+    url = reverse("obligations:bulk")
+
+    def post(numbers, **data):
+        return admin_client.post(
+            url, {"selected": numbers, **data}, HTTP_HX_REQUEST="true"
+        )
+
+    with CaptureQueriesContext(connection) as few:
+        assert post(["PCEMP-2", "PCEMP-3"], action="update", status="completed")
+    with CaptureQueriesContext(connection) as many:
+        response = post(
+            [f"PCEMP-{n}" for n in range(4, 21)], action="update", status="completed"
+        )
+    assert response.status_code == HTTP_OK
+    assert "HX-Trigger" in response
+    assert len(many) == len(few)
+
+    mechanism.refresh_from_db()
+    assert mechanism.completed_count == 19
+    assert mechanism.overdue_count == 1
+
+    # Completing a recurring obligation resets it and schedules the next date
+    post(["PCEMP-1"], action="update", status="completed")
+    recurring = Obligation.objects.get(pk="PCEMP-1")
+    assert recurring.status == "not started"
+    assert recurring.recurring_forcasted_date > timezone.now().date()
+
+    # Without a frequency there is no next date, but the status still resets
+    Obligation.objects.filter(pk="PCEMP-1").update(
+        recurring_frequency=None, recurring_forcasted_date=None
+    )
+    post(["PCEMP-1"], action="update", status="completed")
+    recurring = Obligation.objects.get(pk="PCEMP-1")
+    assert (recurring.status, recurring.recurring_forcasted_date) == (
+        "not started",
+        None,
+    )
+
+    response = post([f"PCEMP-{n}" for n in range(2, 21)], action="delete")
+    assert response.status_code == HTTP_OK
+    mechanism.refresh_from_db()
+    assert Obligation.objects.count() == 1
+    assert mechanism.completed_count == 0
+
+    assert post(["PCEMP-1"], action="update").status_code == 400
+
+
+@pytest.mark.django_db
+def test_admin_changelist_sorts_and_filters_overdue_in_sql(admin_user, project, rf):
+    """Test the admin overdue column, filter and date hierarchy years."""
+    today = timezone.now().date()
+    due_dates = [today - timedelta(days=400), today + timedelta(days=30), None]
+    for number, due in enumerate(due_dates, start=1):
+        Obligation.objects.create(
+            obligation_number=f"PCEMP-{number}",
+            obligation="Admin obligation",
+            project=project,
+            action_due_date=due,
+        )
+    model_admin = admin.site._registry[Obligation]
+
+    def changelist(**params):
+        request = rf.get("/admin/obligations/obligation/", params)
+        request.user = admin_user
+        return model_admin.get_changelist_instance(request)
+
+    cl = changelist(o="-4")
+    assert cl.result_list[0].obligation_number == "PCEMP-1"
+    assert cl.result_list[0].overdue
+    assert cl.result_count == 3
+
+    cl = changelist(overdue_status="overdue")
+    assert [obj.pk for obj in cl.result_list] == ["PCEMP-1"]
+
+    years = cl.root_queryset.dates("action_due_date", "year")
+    assert [year.year for year in years] == sorted(
+        {due_dates[0].year, due_dates[1].year}
+    )
+
+
+@pytest.mark.django_db
+def test_admin_evidence_uploads_go_through_the_blob_store(
+    settings, tmp_path, admin_user, project, rf
+):
+    """Test that admin uploads are deduplicated and stored files are read-only."""
+    settings.MEDIA_ROOT = tmp_path
+    obligation = Obligation.objects.create(
+        obligation_number="PCEMP-1", obligation="Inspect", project=project
+    )
+    request = rf.post("/admin/obligations/obligation/PCEMP-1/change/")
+    request.user = admin_user
+    model_admin = admin.site._registry[Obligation]
+    existing, upload = model_admin.get_inline_instances(request, obligation)
+
+    for _ in range(2):
+        formset_class = upload.get_formset(request, obligation)
+        prefix = formset_class.get_default_prefix()
+        formset = formset_class(
+            {
+                f"{prefix}-TOTAL_FORMS": "1",
+                f"{prefix}-INITIAL_FORMS": "0",
+                f"{prefix}-0-description": "Inspection report",
+            },
+            {f"{prefix}-0-file": SimpleUploadedFile("report.pdf", b"%PDF-1.4 x")},
+            instance=obligation,
+            prefix=prefix,
+        )
+        assert formset.is_valid(), formset.errors
+        formset.save()
+
+    blob = EvidenceBlob.objects.get()
+    assert blob.ref_count == 2
+    assert set(obligation.evidences.values_list("blob", flat=True)) == {blob.pk}
+    assert "file" not in existing.get_formset(request, obligation).form.base_fields
+    assert not existing.has_add_permission(request, obligation)
+
+
+@pytest.mark.django_db
+def test_evidence_uploads_share_one_blob(
+    settings, tmp_path, project, django_assert_max_num_queries
+):
+    """Test that identical evidence is stored once and released by reference."""
+    settings.MEDIA_ROOT = tmp_path
+    obligations = [
+        Obligation.objects.create(
+            obligation_number=f"PCEMP-{number}", obligation="Inspect", project=project
+        )
+        for number in (1, 2)
+    ]
+    evidences = []
+    for obligation in obligations:
+        form = EvidenceUploadForm(
+            {"description": "Inspection report"},
+            {"file": SimpleUploadedFile("report.pdf", b"%PDF-1.4 report")},
+            instance=ObligationEvidence(obligation=obligation),
+        )
+        assert form.is_valid(), form.errors
+        evidences.append(form.save())
+
+    blob = EvidenceBlob.objects.get()
+    assert blob.ref_count == 2
+    assert blob.size == len(b"%PDF-1.4 report")
+    assert blob.content_type == "application/pdf"
+    assert {evidence.blob_id for evidence in evidences} == {blob.pk}
+    assert len([path for path in tmp_path.rglob("*") if path.is_file()]) == 1
+
+    with django_assert_max_num_queries(1):
+        listed = list(obligations[0].evidences.all())
+        assert listed[0].display_name == "report.pdf"
+        assert listed[0].file_size() == "15 bytes"
+
+    evidences[0].delete()
+    blob.refresh_from_db()
+    assert blob.ref_count == 1
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        obligations[1].delete()
+    assert not EvidenceBlob.objects.exists()
+    assert not [path for path in tmp_path.rglob("*") if path.is_file()]
+
+
+@pytest.mark.django_db
+def test_evidence_download_supports_ranges_and_validators(
+    settings, tmp_path, authenticated_client, regular_user, project
+):
+    """Test evidence downloads resume with Range and revalidate with ETag."""
+    settings.MEDIA_ROOT = tmp_path
+    project.members.add(regular_user)
+    obligation = Obligation.objects.create(
+        obligation_number="PCEMP-1", obligation="Inspect", project=project
+    )
+    content = b"0123456789" * 10
+    evidence = attach_evidence(
+        obligation, SimpleUploadedFile("report.pdf", content), "Report"
+    )
+    url = reverse("obligations:evidence_download", args=[evidence.pk])
+
+    response = authenticated_client.get(url)
+    assert response.status_code == HTTP_OK
+    assert response.is_async
+    assert read_streaming(response) == content
+    assert response["Content-Type"] == "application/pdf"
+    assert 'filename="report.pdf"' in response["Content-Disposition"]
+    etag = response["ETag"]
+    assert etag == f'"{evidence.blob.sha256}"'
+
+    response = authenticated_client.get(url, HTTP_RANGE="bytes=90-")
+    assert response.status_code == 206
+    assert response["Content-Range"] == "bytes 90-99/100"
+    assert read_streaming(response) == content[90:]
+
+    response = authenticated_client.get(
+        url, HTTP_RANGE="bytes=5-9", HTTP_IF_RANGE='"x"'
+    )
+    assert response.status_code == HTTP_OK
+
+    assert authenticated_client.get(url, HTTP_RANGE="bytes=200-").status_code == 416
+    assert authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    settings.DOWNLOAD_BACKEND = "x-accel-redirect"
+    response = authenticated_client.get(url)
+    assert response["X-Accel-Redirect"] == f"/protected-media/{evidence.blob.file.name}"
+    assert not response.content
+
+    project.members.remove(regular_user)
+    assert authenticated_client.get(url).status_code == 404
@@ -0,0 +1,75 @@
+"""
+Query plan regression tests for the hot obligation queries.
+"""
+
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from datetime import timedelta
+from itertools import cycle
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+from mechanisms.models import EnvironmentalMechanism
+from obligations.models import Obligation
+from obligations.query_plans import HOT_QUERIES, full_table_scans
+from projects.models import Project
+
+PROJECTS = 8
+MECHANISMS_PER_PROJECT = 4
+OBLIGATIONS = 4000
+PROCEDURES = [choice for choice, _ in Obligation._meta.get_field("procedure").choices]
+STATUSES = ["not started", "in progress", "completed"]
+RESPONSIBILITIES = ["Site Manager", "Environmental Advisor", "Project Manager"]
+
+
+@pytest.fixture(name="sample")
+def generated_dataset_fixture():
+    """Fill the obligations table and refresh the planner statistics."""
+    projects = Project.objects.bulk_create(
+        Project(name=f"Project {index}") for index in range(PROJECTS)
+    )
+    mechanisms = EnvironmentalMechanism.objects.bulk_create(
+        EnvironmentalMechanism(name=f"Mechanism {index}", project=project)
+        for project in projects
+        for index in range(MECHANISMS_PER_PROJECT)
+    )
+    today = timezone.now().date()
+    attributes = zip(
+        cycle(mechanisms),
+        cycle(PROCEDURES),
+        cycle(STATUSES),
+        cycle(RESPONSIBILITIES),
+        range(OBLIGATIONS),
+    )
+    Obligation.objects.bulk_create(
+        Obligation(
+            obligation_number=f"PCEMP-{number + 1}",
+            obligation=f"Generated obligation {number}",
+            project_id=mechanism.project_id,
+            primary_environmental_mechanism=mechanism,
+            procedure=procedure,
+            status=status,
+            responsibility=responsibility,
+            action_due_date=today + timedelta(days=number % 120 - 60),
+        )
+        for mechanism, procedure, status, responsibility, number in attributes
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return {
+        "project_id": projects[0].pk,
+        "mechanism_id": mechanisms[0].pk,
+        "procedure": PROCEDURES[0],
+        "status": STATUSES[0],
+        "responsibility": RESPONSIBILITIES[0],
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_queries_use_indexes(name, sample):
+    """Test that no hot query falls back to a full obligations table scan."""
+    queryset = HOT_QUERIES[name](sample)
+    assert full_table_scans(queryset) == [], queryset.explain()
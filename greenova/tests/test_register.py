@@ -0,0 +1,218 @@
+"""
+Tests for the protobuf obligation register export and import.
+"""
+
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import gzip
+import io
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from mechanisms.models import EnvironmentalMechanism
+from obligations.evidence_store import store_file
+from obligations.exporting import export_rows, stream_csv
+from obligations.models import Obligation, ObligationEvidence, ObligationOccurrence
+from obligations.proto_utils import (
+    OBLIGATION_FIELDS,
+    RegisterFormatError,
+    _record,
+    encode_delimited,
+    import_register,
+    stream_register,
+)
+from projects.models import Project
+
+
+def make_register(project, mechanism, count=2):
+    """Create obligations with and without optional values."""
+    for number in range(1, count + 1):
+        Obligation.objects.create(
+            obligation_number=f"PCEMP-{number:03d}",
+            obligation=f"Monitor dust at station {number}",
+            project=project,
+            primary_environmental_mechanism=mechanism if number % 2 else None,
+            procedure="Dust Management",
+            responsibility="Environmental Manager",
+            status="in progress" if number % 2 else "not started",
+            action_due_date=date(2025, 3, number % 28 + 1) if number % 2 else None,
+            recurring_obligation=number % 2 == 1,
+            recurring_frequency="Monthly" if number % 2 else None,
+            general_comments="Checked weekly" if number % 2 else None,
+        )
+
+
+def export(projects):
+    return io.BytesIO(b"".join(stream_register(projects)))
+
+
+def register_values():
+    return list(
+        Obligation.objects.order_by("pk").values(
+            *(name for name in OBLIGATION_FIELDS if "mechanism" not in name),
+            "primary_environmental_mechanism__name",
+            "project__name",
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_register_round_trip(project, mechanism, tmp_path):
+    """Test that an exported register imports back unchanged."""
+    make_register(project, mechanism)
+    before = register_values()
+    path = tmp_path / "register.pb.gz"
+    call_command(
+        "export_obligations",
+        format="proto",
+        project=project.name,
+        output=str(path),
+        stdout=io.StringIO(),
+    )
+
+    Obligation.objects.all().delete()
+    mechanism.delete()
+    out = io.StringIO()
+    call_command("import_obligations_proto", str(path), stdout=out)
+
+    assert "Imported 2 obligations" in out.getvalue()
+    assert register_values() == before
+    imported = EnvironmentalMechanism.objects.get(project=project)
+    assert (imported.name, imported.in_progress_count) == (mechanism.name, 1)
+    assert ObligationOccurrence.objects.filter(obligation_id="PCEMP-001").exists()
+
+
+@pytest.mark.django_db
+def test_existing_obligations_are_skipped_or_updated(project, mechanism):
+    """Test that a second import skips known obligations unless updating."""
+    make_register(project, mechanism)
+    register = export(Project.objects.all())
+    Obligation.objects.filter(pk="PCEMP-001").update(status="completed")
+
+    result = import_register(register)
+    assert (result.created, result.skipped) == (0, 2)
+    assert Obligation.objects.get(pk="PCEMP-001").status == "completed"
+
+    register.seek(0)
+    result = import_register(register, update=True, batch_size=1)
+    assert (result.created, result.updated, result.projects) == (0, 2, 0)
+    obligation = Obligation.objects.get(pk="PCEMP-001")
+    assert obligation.status == "in progress"
+    assert obligation.primary_environmental_mechanism == mechanism
+    mechanism.refresh_from_db()
+    assert mechanism.in_progress_count == 1
+
+
+@pytest.mark.django_db
+def test_numbers_of_other_projects_are_left_alone(project, mechanism):
+    """Test that an import never takes over another project's obligations."""
+    make_register(project, mechanism)
+    records = [
+        _record("header", {"format_version": 1}),
+        _record("project", {"name": "Moved Project"}),
+        _record(
+            "obligation",
+            {"obligation_number": "PCEMP-001", "obligation": "Water sampling"},
+        ),
+        _record(
+            "obligation",
+            {"obligation_number": "PCEMP-100", "obligation": "Noise survey"},
+        ),
+        *(
+            _record(
+                "evidence",
+                {
+                    "obligation_id": number,
+                    "file": f"evidence_files/{number}.pdf",
+                    "original_name": f"{number}.pdf",
+                    "uploaded_at": datetime(2025, 2, 1, tzinfo=dt_timezone.utc),
+                },
+            )
+            for number in ("PCEMP-001", "PCEMP-100")
+        ),
+    ]
+    register = b"".join(encode_delimited(record) for record in records)
+
+    for update in (False, True):
+        result = import_register(io.BytesIO(register), update=update)
+        assert result.conflicts == 1
+        obligation = Obligation.objects.get(pk="PCEMP-001")
+        assert (obligation.project, obligation.obligation) == (
+            project,
+            "Monitor dust at station 1",
+        )
+        assert not ObligationEvidence.objects.filter(obligation=obligation).exists()
+    assert Obligation.objects.get(pk="PCEMP-100").project.name == "Moved Project"
+    assert ObligationEvidence.objects.get().obligation_id == "PCEMP-100"
+
+
+@pytest.mark.django_db
+def test_evidence_links_to_stored_blobs(project, settings, tmp_path):
+    """Test that evidence metadata is linked to blobs with the same content."""
+    settings.MEDIA_ROOT = tmp_path
+    blob = store_file(ContentFile(b"%PDF-1.4 report", name="report.pdf"))
+    uploaded_at = datetime(2025, 2, 1, 8, 30, tzinfo=dt_timezone.utc)
+    records = [
+        _record("header", {"format_version": 1}),
+        _record("project", {"name": project.name}),
+        _record(
+            "obligation",
+            {"obligation_number": "PCEMP-001", "obligation": "Inspect"},
+        ),
+        *(
+            _record(
+                "evidence",
+                {
+                    "obligation_id": "PCEMP-001",
+                    "file": f"evidence_files/{name}",
+                    "original_name": name,
+                    "uploaded_at": uploaded_at,
+                    "sha256": sha256,
+                },
+            )
+            for name, sha256 in (("report.pdf", blob.sha256), ("photo.jpg", "0" * 64))
+        ),
+    ]
+    register = b"".join(encode_delimited(record) for record in records)
+
+    assert import_register(io.BytesIO(register)).evidence == 2
+    assert import_register(io.BytesIO(register)).evidence == 0
+
+    linked, legacy = ObligationEvidence.objects.order_by("original_name").reverse()
+    assert linked.blob == blob
+    assert linked.file.name == blob.file.name
+    assert linked.uploaded_at == uploaded_at
+    assert (legacy.blob, legacy.file.name) == (None, "evidence_files/photo.jpg")
+    blob.refresh_from_db()
+    assert blob.ref_count == 2
+
+
+@pytest.mark.django_db
+def test_truncated_register_changes_nothing(project, mechanism):
+    """Test that a broken stream is rejected without a partial import."""
+    make_register(project, mechanism, count=5)
+    register = export(Project.objects.all()).getvalue()
+    Obligation.objects.all().delete()
+
+    with pytest.raises(RegisterFormatError):
+        import_register(io.BytesIO(register[:-3]), batch_size=2)
+    assert not Obligation.objects.exists()
+
+    with pytest.raises(RegisterFormatError):
+        import_register(io.BytesIO(register[register.index(b"PCEMP") - 10 :]))
+
+
+@pytest.mark.django_db
+def test_register_is_smaller_than_csv(project, mechanism):
+    """Test that the compressed register is several times smaller than CSV."""
+    make_register(project, mechanism, count=200)
+    queryset = Obligation.objects.all()
+
+    csv_size = sum(len(chunk.encode()) for chunk in stream_csv(export_rows(queryset)))
+    register = export(Project.objects.all()).getvalue()
+    assert len(register) < csv_size
+    assert len(gzip.compress(register)) < csv_size / 4
@@ -0,0 +1,101 @@
+"""
+Tests for single-flight coalescing of shared computations.
+"""
+
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import asyncio
+import threading
+import time
+
+from asgiref.sync import async_to_sync
+from core.singleflight import (
+    RESULT_CACHE,
+    Entry,
+    asingle_flight,
+    cache_key,
+    lease_key,
+    single_flight,
+)
+from django.core.cache import caches
+
+
+def wait_for(predicate, timeout=5):
+    """Poll until ``predicate`` is true or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_concurrent_callers_share_one_computation():
+    """Test that threads asking for the same version compute it once."""
+    calls = []
+    barrier = threading.Barrier(8)
+    results = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"overdue": 3}
+
+    def request():
+        barrier.wait()
+        results.append(single_flight("test.shared", ("project", 1), 1, compute))
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"overdue": 3}] * 8
+
+
+def test_new_versions_are_recomputed_unless_stale_is_acceptable():
+    """Test that stale results are served while they refresh in the background."""
+    name, scope = "test.stale", ("mechanism", 7)
+
+    assert single_flight(name, scope, 1, lambda: "v1") == "v1"
+    assert single_flight(name, scope, 1, lambda: "unused") == "v1"
+    assert single_flight(name, scope, 2, lambda: "v2") == "v2"
+
+    assert single_flight(name, scope, 3, lambda: "v3", stale_ok=True) == "v2"
+    wait_for(lambda: caches[RESULT_CACHE].get(cache_key(name, scope)).version == 3)
+    assert single_flight(name, scope, 3, lambda: "unused") == "v3"
+
+
+def test_waits_for_the_worker_holding_the_lease():
+    """Test that a lease taken by another worker makes the caller wait for it."""
+    name, scope = "test.lease", ("project", 2)
+    # A cache of its own, as another worker process would open
+    other_cache = caches.create_connection(RESULT_CACHE)
+    other_cache.add(lease_key(name, scope, 5), "other-worker")
+
+    def other_worker():
+        time.sleep(0.1)
+        other_cache.set(cache_key(name, scope), Entry("theirs", 5, time.time()))
+        other_cache.delete(lease_key(name, scope, 5))
+
+    threading.Thread(target=other_worker).start()
+    assert single_flight(name, scope, 5, lambda: "ours") == "theirs"
+
+
+def test_async_callers_share_one_computation():
+    """Test that coroutines asking for the same version compute it once."""
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def requests():
+        return await asyncio.gather(
+            *(asingle_flight("test.async", "all", 1, compute) for _ in range(5))
+        )
+
+    assert async_to_sync(requests)() == [42] * 5
+    assert len(calls) == 1
@@ -0,0 +1,143 @@
+"""
+Tests for daily compliance snapshots and the trend API.
+"""
+
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from datetime import date, timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from obligations.models import ComplianceSnapshot, Obligation
+from obligations.snapshots import compliance_trend, take_snapshot
+from projects.models import ProjectMembership
+
+HTTP_OK = 200
+HTTP_NOT_FOUND = 404
+
+
+@pytest.mark.django_db
+def test_take_snapshot_rolls_up_statuses(project, mechanism):
+    """Test that one row per project and mechanism is written idempotently."""
+    today = timezone.localdate()
+    for number, status, due in (
+        ("PCEMP-001", "not started", today - timedelta(days=1)),
+        ("PCEMP-002", "in progress", today + timedelta(days=5)),
+        ("PCEMP-003", "completed", today - timedelta(days=9)),
+        ("PCEMP-004", "completed", None),
+    ):
+        Obligation.objects.create(
+            obligation_number=number,
+            obligation="Monitor groundwater",
+            status=status,
+            action_due_date=due,
+            primary_environmental_mechanism=mechanism,
+            project=project,
+        )
+
+    assert take_snapshot() == 1
+    assert take_snapshot() == 1
+    snapshot = ComplianceSnapshot.objects.get()
+    assert (snapshot.project, snapshot.mechanism, snapshot.date) == (
+        project,
+        mechanism,
+        today,
+    )
+    assert (snapshot.not_started, snapshot.in_progress, snapshot.completed) == (
+        1,
+        1,
+        2,
+    )
+    assert snapshot.overdue == 1
+    assert snapshot.total == 4
+    assert snapshot.completion_percentage == 50.0
+
+
+@pytest.mark.django_db
+def test_long_trends_are_downsampled_to_the_last_day_of_each_bucket(project, mechanism):
+    """Test that a year of daily rows becomes monthly points."""
+    start = date(2025, 1, 1)
+    ComplianceSnapshot.objects.bulk_create(
+        ComplianceSnapshot(
+            project=project,
+            mechanism=mechanism,
+            date=start + timedelta(days=offset),
+            completed=offset,
+            total=400,
+        )
+        for offset in range(365)
+    )
+
+    weekly = compliance_trend(
+        ComplianceSnapshot.objects.all(), start, start + timedelta(days=69), 20
+    )
+    assert weekly["resolution"] == "week"
+    assert len(weekly["points"]) == 11
+
+    yearly = compliance_trend(
+        ComplianceSnapshot.objects.all(), start, date(2025, 12, 31), 24
+    )
+    assert yearly["resolution"] == "month"
+    assert len(yearly["points"]) == 12
+    january = yearly["points"][0]
+    assert january["date"] == date(2025, 1, 1)
+    assert january["as_of"] == date(2025, 1, 31)
+    assert january["completed"] == 30
+    assert january["completion_percentage"] == 7.5
+
+
+@pytest.mark.django_db
+def test_trend_api_groups_months_to_respect_max_points(
+    authenticated_client, regular_user, project, mechanism
+):
+    """Test that ranges with more months than points group several months."""
+    ProjectMembership.objects.create(project=project, user=regular_user)
+    end = timezone.localdate()
+    ComplianceSnapshot.objects.bulk_create(
+        ComplianceSnapshot(
+            project=project,
+            mechanism=mechanism,
+            date=end - timedelta(days=offset),
+            completed=1,
+            total=2,
+        )
+        for offset in range(0, 1830, 7)
+    )
+    url = reverse("dashboard:compliance_trend")
+
+    data = authenticated_client.get(url, {"days": 1830}).json()
+    assert (data["resolution"], data["step"]) == ("month", 2)
+    assert len(data["points"]) == 31
+
+    data = authenticated_client.get(url, {"days": 1830, "max_points": 2}).json()
+    assert len(data["points"]) == 2
+    assert data["points"][-1]["as_of"] == end.isoformat()
+
+
+@pytest.mark.django_db
+def test_trend_api_is_limited_to_member_projects(
+    authenticated_client, regular_user, project, mechanism
+):
+    """Test that the trend endpoint only serves the user's projects."""
+    ComplianceSnapshot.objects.create(
+        project=project,
+        mechanism=mechanism,
+        date=timezone.localdate(),
+        completed=3,
+        total=4,
+    )
+    url = reverse("dashboard:compliance_trend")
+
+    response = authenticated_client.get(url, {"project_id": project.pk})
+    assert response.status_code == HTTP_NOT_FOUND
+    assert authenticated_client.get(url).json()["points"] == []
+
+    ProjectMembership.objects.create(project=project, user=regular_user)
+    response = authenticated_client.get(url, {"project_id": project.pk, "days": 30})
+    assert response.status_code == HTTP_OK
+    data = response.json()
+    assert data["resolution"] == "day"
+    (point,) = data["points"]
+    assert point["completion_percentage"] == 75.0
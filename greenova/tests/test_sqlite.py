@@ -0,0 +1,43 @@
+"""
+Tests for the SQLite production profile.
+"""
+
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from io import StringIO
+
+import pytest
+from core.sqlite import benchmark_concurrency, get_pragmas
+from django.core.management import call_command
+from django.db import connection
+
+SYNCHRONOUS_NORMAL = 1
+TEMP_STORE_MEMORY = 2
+
+
+@pytest.mark.django_db
+def test_connections_use_the_production_profile():
+    """Test that new connections get the configured pragmas."""
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        assert cursor.fetchone()[0] == SYNCHRONOUS_NORMAL
+        cursor.execute("PRAGMA temp_store")
+        assert cursor.fetchone()[0] == TEMP_STORE_MEMORY
+        cursor.execute("PRAGMA busy_timeout")
+        assert cursor.fetchone()[0] == get_pragmas()["busy_timeout"]
+
+    out = StringIO()
+    call_command("sqlite_maintenance", stdout=out)
+    assert "SQLite maintenance complete" in out.getvalue()
+
+
+def test_readers_do_not_wait_for_writers(tmp_path):
+    """Test that in WAL mode reads finish while a writer holds its lock."""
+    hold = 0.2
+    result = benchmark_concurrency(
+        str(tmp_path / "benchmark.sqlite3"), duration=1.0, readers=2, hold=hold
+    )
+    assert result["writes"] > 0
+    assert result["read_errors"] == 0
+    assert result["read_ms_max"] < hold * 1000
@@ -0,0 +1,60 @@
+"""
+Tests for template precompilation.
+"""
+
+# Copyright 2025 Enveng Group.
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+import pytest
+from core.jinja2 import get_bytecode_cache
+from core.template_cache import template_names, warm_templates
+from django.core.exceptions import ImproperlyConfigured
+from django.template import engines
+from django.template.backends.jinja2 import Jinja2
+from django.template.loaders.cached import Loader as CachedLoader
+
+
+def test_warm_templates_fills_the_cached_loader():
+    """Test that warming compiles app and project templates once per worker."""
+    backend = engines["django"]
+    names = template_names(backend)
+    assert "dashboard/partials/upcoming_obligations_table.html" in names
+    assert not any(name.endswith(".py") for name in names)
+
+    result = warm_templates(["django"])["django"]
+    assert result.compiled + len(result.errors) == len(names)
+    (partials_loader,) = backend.engine.template_loaders
+    (cached_loader,) = partials_loader.loaders
+    assert isinstance(cached_loader, CachedLoader)
+    assert len(cached_loader.get_template_cache) >= result.compiled
+
+
+def test_jinja2_templates_share_a_bytecode_cache(tmp_path, settings):
+    """Test that compiled Jinja2 templates are written to the shared cache."""
+    settings.JINJA2_BYTECODE_CACHE_DIR = str(tmp_path / "bytecode")
+    (tmp_path / "hello.html").write_text("Hello {{ name }}")
+    (tmp_path / "notes.py").write_text("")
+    backend = Jinja2(
+        {
+            "NAME": "jinja2",
+            "DIRS": [tmp_path],
+            "APP_DIRS": False,
+            "OPTIONS": {"environment": "core.jinja2.environment"},
+        }
+    )
+
+    assert template_names(backend) == ["hello.html"]
+    backend.get_template("hello.html")
+    assert len(list((tmp_path / "bytecode").iterdir())) == 1
+
+
+def test_jinja2_bytecode_cache_is_private(tmp_path, settings):
+    """Test that the bytecode cache is created private and refused when open."""
+    directory = tmp_path / "bytecode"
+    settings.JINJA2_BYTECODE_CACHE_DIR = str(directory)
+    get_bytecode_cache()
+    assert directory.stat().st_mode & 0o777 == 0o700
+
+    directory.chmod(0o777)
+    with pytest.raises(ImproperlyConfigured):
+        get_bytecode_cache()
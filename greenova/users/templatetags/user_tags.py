@@ -1,10 +1,24 @@
 from allauth.account.models import EmailAddress
 from allauth.account.utils import user_display
+from core.loaders import get_loader, register_loader
 from django import template
 from django.utils.html import format_html
 
 register = template.Library()
 
+VERIFIED_EMAIL_LOADER = 'verified_email_users'
+
+
+def _load_verified_email_users(user_ids):
+    """Fetch which of many users have a verified email with one query."""
+    verified = EmailAddress.objects.filter(
+        user_id__in=user_ids, verified=True
+    ).values_list('user_id', flat=True)
+    return dict.fromkeys(verified, True)
+
+
+register_loader(VERIFIED_EMAIL_LOADER, _load_verified_email_users, default=False)
+
 
 @register.filter
 def full_name_or_username(user):
@@ -59,7 +73,7 @@ def has_verified_email(user):
     """Check if the user has at least one verified email address."""
     if not user.is_authenticated:
         return False
-    return EmailAddress.objects.filter(user=user, verified=True).exists()
+    return get_loader(VERIFIED_EMAIL_LOADER).load(user.pk)
 
 
 @register.simple_tag(takes_context=True)
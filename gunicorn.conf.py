@@ -61,6 +61,19 @@ def post_fork(server, worker):
     server.log.info("Worker spawned (pid: %s)", worker.pid)
 
 
+def post_worker_init(worker):
+    """Compile every template once the worker has loaded the application."""
+    from core.template_cache import warm_templates
+
+    for name, result in warm_templates().items():
+        worker.log.info(
+            "Compiled %d %s templates (%d errors)",
+            result.compiled,
+            name,
+            len(result.errors),
+        )
+
+
 def pre_fork(server, worker):
     """Called before a worker is forked."""
 